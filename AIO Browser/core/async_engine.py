@@ -0,0 +1,391 @@
+# core/async_engine.py
+# Alternative download engine: every transfer is a task on one shared asyncio
+# event loop (aiohttp) instead of occupying its own OS thread. Selected with the
+# "download_engine" setting; results and progress messages match core.downloader.
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from core import checksum, downloader
+from core.download_control import DownloadCancelled
+from core.progress import DownloadState, ProgressEvent, ProgressTracker, format_size
+from core.rate_limit import MAX_WAIT, global_limiter
+from core.stream_io import body_length, preallocate
+
+CHUNK_SIZE = 256 * 1024
+CONNECT_TIMEOUT = 15
+READ_TIMEOUT = 60
+
+# Disk writes and fsyncs run here so a slow drive never blocks the event loop
+_write_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="download-writer")
+
+_loop = None
+_loop_lock = threading.Lock()
+_session = None
+
+
+def available():
+    return aiohttp is not None
+
+
+def get_loop():
+    """Returns the shared download event loop, starting its thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="download-loop", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def submit(coro):
+    """Schedules coro on the download loop and returns a concurrent.futures.Future."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def close(timeout=2):
+    """Closes the shared HTTP session (call on app exit, after cancelling downloads)."""
+    if _loop is None or _session is None:
+        return
+
+    async def _close():
+        if _session and not _session.closed:
+            await _session.close()
+
+    try:
+        submit(_close()).result(timeout)
+    except Exception as e:
+        print(f"[DEBUG] Could not close download session: {e}")
+
+
+def _get_session():
+    # Only ever called on the loop thread
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=0, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT),
+            headers={"User-Agent": downloader.USER_AGENT},
+        )
+    return _session
+
+
+def _request_options(session):
+    """Headers and cookie jar of a requests.Session (e.g. AnkerClient's) for aiohttp."""
+    if session is None:
+        return {}, None
+    return dict(session.headers), session.cookies
+
+
+def _with_cookies(headers, jar, url):
+    """
+    headers plus the Cookie header jar holds for url. The jar keeps each
+    cookie's domain and path, so a mirror or CDN host gets none of Anker's.
+    """
+    if jar is None:
+        return headers
+    cookie = requests.cookies.get_cookie_header(jar, requests.Request("GET", url))
+    return dict(headers, Cookie=cookie) if cookie else headers
+
+
+# =========================================================================
+# CONTROL
+# =========================================================================
+class _Control:
+    """
+    Mirrors a DownloadController onto the loop: pause clears an asyncio.Event
+    and cancel cancels the running task, so nothing polls.
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        self.running = asyncio.Event()
+        self._sync()
+        controller.add_listener(self._on_change)
+
+    def _on_change(self):
+        self.loop.call_soon_threadsafe(self._sync)
+
+    def _sync(self):
+        if self.controller.cancelled:
+            self.running.set()
+            self.task.cancel()
+        elif self.controller.paused:
+            self.running.clear()
+        else:
+            self.running.set()
+
+    def close(self):
+        self.controller.remove_listener(self._on_change)
+
+    async def wait(self, amount):
+        """
+        Waits while paused and until amount bytes fit in the bandwidth limits.
+        Returns True if the download had been paused.
+        """
+        was_paused = not self.running.is_set()
+        if was_paused:
+            await self.running.wait()
+        for bucket in (self.controller.limiter, global_limiter):
+            delay = bucket.reserve(amount)
+            while delay > 0:
+                await asyncio.sleep(min(delay, MAX_WAIT))
+                delay = bucket.reserve(0)
+        return was_paused
+
+
+async def _stream_body(response, f, control, on_data, limit=None, reporter=None):
+    """
+    Copies the body to f through the writer pool. on_data(chunk) runs after
+    each chunk is written; limit stops after that many bytes. reporter
+    (a ProgressTracker) is told about pauses; on_data feeds it the bytes.
+    """
+    write = None
+    try:
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            if limit is not None:
+                chunk = chunk[:limit]
+            if reporter and not control.running.is_set():
+                reporter.paused(reporter.done)
+            if await control.wait(len(chunk)) and reporter:
+                # Restart speed measurement after the pause
+                reporter.reset(reporter.done)
+            write = _write_pool.submit(f.write, chunk)
+            await asyncio.wrap_future(write)
+            on_data(chunk)
+            if limit is not None:
+                limit -= len(chunk)
+                if limit <= 0:
+                    return
+    finally:
+        if write is not None and not write.done():
+            # Never let the caller close the file under an in-flight write
+            concurrent.futures.wait([write])
+
+
+# =========================================================================
+# HTTP DOWNLOADS
+# =========================================================================
+async def download_file_async(url, save_path, progress_callback, controller, session=None,
+                              checksum_algorithm=None, expected_hash=None, checksum_url=None, mirrors=None,
+                              extract=False, on_saved=None, post_process=None):
+    """
+    asyncio counterpart of core.downloader.download_file: same arguments,
+    progress messages, .part/.part.json resume files and result strings.
+    session: optional requests.Session whose headers, and cookies for the host, are sent.
+    Each transfer uses a single connection; pending ranges left by the thread
+    engine are fetched one after another. mirrors are raced up front like in
+    the thread engine, but a transfer stays on the winner. extract streams
+    .zip entries out of the file as it arrives, as in the thread engine.
+    """
+    control = _Control(controller)
+    state = None
+    part_path = None
+    extractor = None
+    try:
+        progress_callback(ProgressEvent(DownloadState.STARTING, "Starting connection..."))
+        headers, jar = _request_options(session)
+        http = _get_session()
+
+        # Module-level requests.get stands in for a session when none was given
+        pool = await asyncio.to_thread(downloader._pick_mirror, session or requests, url, mirrors, progress_callback)
+        if pool:
+            url = pool.current.url
+
+        async with http.get(url, headers=_with_cookies(headers, jar, url)) as r:
+            content_type = r.headers.get('Content-Type', '').lower()
+            if 'text/html' in content_type:
+                progress_callback(ProgressEvent(DownloadState.ERROR, "Error: Resolved link is a webpage, not a file."))
+                return "IS_HTML"
+
+            r.raise_for_status()
+
+            final_path = downloader._resolve_target_path(save_path, r, url)
+            if final_path != save_path:
+                progress_callback(ProgressEvent(DownloadState.STARTING, f"Saving as: {os.path.basename(final_path)}"))
+            part_path = final_path + downloader.PART_SUFFIX
+
+            total_length = body_length(r)
+
+            algorithm, expected = await asyncio.to_thread(
+                downloader._resolve_checksum, session or requests, r, final_path,
+                checksum_algorithm, expected_hash, checksum_url,
+            )
+            hasher = checksum.StreamingHash(algorithm) if algorithm else None
+            extractor = downloader.start_extractor(extract, part_path, final_path)
+
+            if downloader._supports_ranges(r, total_length):
+                state, resumed = downloader._prepare_state(r, url, part_path, total_length, 1)
+                if resumed:
+                    progress_callback(ProgressEvent(
+                        DownloadState.DOWNLOADING,
+                        f"Resuming at {format_size(state.downloaded)} / {format_size(total_length)}",
+                        done=state.downloaded, total=total_length,
+                    ))
+                await _download_ranges(
+                    http, r, part_path, state, progress_callback, control, hasher, headers, jar, extractor,
+                )
+            else:
+                await _download_single(r, part_path, total_length, progress_callback, control, hasher, extractor)
+
+        result = await asyncio.to_thread(
+            downloader._finish_download, part_path, final_path, state, hasher, expected, progress_callback, extractor,
+            post_process,
+        )
+        if on_saved and result.startswith("SUCCESS"):
+            on_saved(final_path)
+        return result
+
+    except asyncio.CancelledError:
+        if not controller.cancelled:
+            raise
+        return _stopped(part_path, state, progress_callback)
+    except Exception as e:
+        if controller.cancelled:
+            return _stopped(part_path, state, progress_callback)
+        progress_callback(ProgressEvent(DownloadState.ERROR, f"Error: {e}"))
+        return f"ERROR: {e}"
+    finally:
+        control.close()
+        if extractor:
+            await asyncio.to_thread(extractor.finish, False)
+
+
+def _stopped(part_path, state, progress_callback):
+    if part_path is None:
+        progress_callback(ProgressEvent(DownloadState.STOPPED, "Download Stopped."))
+        return "STOPPED"
+    if state:
+        downloader._checkpoint(part_path, state)
+    return downloader._handle_stopped(part_path, state, progress_callback)
+
+
+async def _download_ranges(http, r, part_path, state, progress_callback, control, hasher, headers, jar,
+                          extractor=None):
+    """Fetches the unfinished segments of state in order over one connection at a time."""
+    reporter = ProgressTracker(progress_callback, state.total)
+    reporter.reset(state.downloaded)
+    last_checkpoint = time.time()
+
+    with open(part_path, 'r+b', buffering=0) as f:
+        for segment in sorted(state.segments, key=lambda s: s.start):
+            attempts = 0
+            if hasher and segment.remaining > 0:
+                # Bytes an earlier attempt left on disk before this segment; the rest is hashed as it arrives
+                await asyncio.to_thread(hasher.catch_up, part_path, segment.position)
+            while segment.remaining > 0:
+                def on_data(chunk, segment=segment):
+                    nonlocal last_checkpoint
+                    if hasher and hasher.position == segment.position:
+                        hasher.update(chunk)
+                    segment.done += len(chunk)
+                    if extractor and segment.position == state.contiguous:
+                        extractor.advance(segment.position)
+                    reporter.update(state.downloaded)
+                    if time.time() - last_checkpoint >= downloader.STATE_SAVE_INTERVAL:
+                        # Everything counted in segment.done has been written already
+                        _write_pool.submit(downloader._checkpoint, part_path, state)
+                        last_checkpoint = time.time()
+
+                try:
+                    f.seek(segment.position)
+                    if segment.position == 0 and r is not None:
+                        # The initial response already streams from byte 0
+                        response, r = r, None
+                        await _stream_body(response, f, control, on_data, segment.remaining, reporter)
+                    else:
+                        range_headers = dict(
+                            _with_cookies(headers, jar, state.url),
+                            Range=f"bytes={segment.position}-{segment.end - 1}",
+                        )
+                        if state.if_range:
+                            range_headers["If-Range"] = state.if_range
+                        async with http.get(state.url, headers=range_headers) as response:
+                            if response.status != 206:
+                                raise IOError(f"Server ignored range request ({response.status})")
+                            await _stream_body(response, f, control, on_data, segment.remaining, reporter)
+                    if segment.remaining > 0:
+                        raise IOError("Connection closed before segment completed")
+                except (aiohttp.ClientError, asyncio.TimeoutError, IOError) as e:
+                    attempts += 1
+                    if attempts > downloader.SEGMENT_RETRIES:
+                        raise
+                    print(f"[DEBUG] Segment {segment.start}-{segment.end} retry {attempts}: {e}")
+                    await asyncio.sleep(attempts)
+
+    await asyncio.wrap_future(_write_pool.submit(downloader._checkpoint, part_path, state))
+    if hasher:
+        # Normally nothing is left by now
+        await asyncio.to_thread(hasher.catch_up, part_path, state.total)
+
+
+async def _download_single(r, part_path, total_length, progress_callback, control, hasher, extractor=None):
+    reporter = ProgressTracker(progress_callback, total_length)
+    downloaded = 0
+
+    def on_data(chunk):
+        nonlocal downloaded
+        if hasher:
+            hasher.update(chunk)
+        downloaded += len(chunk)
+        if extractor:
+            extractor.advance(downloaded)
+        reporter.update(downloaded)
+
+    with open(part_path, 'wb', buffering=0) as f:
+        preallocate(f, total_length)
+        await _stream_body(r, f, control, on_data, reporter=reporter)
+    if total_length and downloaded != total_length:
+        # The connection closed early; keep the .part rather than finish a short file
+        raise IOError(f"Incomplete download ({downloaded} of {total_length} bytes)")
+
+
+# =========================================================================
+# PLAIN FILE FETCH (Monochrome tracks)
+# =========================================================================
+async def fetch_to_file(url, output_path, progress_callback, controller):
+    """
+    Async counterpart of MonochromeDownloader.download_file: progress_callback
+    receives ProgressEvents. Removes the file and raises DownloadCancelled
+    when cancelled.
+    """
+    control = _Control(controller)
+    downloaded = 0
+    try:
+        async with _get_session().get(url) as r:
+            r.raise_for_status()
+            total_size = body_length(r)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            reporter = ProgressTracker(progress_callback, total_size) if progress_callback else None
+
+            def on_data(chunk):
+                nonlocal downloaded
+                downloaded += len(chunk)
+                if reporter:
+                    reporter.update(downloaded)
+
+            with open(output_path, 'wb', buffering=0) as f:
+                preallocate(f, total_size)
+                await _stream_body(r, f, control, on_data, reporter=reporter)
+            if total_size and downloaded != total_size:
+                raise IOError(f"Incomplete download ({downloaded} of {total_size} bytes)")
+    except BaseException:
+        # Don't leave a truncated track behind, it would be skipped as "EXISTS" next time
+        output_path.unlink(missing_ok=True)
+        if controller.cancelled:
+            raise DownloadCancelled() from None
+        raise
+    finally:
+        control.close()
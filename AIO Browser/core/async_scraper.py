@@ -0,0 +1,195 @@
+# core/async_scraper.py
+# asyncio scraping core. Page fetches of the scraper sources run as tasks on
+# the shared event loop (core.async_engine) over one kept-alive aiohttp
+# session, so fanning out to dozens of pages takes no extra threads. A
+# semaphore per host caps how many requests each site gets at once, and
+# closing a search's iterator cancels whatever it still has in flight.
+# Pages go through the disk cache (core.http_cache) like the threaded path.
+import asyncio
+import concurrent.futures
+import queue
+from urllib.parse import urlparse
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from core import async_engine, host_policy
+from core.http_cache import DEFAULT_TTL, CachedResponse, cache
+from core.http_session import USER_AGENT
+
+HOST_CONCURRENCY = 8  # requests in flight per host
+DEFAULT_TIMEOUT = 20  # seconds per request when the caller gives none
+CANCEL_POLL = 0.2  # seconds between checks of a search's cancelled() callback
+
+# Cache reads/writes and HTML parsing run here, off the loop; parsing holds
+# the GIL anyway, so a couple of threads serve any number of pages
+_worker_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="scrape-worker")
+
+_session = None
+_host_slots = {}  # host -> asyncio.Semaphore; only touched on the loop thread
+
+
+def available():
+    return aiohttp is not None
+
+
+def close(timeout=2):
+    """Closes the scraping session (call on app exit)."""
+    if _session is None:
+        return
+
+    async def _close():
+        if not _session.closed:
+            await _session.close()
+
+    try:
+        async_engine.submit(_close()).result(timeout)
+    except Exception as e:
+        print(f"[DEBUG] Could not close scraping session: {e}")
+
+
+def _get_session():
+    # Only ever called on the loop thread
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=0, ttl_dns_cache=300),
+            headers={"User-Agent": USER_AGENT},
+        )
+    return _session
+
+
+async def in_worker(func, *args):
+    """Runs func(*args) on the scraping worker threads and returns its result."""
+    return await asyncio.get_running_loop().run_in_executor(_worker_pool, func, *args)
+
+
+def _slot(url):
+    host = urlparse(url).hostname or ""
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(HOST_CONCURRENCY)
+    return slot
+
+
+class _Response(CachedResponse):
+    """A fetched page in the shape the scrapers read (status_code, text, json())."""
+
+    from_cache = False
+
+    def __init__(self, url, status, headers, content, encoding):
+        super().__init__(url, headers, content, encoding)
+        self.status_code = status
+        self.ok = status < 400
+
+
+# =========================================================================
+# FETCHING
+# =========================================================================
+async def fetch(url, headers=None, ttl=DEFAULT_TTL, timeout=DEFAULT_TIMEOUT):
+    """
+    GET url through the disk cache, like HttpCache.get: fresh copies are
+    served from disk, older ones revalidated, and a stale copy is returned if
+    the network fails. Waits for a free slot of the url's host first.
+    """
+    cached, validators = await in_worker(cache.lookup, url, ttl)
+    if cached:
+        return cached
+
+    headers = headers or {}
+    try:
+        resp = await _request(url, {**headers, **validators}, timeout)
+        if resp.status_code == 304 and validators:
+            cached = await in_worker(cache.cached, url, True)
+            if cached:
+                return cached
+            # Body went missing; ask again without validators
+            resp = await _request(url, headers, timeout)
+    except (aiohttp.ClientError, asyncio.TimeoutError, host_policy.CircuitOpenError):
+        cached = await in_worker(cache.cached, url)
+        if cached:
+            print(f"[DEBUG] Offline, using cached copy of {url}")
+            return cached
+        raise
+
+    if resp.status_code == 200:
+        await in_worker(cache.store, url, resp)
+    return resp
+
+
+async def _request(url, headers, timeout):
+    policy = host_policy.policy_for(url)
+    async with _slot(url):
+        await policy.before_request_async()
+        try:
+            async with _get_session().get(
+                url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as r:
+                content = await r.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            policy.record(None)
+            raise
+    policy.record(r.status, r.headers.get("Retry-After"))
+    return _Response(str(r.url), r.status, dict(r.headers), content, r.charset)
+
+
+# =========================================================================
+# SYNC BRIDGE
+# =========================================================================
+_DONE = object()
+
+
+def get(url, cancelled=None, **kwargs):
+    """
+    fetch() for synchronous callers: runs it on the shared loop and waits.
+    Raises concurrent.futures.CancelledError once cancelled() turns true,
+    after cancelling the request.
+    """
+    future = async_engine.submit(fetch(url, **kwargs))
+    while True:
+        try:
+            return future.result(timeout=CANCEL_POLL if cancelled else None)
+        except concurrent.futures.TimeoutError:
+            if cancelled():
+                future.cancel()
+                raise concurrent.futures.CancelledError()
+
+
+def iterate(results, cancelled=None):
+    """
+    Runs the async generator results on the shared loop and yields its items
+    to the calling thread as they come. Closing the returned generator, or
+    cancelled() turning true (e.g. the user started another search), cancels
+    every request it still has in flight.
+    """
+    out = queue.Queue()
+
+    async def pump():
+        try:
+            async for item in results:
+                out.put(item)
+        except Exception as e:
+            out.put(e)
+        finally:
+            out.put(_DONE)
+
+    future = async_engine.submit(pump())
+    try:
+        while True:
+            try:
+                item = out.get(timeout=CANCEL_POLL if cancelled else None)
+            except queue.Empty:
+                if cancelled():
+                    return
+                continue
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+            if cancelled and cancelled():
+                return
+    finally:
+        future.cancel()
@@ -0,0 +1,185 @@
+# core/catalog.py
+# Local index of every game listing the scrapers have returned, in SQLite with
+# an FTS5 trigram index on the titles. Searches are answered from it at once
+# (substring and typo-tolerant matches) while the live sources are still
+# being queried, and it keeps search working offline.
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from core.path_utils import get_root_dir
+
+MAX_AGE = 180 * 24 * 60 * 60  # seconds; listings not seen again for this long are pruned
+SEARCH_LIMIT = 50
+FUZZY_CANDIDATES = 200  # best FTS matches re-scored for the fuzzy pass
+FUZZY_MIN_SCORE = 0.5  # share of the query's trigrams a title must contain
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    link TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    data TEXT NOT NULL,
+    seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_seen ON games(seen);
+CREATE VIRTUAL TABLE IF NOT EXISTS games_fts USING fts5(
+    title, content='games', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS games_ai AFTER INSERT ON games BEGIN
+    INSERT INTO games_fts(rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS games_ad AFTER DELETE ON games BEGIN
+    INSERT INTO games_fts(games_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS games_au AFTER UPDATE OF title ON games BEGIN
+    INSERT INTO games_fts(games_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO games_fts(rowid, title) VALUES (new.id, new.title);
+END;
+"""
+
+
+def _words(text):
+    return re.sub(r"[^\w]+", " ", text.lower()).split()
+
+
+def _trigrams(text):
+    grams = set()
+    for word in _words(text):
+        grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+class Catalog:
+    """
+    Game listings keyed by link. data holds the scraper's result dict
+    (title, link, image, magnet, size, platforms, ...) as returned.
+    Safe to use from several threads at once.
+    """
+
+    def __init__(self, path, max_age=MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(_SCHEMA)
+            self._db = db
+            self._prune(time.time() - self.max_age)
+        return self._db
+
+    # ---------------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------------
+    def upsert(self, source, games):
+        """Adds or refreshes listings from one source ("AnkerGames", "FitGirl", "Axekin")."""
+        now = time.time()
+        rows = [
+            (game["link"], source, game.get("title") or "", json.dumps(game), now)
+            for game in games
+            if game.get("link")
+        ]
+        if not rows:
+            return
+        try:
+            with self._lock:
+                db = self._connect()
+                with db:
+                    db.executemany(
+                        "INSERT INTO games (link, source, title, data, seen) VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT(link) DO UPDATE SET "
+                        "source = excluded.source, title = excluded.title, data = excluded.data, seen = excluded.seen",
+                        rows,
+                    )
+        except sqlite3.Error as e:
+            print(f"[DEBUG] Could not update catalog: {e}")
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """
+        Returns [(source, game), ...] for query: titles containing every word
+        of it first (those starting with it on top), then titles sharing most
+        of its trigrams, which catches typos.
+        """
+        words = _words(query)
+        if not words:
+            return []
+        try:
+            with self._lock:
+                db = self._connect()
+                rows = self._substring_matches(db, query, words, limit)
+                if len(rows) < limit:
+                    found = {row[0] for row in rows}
+                    rows += [row for row in self._fuzzy_matches(db, query) if row[0] not in found]
+        except sqlite3.Error as e:
+            print(f"[DEBUG] Catalog search failed: {e}")
+            return []
+        return [(source, json.loads(data)) for _, source, data in rows[:limit]]
+
+    def prune(self, max_age=None):
+        """Drops listings not seen for max_age seconds. Returns how many went."""
+        try:
+            with self._lock:
+                return self._prune(time.time() - (self.max_age if max_age is None else max_age))
+        except sqlite3.Error as e:
+            print(f"[DEBUG] Could not prune catalog: {e}")
+            return 0
+
+    def clear(self):
+        self.prune(max_age=-1)
+
+    # ---------------------------------------------------------------------
+    # Queries
+    # ---------------------------------------------------------------------
+    def _prune(self, cutoff):
+        db = self._connect()
+        with db:
+            return db.execute("DELETE FROM games WHERE seen < ?", (cutoff,)).rowcount
+
+    @staticmethod
+    def _like(text):
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    def _substring_matches(self, db, query, words, limit):
+        # LIKE on a trigram table is answered from the index for terms of 3+ characters
+        conditions = " AND ".join(["games_fts.title LIKE ? ESCAPE '\\'"] * len(words))
+        params = [f"%{self._like(word)}%" for word in words]
+        prefix = f"{self._like(' '.join(words))}%"
+        return db.execute(
+            "SELECT games.id, games.source, games.data FROM games_fts "
+            "JOIN games ON games.id = games_fts.rowid "
+            f"WHERE {conditions} "
+            "ORDER BY games.title LIKE ? ESCAPE '\\' DESC, games.seen DESC LIMIT ?",
+            params + [prefix, limit],
+        ).fetchall()
+
+    def _fuzzy_matches(self, db, query):
+        grams = _trigrams(query)
+        if not grams:
+            return []
+        match = " OR ".join('"' + gram.replace('"', '""') + '"' for gram in grams)
+        candidates = db.execute(
+            "SELECT games.id, games.source, games.data, games.title FROM games_fts "
+            "JOIN games ON games.id = games_fts.rowid "
+            "WHERE games_fts MATCH ? ORDER BY rank LIMIT ?",
+            (match, FUZZY_CANDIDATES),
+        ).fetchall()
+        scored = []
+        for row_id, source, data, title in candidates:
+            score = len(grams & _trigrams(title)) / len(grams)
+            if score >= FUZZY_MIN_SCORE:
+                scored.append((score, row_id, source, data))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [(row_id, source, data) for _, row_id, source, data in scored]
+
+
+catalog = Catalog(str(get_root_dir() / "cache" / "catalog.db"))
@@ -0,0 +1,131 @@
+# core/checksum.py
+# Incremental checksums computed while a download is written, so verifying a
+# finished file doesn't need another full read of it.
+import base64
+import binascii
+import hashlib
+import re
+import zlib
+
+ALGORITHMS = ("sha256", "md5", "crc32")
+READ_BLOCK = 1024 * 1024
+
+_HEX_RE = re.compile(r"\b[0-9a-fA-F]{8,128}\b")
+
+
+class _Crc32:
+    """hashlib-style wrapper around zlib.crc32."""
+
+    def __init__(self):
+        self._value = 0
+
+    def update(self, data):
+        self._value = zlib.crc32(data, self._value)
+
+    def hexdigest(self):
+        return f"{self._value & 0xFFFFFFFF:08x}"
+
+
+def _new_hash(algorithm):
+    if algorithm == "crc32":
+        return _Crc32()
+    return hashlib.new(algorithm)
+
+
+class StreamingHash:
+    """
+    Hashes a file front to back as it is produced. Data arriving in order is
+    fed with update(); for out-of-order writers (segmented downloads, resumes)
+    catch_up() reads the already written prefix back from disk, which is
+    normally still in the page cache.
+    """
+
+    def __init__(self, algorithm):
+        algorithm = algorithm.lower()
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unsupported checksum algorithm '{algorithm}'")
+        self.algorithm = algorithm
+        self.position = 0
+        self._hash = _new_hash(algorithm)
+
+    def update(self, data):
+        self._hash.update(data)
+        self.position += len(data)
+
+    def catch_up(self, path, end):
+        """Hashes bytes [position, end) of path."""
+        if end <= self.position:
+            return
+        with open(path, "rb") as f:
+            f.seek(self.position)
+            while self.position < end:
+                block = f.read(min(READ_BLOCK, end - self.position))
+                if not block:
+                    break
+                self.update(block)
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def verify(self, expected):
+        return expected is None or self.hexdigest() == expected.lower()
+
+
+def parse_expected(value, algorithm=None):
+    """
+    Accepts "sha256:<hex>", "<algorithm>=<hex>" or a bare hex digest and
+    returns (algorithm, hex). Bare digests are matched to an algorithm by
+    length when none is given.
+    """
+    if not value:
+        return None, None
+    value = value.strip()
+    match = re.match(r"^(sha256|md5|crc32)[:=](.+)$", value, re.IGNORECASE)
+    if match:
+        return match.group(1).lower(), match.group(2).strip().lower()
+    if not algorithm:
+        algorithm = {64: "sha256", 32: "md5", 8: "crc32"}.get(len(value))
+    return algorithm, value.lower()
+
+
+def expected_from_headers(headers):
+    """Reads a digest the server advertises for the full body (Digest / Content-MD5)."""
+    digest = headers.get("Digest") or headers.get("Repr-Digest") or ""
+    for part in digest.split(","):
+        name, _, encoded = part.strip().partition("=")
+        name = name.strip().lower()
+        encoded = encoded.strip().strip(":")
+        algorithm = {"sha-256": "sha256", "md5": "md5"}.get(name)
+        if algorithm and encoded:
+            try:
+                return algorithm, base64.b64decode(encoded).hex()
+            except (binascii.Error, ValueError):
+                pass
+
+    content_md5 = headers.get("Content-MD5")
+    if content_md5:
+        try:
+            return "md5", base64.b64decode(content_md5).hex()
+        except (binascii.Error, ValueError):
+            pass
+    return None, None
+
+
+def expected_from_sidecar(text, filename=None):
+    """
+    Parses a checksum file (.sha256 / .md5 / .sfv style). Prefers the line
+    naming filename, otherwise the first digest found.
+    """
+    first = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith((";", "#")):
+            continue
+        match = _HEX_RE.search(line)
+        if not match:
+            continue
+        if filename and filename in line:
+            return match.group(0).lower()
+        if first is None:
+            first = match.group(0).lower()
+    return first
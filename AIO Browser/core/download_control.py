@@ -0,0 +1,145 @@
+# core/download_control.py
+# Pause/resume/cancel handle shared between the UI and download workers.
+import socket
+import threading
+
+from core.rate_limit import TokenBucket, global_limiter
+
+
+class DownloadCancelled(Exception):
+    """Raised inside a worker when its download was cancelled."""
+
+
+class DownloadController:
+    """
+    Event-based replacement for the old {'paused': bool, 'stopped': bool} dict.
+    Workers block on the events instead of polling, so a paused download costs
+    no CPU, and cancel() also aborts any in-flight socket read.
+    """
+
+    def __init__(self):
+        self._running = threading.Event()
+        self._running.set()
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._streams = set()
+        # Per-download speed cap, applied on top of the global one
+        self.limiter = TokenBucket()
+        self._listeners = []
+
+    # ---------------------------------------------------------------------
+    # UI side
+    # ---------------------------------------------------------------------
+    def pause(self):
+        if not self.cancelled:
+            self._running.clear()
+            self._notify()
+
+    def resume(self):
+        self._running.set()
+        self._notify()
+
+    def cancel(self):
+        self._cancelled.set()
+        # Wake anything blocked on pause so it can see the cancel
+        self._running.set()
+        with self._lock:
+            streams = list(self._streams)
+            self._streams.clear()
+        for stream in streams:
+            _abort_stream(stream)
+        self._notify()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    # ---------------------------------------------------------------------
+    # Listeners (for workers that can't block on threading events, e.g. asyncio)
+    # ---------------------------------------------------------------------
+    def add_listener(self, listener):
+        """listener() is called on the calling thread after every pause/resume/cancel."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify(self):
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener()
+            except Exception as e:
+                print(f"[DEBUG] Download control listener failed: {e}")
+
+    # ---------------------------------------------------------------------
+    # Worker side
+    # ---------------------------------------------------------------------
+    def wait_while_paused(self, timeout=None):
+        """Blocks while paused. Returns False if the download was cancelled."""
+        self._running.wait(timeout)
+        return not self.cancelled
+
+    def wait(self, timeout):
+        """Sleeps up to timeout seconds, returning early (True) on cancel."""
+        return self._cancelled.wait(timeout)
+
+    def throttle(self, amount):
+        """
+        Waits until amount bytes fit in both this download's and the global
+        bandwidth budget. Returns False if cancelled meanwhile.
+        """
+        for bucket in (self.limiter, global_limiter):
+            if not bucket.consume(amount, lambda: self.cancelled):
+                return False
+        return not self.cancelled
+
+    def interrupt(self):
+        """Aborts the in-flight reads without cancelling, so workers reconnect."""
+        with self._lock:
+            streams = list(self._streams)
+            self._streams.clear()
+        for stream in streams:
+            _abort_stream(stream)
+
+    def check(self):
+        """Blocks while paused and raises DownloadCancelled once cancelled."""
+        if not self.wait_while_paused():
+            raise DownloadCancelled()
+
+    def attach(self, stream):
+        """Registers an open response so cancel() can abort its blocking read."""
+        with self._lock:
+            if not self.cancelled:
+                self._streams.add(stream)
+                return
+        _abort_stream(stream)
+
+    def detach(self, stream):
+        with self._lock:
+            self._streams.discard(stream)
+
+
+def _abort_stream(stream):
+    # Closing the response alone doesn't interrupt a recv() blocked in another
+    # thread; shutting the socket down does.
+    try:
+        raw = getattr(stream, "raw", stream)
+        conn = getattr(raw, "_connection", None)
+        sock = getattr(conn, "sock", None)
+        if sock is not None:
+            sock.shutdown(socket.SHUT_RDWR)
+    except Exception:
+        pass
+    try:
+        stream.close()
+    except Exception:
+        pass
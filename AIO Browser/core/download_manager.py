@@ -0,0 +1,569 @@
+# core/download_manager.py
+# Central download queue. Every download (direct, YouTube, Monochrome) is submitted here
+# and started by the scheduler once a slot is free, instead of as a bare thread.
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+
+import requests
+
+from core import async_engine
+from core.download_control import DownloadCancelled, DownloadController
+from core.extract import ExtractionPool, extract_dir_for, is_archive, is_zip
+from core.path_utils import get_root_dir
+from core.progress import DownloadState, ProgressEvent
+
+DEFAULT_MAX_ACTIVE = 3
+DEFAULT_PER_HOST_LIMIT = 2
+
+# Download engines
+ENGINE_THREADS = "threads"
+ENGINE_ASYNCIO = "asyncio"
+
+# Job states
+QUEUED = "queued"
+ACTIVE = "active"
+EXTRACTING = "extracting"  # downloaded; unpacking without holding a download slot
+FINISHED = "finished"
+FAILED = "failed"
+STOPPED = "stopped"
+
+
+class DownloadJob:
+    """A queued unit of work. Only kind/title/params/priority are persisted."""
+
+    def __init__(self, kind, title, params, priority=0, host=None, job_id=None,
+                 controller=None, session=None, progress_callback=None, on_finished=None, response=None):
+        self.id = job_id or str(uuid.uuid4())
+        self.kind = kind
+        self.title = title
+        self.params = params
+        self.priority = priority
+        # None for jobs without a URL (e.g. Monochrome tracks): not per-host capped
+        self.host = host or _host_of(params.get("url"))
+        self.status = QUEUED
+        self.result = None
+        self.output = None  # Handler specific, e.g. the saved file path
+        self.created = time.time()
+        self.seq = 0
+
+        # Runtime only
+        self.controller = controller or DownloadController()
+        self.session = session
+        self.response = response  # open streamed GET of params["url"] for the http handler
+        self.progress_callback = progress_callback
+        self.on_finished = on_finished
+        self.extracted = False
+
+    def report(self, event):
+        """Forwards a core.progress.ProgressEvent to the job's progress_callback."""
+        if self.progress_callback:
+            self.progress_callback(event)
+
+    def release_response(self):
+        """Closes a handed over response the handler will not use."""
+        if self.response is not None:
+            self.response.close()
+            self.response = None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "title": self.title,
+            "params": self.params,
+            "priority": self.priority,
+            "created": self.created,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        job = cls(
+            data["kind"],
+            data.get("title") or "Download",
+            data.get("params") or {},
+            priority=data.get("priority", 0),
+            job_id=data.get("id"),
+        )
+        job.created = data.get("created", job.created)
+        return job
+
+
+def _extracts_after_download(params, path):
+    """Whether the manager unpacks path once its download has finished (see _start_extraction)."""
+    if params.get("extract") and is_zip(path):
+        return False  # Unpacked while it downloaded
+    return bool(params.get("extract_archives")) and is_archive(path)
+
+
+def _host_of(url):
+    if not url:
+        return None
+    try:
+        return urlparse(url).hostname
+    except Exception:
+        return None
+
+
+class DownloadManager:
+    """
+    Priority queue with a global cap on active downloads and a per-host cap
+    (for jobs with a host; those without a URL only count against the global cap).
+    Handlers run on worker threads: handler(job) -> result string
+    ("SUCCESS" or "SUCCESS:<details>", "STOPPED", "ERROR: ...").
+    Coroutine handlers run as tasks on the shared asyncio download loop instead.
+    Listeners are called with the changed job from whatever thread changed it.
+
+    Post-processing: a successful job whose job.output is an archive and
+    whose params ask for "extract_archives" is unpacked by the extraction
+    pool before it finishes ("delete_archive" removes it afterwards).
+    """
+
+    def __init__(self, state_path=None, max_active=DEFAULT_MAX_ACTIVE, per_host_limit=DEFAULT_PER_HOST_LIMIT):
+        self.state_path = state_path or str(get_root_dir() / "download_queue.json")
+        self.max_active = max(1, int(max_active))
+        self.per_host_limit = max(1, int(per_host_limit))
+        self.handlers = dict(DEFAULT_HANDLERS)
+        self.engine = ENGINE_THREADS
+        self.extraction = ExtractionPool()
+        self.listeners = []
+        self.jobs = {}
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self._started = False
+        self._closing = False
+
+    # ---------------------------------------------------------------------
+    # Configuration
+    # ---------------------------------------------------------------------
+    def register_handler(self, kind, handler):
+        self.handlers[kind] = handler
+
+    def set_engine(self, engine):
+        """
+        Switches the http/monochrome handlers between one thread per download
+        and the asyncio engine. Running downloads keep the engine they started on.
+        """
+        if engine == ENGINE_ASYNCIO and not async_engine.available():
+            print("[DEBUG] aiohttp is not installed, using threaded downloads")
+            engine = ENGINE_THREADS
+        handlers = ASYNC_HANDLERS if engine == ENGINE_ASYNCIO else DEFAULT_HANDLERS
+        for kind in ASYNC_HANDLERS:
+            self.handlers[kind] = handlers[kind]
+        self.engine = engine
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def set_limits(self, max_active=None, per_host_limit=None):
+        with self._lock:
+            if max_active is not None:
+                self.max_active = max(1, int(max_active))
+            if per_host_limit is not None:
+                self.per_host_limit = max(1, int(per_host_limit))
+        self._schedule()
+
+    # ---------------------------------------------------------------------
+    # Queue operations
+    # ---------------------------------------------------------------------
+    def submit(self, kind, title, params, priority=0, **kwargs):
+        if kind not in self.handlers:
+            raise ValueError(f"No download handler for '{kind}'")
+        job = DownloadJob(kind, title, params, priority=priority, **kwargs)
+        with self._lock:
+            job.seq = next(self._seq)
+            self.jobs[job.id] = job
+            self._save()
+        self._notify(job)
+        self._schedule()
+        return job
+
+    def restore(self):
+        """Re-queues jobs left unfinished by a previous session. Call before start()."""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return []
+
+        restored = []
+        with self._lock:
+            for data in sorted(saved, key=lambda d: d.get("created", 0)):
+                try:
+                    job = DownloadJob.from_dict(data)
+                except (KeyError, TypeError):
+                    continue
+                if job.kind not in self.handlers or job.id in self.jobs:
+                    continue
+                job.seq = next(self._seq)
+                self.jobs[job.id] = job
+                restored.append(job)
+        return restored
+
+    def start(self):
+        """Begins dispatching queued jobs."""
+        self._started = True
+        self._schedule()
+
+    def shutdown(self):
+        """Stops active jobs but keeps them (and queued jobs) persisted for next launch."""
+        with self._lock:
+            self._closing = True
+            self._save()
+            for job in self.jobs.values():
+                if job.status in (ACTIVE, EXTRACTING):
+                    job.controller.cancel()
+        self.extraction.shutdown()
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return
+            job.controller.cancel()
+            if job.status != QUEUED:
+                return
+            job.release_response()
+            job.status = STOPPED
+            job.result = "STOPPED"
+            self.jobs.pop(job_id, None)
+            self._save()
+        self._notify(job)
+        if job.on_finished:
+            job.on_finished(job)
+
+    def set_priority(self, job_id, priority):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return
+            job.priority = priority
+            self._save()
+        self._notify(job)
+        self._schedule()
+
+    def move_to_front(self, job_id):
+        with self._lock:
+            top = max((j.priority for j in self.jobs.values()), default=0)
+        self.set_priority(job_id, top + 1)
+
+    def busy(self):
+        """True while a job is queued, downloading or extracting."""
+        with self._lock:
+            return any(j.status in (QUEUED, ACTIVE, EXTRACTING) for j in self.jobs.values())
+
+    def snapshot(self):
+        """Returns (active_jobs, queued_jobs_in_start_order)."""
+        with self._lock:
+            active = [j for j in self.jobs.values() if j.status == ACTIVE]
+            queued = sorted(
+                (j for j in self.jobs.values() if j.status == QUEUED),
+                key=lambda j: (-j.priority, j.seq),
+            )
+        return active, queued
+
+    # ---------------------------------------------------------------------
+    # Scheduling
+    # ---------------------------------------------------------------------
+    def _schedule(self):
+        to_start = []
+        with self._lock:
+            if not self._started or self._closing:
+                return
+            active, queued = self.snapshot()
+            per_host = {}
+            for job in active:
+                per_host[job.host] = per_host.get(job.host, 0) + 1
+
+            slots = self.max_active - len(active)
+            for job in queued:
+                if slots <= 0:
+                    break
+                if job.controller.cancelled:
+                    continue
+                if job.host and per_host.get(job.host, 0) >= self.per_host_limit:
+                    continue
+                job.status = ACTIVE
+                per_host[job.host] = per_host.get(job.host, 0) + 1
+                slots -= 1
+                to_start.append(job)
+
+        for job in to_start:
+            self._notify(job)
+            handler = self.handlers[job.kind]
+            if asyncio.iscoroutinefunction(handler):
+                future = async_engine.submit(handler(job))
+                future.add_done_callback(lambda f, job=job: self._finish_async(job, f))
+            else:
+                threading.Thread(target=self._run, args=(job,), daemon=True).start()
+
+        if to_start or queued:
+            # Queue positions shift whenever something starts
+            for job in queued:
+                if job not in to_start:
+                    self._notify(job)
+
+    def _run(self, job):
+        try:
+            result = self.handlers[job.kind](job)
+        except Exception as e:
+            print(f"[DEBUG] Download job {job.title} crashed: {e}")
+            result = f"ERROR: {e}"
+        self._finish(job, result)
+
+    def _finish_async(self, job, future):
+        try:
+            result = future.result()
+        except Exception as e:
+            if job.controller.cancelled:
+                result = "STOPPED"
+            else:
+                print(f"[DEBUG] Download job {job.title} crashed: {e}")
+                result = f"ERROR: {e}"
+        self._finish(job, result)
+
+    def _finish(self, job, result):
+        if result.startswith("SUCCESS") and self._start_extraction(job, result):
+            return  # Called again once the archive is unpacked
+        with self._lock:
+            job.result = result
+            if result.startswith("SUCCESS"):
+                job.status = FINISHED
+            elif result == "STOPPED":
+                job.status = STOPPED
+            else:
+                job.status = FAILED
+            if not self._closing:
+                # On shutdown the job stays persisted so it resumes next launch
+                self.jobs.pop(job.id, None)
+                self._save()
+
+        self._notify(job)
+        if job.on_finished:
+            try:
+                job.on_finished(job)
+            except Exception as e:
+                print(f"[DEBUG] Download finished callback failed: {e}")
+        self._schedule()
+
+    def _start_extraction(self, job, result):
+        """Hands a downloaded archive to the extraction pool. False if there is nothing to do."""
+        path = job.output
+        if job.extracted or not path:
+            return False
+        job.extracted = True
+        delete_archive = job.params.get("delete_archive", False)
+        if job.params.get("extract") and is_zip(path):
+            # Already unpacked while it downloaded
+            if delete_archive:
+                try: os.remove(path)
+                except OSError as e: print(f"[DEBUG] Could not delete {path}: {e}")
+            return False
+        if not _extracts_after_download(job.params, path):
+            return False
+
+        with self._lock:
+            job.status = EXTRACTING
+        self._notify(job)
+        # The download slot is free while the archive is unpacked
+        self._schedule()
+        self.extraction.submit(
+            path,
+            extract_dir_for(path),
+            job.report,
+            job.controller,
+            lambda extracted: self._finish_extraction(job, result, extracted),
+            delete_archive=delete_archive,
+        )
+        return True
+
+    def _finish_extraction(self, job, result, extracted):
+        """Reports the end of a job's extraction, which the download left at PROCESSING."""
+        if extracted == "SUCCESS":
+            dest_dir = os.path.basename(extract_dir_for(job.output))
+            job.report(ProgressEvent(DownloadState.FINISHED, f"Download Complete! Extracted to {dest_dir}"))
+            # Keep the download's own result (e.g. its checksum)
+            extracted = result
+        elif extracted == "STOPPED":
+            job.report(ProgressEvent(DownloadState.STOPPED, "Extraction stopped."))
+        else:
+            job.report(ProgressEvent(DownloadState.ERROR, f"Error: {extracted.removeprefix('ERROR: ')}"))
+        self._finish(job, extracted)
+
+    # ---------------------------------------------------------------------
+    # Helpers
+    # ---------------------------------------------------------------------
+    def _notify(self, job):
+        for listener in list(self.listeners):
+            try:
+                listener(job)
+            except Exception as e:
+                print(f"[DEBUG] Download listener failed: {e}")
+
+    def _save(self):
+        data = [
+            j.to_dict()
+            for j in sorted(self.jobs.values(), key=lambda j: j.seq)
+            if j.status in (QUEUED, ACTIVE)
+        ]
+        try:
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except (OSError, TypeError) as e:
+            print(f"[DEBUG] Could not save download queue: {e}")
+
+
+# =========================================================================
+# BUILT-IN HANDLERS
+# =========================================================================
+def _download_session(session):
+    """
+    A fresh session with session's headers and cookies for a download. The
+    original (e.g. AnkerClient's, still used by its API calls and the link
+    prefetcher) is left untouched.
+    """
+    if session is None:
+        return None
+    download = requests.Session()
+    download.headers.update(session.headers)
+    # Only meant for AnkerClient's page/API requests
+    download.headers.pop("Referer", None)
+    download.headers.pop("X-Requested-With", None)
+    download.cookies.update(session.cookies)
+    return download
+
+
+def _run_http_job(job):
+    from core import downloader
+
+    session = _download_session(job.session)
+    response, job.response = job.response, None
+    if response is not None and time.time() - job.created > downloader.HANDOFF_MAX_AGE:
+        # Waited in the queue too long for the connection to still be alive
+        response.close()
+        response = None
+    job.report(ProgressEvent(DownloadState.STARTING, "⏳ Preparing download..."))
+    return downloader.download_file(
+        job.params["url"],
+        job.params["save_path"],
+        job.report,
+        job.controller,
+        session=session,
+        checksum_algorithm=job.params.get("checksum"),
+        expected_hash=job.params.get("expected_hash"),
+        checksum_url=job.params.get("checksum_url"),
+        mirrors=job.params.get("mirrors"),
+        extract=job.params.get("extract", False),
+        on_saved=lambda path: setattr(job, "output", path),
+        post_process=lambda path: _extracts_after_download(job.params, path),
+        response=response,
+    )
+
+
+def _run_youtube_job(job):
+    from core.youtube_downloader import YoutubeDownloader
+
+    yt = YoutubeDownloader(progress_callback=job.report)
+    return yt.download(
+        job.params["url"],
+        job.params["save_path"],
+        mode=job.params.get("mode", "video"),
+        quality=job.params.get("quality", "Best Available"),
+        controller=job.controller,
+    )
+
+
+_monochrome_downloader = None
+
+
+def _get_monochrome_downloader():
+    from core.monochrome_downloader import MonochromeAPI, MonochromeDownloader
+
+    global _monochrome_downloader
+    if _monochrome_downloader is None:
+        _monochrome_downloader = MonochromeDownloader(MonochromeAPI())
+    return _monochrome_downloader
+
+
+def _run_monochrome_job(job):
+    from pathlib import Path
+
+    try:
+        job.output = _get_monochrome_downloader().download_track(
+            job.params["track"],
+            Path(job.params["output_dir"]),
+            job.params.get("quality", "LOSSLESS"),
+            job.report,
+            controller=job.controller,
+        )
+    except DownloadCancelled:
+        return "STOPPED"
+    except Exception as e:
+        return f"ERROR: {e}"
+    return "SUCCESS"
+
+
+DEFAULT_HANDLERS = {
+    "http": _run_http_job,
+    "youtube": _run_youtube_job,
+    "monochrome": _run_monochrome_job,
+}
+
+
+# =========================================================================
+# ASYNCIO HANDLERS
+# =========================================================================
+async def _run_http_job_async(job):
+    session = _download_session(job.session)
+    job.release_response()  # aiohttp opens its own connection
+    job.report(ProgressEvent(DownloadState.STARTING, "⏳ Preparing download..."))
+    return await async_engine.download_file_async(
+        job.params["url"],
+        job.params["save_path"],
+        job.report,
+        job.controller,
+        session=session,
+        checksum_algorithm=job.params.get("checksum"),
+        expected_hash=job.params.get("expected_hash"),
+        checksum_url=job.params.get("checksum_url"),
+        mirrors=job.params.get("mirrors"),
+        extract=job.params.get("extract", False),
+        on_saved=lambda path: setattr(job, "output", path),
+        post_process=lambda path: _extracts_after_download(job.params, path),
+    )
+
+
+async def _run_monochrome_job_async(job):
+    from pathlib import Path
+
+    mono = _get_monochrome_downloader()
+    track = job.params["track"]
+    try:
+        # API calls and tagging are blocking and short; only the transfer is async
+        output_path, download_url, file_ext = await asyncio.to_thread(
+            mono.prepare_track, track, Path(job.params["output_dir"]), job.params.get("quality", "LOSSLESS")
+        )
+        if download_url is None:
+            job.output = f"EXISTS:{output_path}"
+            return "SUCCESS"
+        await async_engine.fetch_to_file(download_url, output_path, job.report, job.controller)
+        job.report(ProgressEvent(DownloadState.PROCESSING, "Adding cover art and tags...", progress=1.0))
+        job.output = await asyncio.to_thread(mono.finish_track, track, output_path, file_ext)
+    except DownloadCancelled:
+        return "STOPPED"
+    except Exception as e:
+        return f"ERROR: {e}"
+    return "SUCCESS"
+
+
+ASYNC_HANDLERS = {
+    "http": _run_http_job_async,
+    "monochrome": _run_monochrome_job_async,
+}
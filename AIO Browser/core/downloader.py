@@ -2,9 +2,18 @@
 import requests
 import os
 import time
+import threading
 import re
+import json
 from urllib.parse import urlparse, parse_qs, unquote
 
+from core import checksum
+from core.extract import StreamingZipExtractor, extract_dir_for, is_zip
+from core.mirrors import MirrorPool, race
+from core.progress import DownloadState, ProgressEvent, ProgressTracker, format_size
+from core.rate_limit import global_limiter
+from core.stream_io import BackgroundWriter, ChunkReader, body_length, preallocate
+
 
 def _extract_filename_from_content_disposition(content_disposition):
     if not content_disposition:
@@ -85,187 +94,746 @@ def _sanitize_filename(filename):
 
     return filename
 
+
+
+def _resolve_target_path(save_path, r, url):
+    """Appends a filename taken from the response when save_path is a directory."""
+    if not os.path.isdir(save_path):
+        return save_path
+
+    content_type = r.headers.get('Content-Type', '').lower()
+    final_url = str(r.url)  # aiohttp responses carry a yarl.URL
+    filename = (
+        _extract_filename_from_content_disposition(
+            r.headers.get("Content-Disposition")
+        )
+        or _extract_filename_from_url(final_url)
+        or _extract_filename_from_url(url)
+        or "downloaded_file"
+    )
+    filename = _sanitize_filename(filename)
+
+    # If still no extension, try to infer from URL or content-type
+    _, ext = os.path.splitext(filename)
+    if not ext:
+        if final_url.lower().endswith(".rar") or url.lower().endswith(".rar"):
+            filename += ".rar"
+        elif final_url.lower().endswith(".7z") or url.lower().endswith(".7z"):
+            filename += ".7z"
+        elif final_url.lower().endswith(".zip") or url.lower().endswith(".zip"):
+            filename += ".zip"
+        elif "zip" in content_type:
+            filename += ".zip"
+        elif "rar" in content_type:
+            filename += ".rar"
+        elif "7z" in content_type:
+            filename += ".7z"
+
+    return os.path.join(save_path, filename)
+
+
+# =========================================================================
+# RESUMABLE .PART FILES
+# =========================================================================
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".part.json"
+CORRUPT_SUFFIX = ".corrupt"  # a complete download whose checksum didn't match
+STATE_SAVE_INTERVAL = 5.0  # seconds between sidecar checkpoints
+
+
+class _Segment:
+    """A byte range [start, end) of the target file fetched by one connection."""
+
+    def __init__(self, start, end, done=0):
+        self.start = start
+        self.end = end
+        self.done = done
+        self.error = None
+
+    @property
+    def position(self):
+        return self.start + self.done
+
+    @property
+    def remaining(self):
+        return self.end - self.position
+
+
+class _PartState:
+    """
+    Sidecar (<name>.part.json) describing what a <name>.part file already holds,
+    so an interrupted download can continue with Range requests.
+    """
+
+    def __init__(self, path, url, total, etag, last_modified, segments):
+        self.path = path
+        self.url = url
+        self.total = total
+        self.etag = etag
+        self.last_modified = last_modified
+        self.segments = segments
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            segments = [_Segment(start, end, done) for start, end, done in data["ranges"]]
+            return cls(
+                path,
+                data.get("url"),
+                int(data["total"]),
+                data.get("etag"),
+                data.get("last_modified"),
+                segments,
+            )
+        except Exception:
+            return None
+
+    def matches(self, total, etag, last_modified):
+        """True if the remote file still looks like the one we started on."""
+        if total != self.total:
+            return False
+        if etag and self.etag and etag != self.etag:
+            return False
+        if last_modified and self.last_modified and last_modified != self.last_modified:
+            return False
+        return True
+
+    @property
+    def downloaded(self):
+        return sum(s.done for s in self.segments)
+
+    @property
+    def contiguous(self):
+        """End of the fully written prefix of the file."""
+        for segment in sorted(self.segments, key=lambda s: s.start):
+            if segment.remaining > 0:
+                return segment.position
+        return self.total
+
+    @property
+    def if_range(self):
+        """Validator for If-Range; weak ETags aren't allowed there."""
+        if self.etag and not self.etag.startswith("W/"):
+            return self.etag
+        return self.last_modified
+
+    def save(self, completed=None):
+        """completed: per-segment byte counts to record (defaults to current)."""
+        if completed is None:
+            completed = [s.done for s in self.segments]
+        data = {
+            "url": self.url,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "total": self.total,
+            "ranges": [[s.start, s.end, done] for s, done in zip(self.segments, completed)],
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def discard(self):
+        try: os.remove(self.path)
+        except OSError: pass
+
+
+def _checkpoint(part_path, state):
+    """Flush .part data to disk before the sidecar claims it."""
+    completed = [s.done for s in state.segments]
+    try:
+        with open(part_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        state.save(completed)
+    except OSError as e:
+        print(f"[DEBUG] Could not save download state: {e}")
+
+
+# =========================================================================
+# SEGMENTED (MULTI-CONNECTION) DOWNLOADS
+# =========================================================================
+DEFAULT_CONNECTIONS = 4
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024  # Don't open a connection for less than 8 MB
+SEGMENT_RETRIES = 3
+SEGMENT_TIMEOUT = (15, 60)  # (connect, read) seconds
+# Chunk size when the file is fetched front to back (streaming extraction)
+SEQUENTIAL_SEGMENT_SIZE = 16 * 1024 * 1024
+
+
+def _plan_segments(total_length, connections, chunk_size=None):
+    """
+    One segment per connection, or with chunk_size many in-order chunks that
+    the connections take one after another, so the written prefix of the file
+    trails the download by only a few chunks.
+    """
+    if chunk_size:
+        return [
+            _Segment(start, min(start + chunk_size, total_length))
+            for start in range(0, total_length, chunk_size)
+        ]
+    count = max(1, min(connections, total_length // MIN_SEGMENT_SIZE))
+    size = total_length // count
+    segments = []
+    for i in range(count):
+        start = i * size
+        end = total_length if i == count - 1 else start + size
+        segments.append(_Segment(start, end))
+    return segments
+
+
+def _supports_ranges(r, total_length):
+    if total_length <= 0:
+        return False
+    if r.headers.get('Accept-Ranges', '').lower() != 'bytes':
+        return False
+    # Byte ranges refer to the encoded body; only split identity responses.
+    return r.headers.get('Content-Encoding', 'identity').lower() == 'identity'
+
+
+def _fetch_segment(session, url, segment, writer, controller, abort, if_range=None, response=None, mirrors=None,
+                   hasher=None):
+    """
+    Streams one segment into the writer's file at its offset, retrying from
+    the received position if the connection drops.
+    response: an already-open response positioned at segment.start
+    mirrors: MirrorPool; every new request goes to its current mirror
+    hasher: StreamingHash fed with the bytes as they arrive, while they
+        continue where it stopped
+    Returns True once every byte of the segment was handed to the writer.
+    """
+    def on_written(length):
+        # Runs on the writer thread, so segment.done only counts bytes on disk
+        segment.done += length
+
+    attempts = 0
+    received = segment.position
+    while received < segment.end:
+        if not controller.wait_while_paused() or abort.is_set():
+            return
+        if mirrors:
+            url, if_range = mirrors.current.url, mirrors.current.validator
+        try:
+            if response is None:
+                headers = {"Range": f"bytes={received}-{segment.end - 1}"}
+                if if_range:
+                    headers["If-Range"] = if_range
+                response = session.get(url, stream=True, headers=headers, timeout=SEGMENT_TIMEOUT)
+                if response.status_code != 206:
+                    raise IOError(f"Server ignored range request ({response.status_code})")
+
+            controller.attach(response)
+            try:
+                with response:
+                    reader = ChunkReader(response)
+                    while received < segment.end:
+                        # Blocks (without polling) while paused
+                        if not controller.wait_while_paused() or abort.is_set():
+                            return
+                        if mirrors and url != mirrors.current.url:
+                            break  # switched while this request was connecting
+
+                        buffer = writer.acquire()
+                        try:
+                            n = reader.fill(memoryview(buffer)[:segment.end - received])
+                        except Exception:
+                            writer.release(buffer)
+                            raise
+                        if not n:
+                            writer.release(buffer)
+                            break
+                        if hasher and hasher.position == received:
+                            hasher.update(memoryview(buffer)[:n])
+                        writer.submit(buffer, n, received, on_written)
+                        received += n
+                        if not controller.throttle(n):
+                            return
+            finally:
+                controller.detach(response)
+            response = None
+
+            if received < segment.end:
+                raise IOError("Connection closed before segment completed")
+        except Exception as e:
+            response = None
+            if controller.cancelled:
+                return
+            if mirrors and url != mirrors.current.url:
+                # Dropped on purpose by a mirror switch; reconnect right away
+                continue
+            attempts += 1
+            if writer.error is not None or attempts > SEGMENT_RETRIES:
+                segment.error = writer.error or e
+                abort.set()
+                return
+            print(f"[DEBUG] Segment {segment.start}-{segment.end} retry {attempts}: {e}")
+            if mirrors and mirrors.switch(failed_url=url):
+                continue
+            if controller.wait(attempts):
+                return
+    return True
+
+
+def _download_ranges(session, r, part_path, state, progress_callback, controller, hasher=None, mirrors=None,
+                     connections=DEFAULT_CONNECTIONS, extractor=None):
+    """
+    Fetches every unfinished segment of state into part_path over up to
+    connections parallel requests.
+    mirrors: MirrorPool to move to another host when throughput collapses.
+    extractor: core.extract.StreamingZipExtractor following the written prefix.
+    """
+    pending = sorted((s for s in state.segments if s.remaining > 0), key=lambda s: s.start)
+    if hasher:
+        # Bytes arriving in file order are hashed as they come, so the file
+        # isn't read back once it is complete
+        connections = 1
+    connections = max(1, min(connections, len(pending)))
+    if connections > 1:
+        progress_callback(ProgressEvent(
+            DownloadState.DOWNLOADING, f"Downloading with {connections} connections...",
+            done=state.downloaded, total=state.total,
+        ))
+
+    # Unbuffered so every byte counted in segment.done has reached the OS
+    with open(part_path, 'r+b', buffering=0) as f:
+        writer = BackgroundWriter(f)
+        try:
+            _run_segments(
+                session, r, part_path, state, pending, writer, progress_callback, controller,
+                hasher, mirrors, connections, extractor,
+            )
+        finally:
+            # Flush what the segments already received before the final checkpoint
+            try:
+                writer.join()
+            finally:
+                _checkpoint(part_path, state)
+
+    for segment in state.segments:
+        if segment.error is not None:
+            raise segment.error
+
+    if mirrors and not controller.cancelled:
+        mirrors.finish(state.downloaded)
+    if hasher and not controller.cancelled:
+        # Normally nothing is left by now
+        hasher.catch_up(part_path, state.total)
+
+
+def _run_segments(session, r, part_path, state, pending, writer, progress_callback, controller, hasher,
+                  mirrors=None, connections=DEFAULT_CONNECTIONS, extractor=None):
+    """
+    Runs connections workers that take pending segments in file order and
+    reports progress until they finish.
+    """
+    abort = threading.Event()
+    queue_lock = threading.Lock()
+    queue = iter(pending)
+    # The initial response already streams from byte 0
+    initial = [r] if pending and pending[0].position == 0 else []
+
+    def work():
+        while not abort.is_set() and not controller.cancelled:
+            with queue_lock:
+                segment = next(queue, None)
+                response = initial.pop() if initial and segment is pending[0] else None
+            if segment is None:
+                return
+            if hasher:
+                # Bytes an earlier attempt left on disk before this segment
+                hasher.catch_up(part_path, segment.position)
+            if not _fetch_segment(
+                session, r.url, segment, writer, controller, abort,
+                if_range=state.if_range, response=response, mirrors=mirrors, hasher=hasher,
+            ):
+                return  # Stopped, cancelled or failed
+
+    workers = []
+    for _ in range(connections):
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        workers.append(worker)
+
+    reporter = ProgressTracker(progress_callback, state.total)
+    reporter.reset(state.downloaded)
+    last_checkpoint = time.time()
+    while any(w.is_alive() for w in workers):
+        # Wakes early if a segment gives up so the others stop promptly
+        if abort.wait(ProgressTracker.INTERVAL):
+            for w in workers:
+                w.join()
+            break
+
+        if controller.paused:
+            _checkpoint(part_path, state)
+            reporter.paused(state.downloaded)
+            controller.wait_while_paused()
+            # Reset timing after pause
+            reporter.reset(state.downloaded)
+            if mirrors:
+                mirrors.reset(state.downloaded)
+            last_checkpoint = time.time()
+            continue
+
+        # A speed limit slows every mirror alike, so don't judge them under one
+        limited = controller.limiter.rate or global_limiter.rate
+        if mirrors and not limited and mirrors.should_switch(state.downloaded):
+            mirror = mirrors.switch()
+            if mirror:
+                progress_callback(ProgressEvent(
+                    DownloadState.DOWNLOADING, f"Mirror too slow, switching to {mirror.host}...",
+                    done=state.downloaded, total=state.total,
+                ))
+                # Workers reconnect to the new mirror from where they are
+                controller.interrupt()
+                reporter.reset(state.downloaded)
+
+        if time.time() - last_checkpoint >= STATE_SAVE_INTERVAL:
+            _checkpoint(part_path, state)
+            last_checkpoint = time.time()
+
+        if extractor:
+            extractor.advance(state.contiguous)
+        reporter.update(state.downloaded)
+
+    if controller.cancelled:
+        for w in workers:
+            w.join()
+
+
+def _download_single(r, part_path, total_length, progress_callback, controller, hasher=None, extractor=None):
+    reporter = ProgressTracker(progress_callback, total_length)
+    downloaded = 0
+    written = 0
+
+    def on_written(length):
+        # Runs on the writer thread once the bytes are in the file
+        nonlocal written
+        written += length
+        extractor.advance(written)
+
+    controller.attach(r)
+    try:
+        with open(part_path, 'wb', buffering=0) as f:
+            preallocate(f, total_length)
+            # Socket reads stay on this thread, disk writes go to the writer
+            writer = BackgroundWriter(f)
+            reader = ChunkReader(r)
+            try:
+                while True:
+                    if controller.paused:
+                        reporter.paused(downloaded)
+                        if not controller.wait_while_paused(): break
+                        # Reset timing after pause
+                        reporter.reset(downloaded)
+                    if controller.cancelled: break
+
+                    buffer = writer.acquire()
+                    submitted = False
+                    try:
+                        n = reader.fill(memoryview(buffer))
+                        if not n:
+                            break
+                        if hasher:
+                            hasher.update(memoryview(buffer)[:n])
+                        writer.submit(buffer, n, on_written=on_written if extractor else None)
+                        submitted = True
+                    finally:
+                        # The writer hands submitted buffers back itself
+                        if not submitted:
+                            writer.release(buffer)
+                    downloaded += n
+                    reporter.update(downloaded)
+                    if not controller.throttle(n): break
+            finally:
+                writer.join()
+
+        if total_length and downloaded != total_length and not controller.cancelled:
+            # The connection closed early. Without ranges there is no resuming:
+            # the next attempt starts the .part over
+            raise IOError(f"Incomplete download ({downloaded} of {total_length} bytes)")
+    except Exception:
+        # cancel() aborts the socket mid-read; that's a stop, not an error
+        if not controller.cancelled:
+            raise
+    finally:
+        controller.detach(r)
+
+
+def _prepare_state(r, url, part_path, total_length, connections, chunk_size=None):
+    """
+    Loads a matching sidecar to resume from, or starts a fresh .part file
+    split as _plan_segments(total_length, connections, chunk_size).
+    """
+    state_path = part_path[:-len(PART_SUFFIX)] + STATE_SUFFIX
+    etag = r.headers.get('ETag')
+    last_modified = r.headers.get('Last-Modified')
+
+    state = _PartState.load(state_path)
+    if state and os.path.exists(part_path) and state.matches(total_length, etag, last_modified):
+        state.url = url
+        return state, True
+
+    if state:
+        state.discard()
+    state = _PartState(
+        state_path, url, total_length, etag, last_modified,
+        _plan_segments(total_length, connections, chunk_size),
+    )
+    # Size the file up front so every segment can write at its own offset
+    with open(part_path, 'wb') as f:
+        preallocate(f, total_length)
+    state.save()
+    return state, False
+
+
+# =========================================================================
+# CHECKSUMS
+# =========================================================================
+def _resolve_checksum(session, r, final_path, algorithm=None, expected_hash=None, checksum_url=None):
+    """
+    Works out which digest to compute and what it should equal.
+    Priority for the expected value: caller, checksum sidecar, response headers.
+    Returns (algorithm, expected_hex); algorithm is None when nothing is hashed.
+    """
+    algorithm = algorithm.lower() if algorithm else None
+    if algorithm not in checksum.ALGORITHMS:
+        algorithm = None
+
+    if expected_hash:
+        parsed_algorithm, expected = checksum.parse_expected(expected_hash, algorithm)
+        if parsed_algorithm:
+            return parsed_algorithm, expected
+
+    if checksum_url:
+        try:
+            resp = session.get(checksum_url, timeout=15)
+            resp.raise_for_status()
+            digest = checksum.expected_from_sidecar(resp.text, os.path.basename(final_path))
+            parsed_algorithm, expected = checksum.parse_expected(digest, algorithm)
+            if parsed_algorithm:
+                return parsed_algorithm, expected
+        except Exception as e:
+            print(f"[DEBUG] Could not read checksum file {checksum_url}: {e}")
+
+    header_algorithm, expected = checksum.expected_from_headers(r.headers)
+    if header_algorithm and algorithm in (None, header_algorithm):
+        return header_algorithm, expected
+
+    return algorithm, None
+
+
 # =========================================================================
 # DOWNLOAD CORE ENGINE
 # =========================================================================
-def download_file(url, save_path, progress_callback, control_flags, session=None):
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+# Seconds a response opened ahead of the download (by the link resolver) is
+# worth continuing on; servers drop connections left idle much longer
+HANDOFF_MAX_AGE = 45
+
+
+def download_file(url, save_path, progress_callback, controller, session=None, connections=DEFAULT_CONNECTIONS,
+                  checksum_algorithm=None, expected_hash=None, checksum_url=None, mirrors=None, extract=False,
+                  on_saved=None, response=None, post_process=None):
     """
     Downloads file with progress updates.
-    progress_callback(status_text, progress_float)
-    control_flags is a dict {'paused': bool, 'stopped': bool}
+    progress_callback(event): receives core.progress.ProgressEvent records
+    controller: core.download_control.DownloadController (pause/resume/cancel)
     session: optional requests.Session object to use for the download
     save_path: can be a full file path or a directory check.
+    connections: max parallel ranged connections; falls back to a single
+        stream when the server doesn't support byte ranges, and to a single
+        connection when the data is hashed.
+
+    Data is written to <name>.part and renamed on completion. When the server
+    supports ranges a <name>.part.json sidecar tracks completed ranges, so a
+    stopped or crashed download resumes on the next attempt.
+
+    checksum_algorithm: "sha256", "md5" or "crc32" to hash the data as it is
+        written. expected_hash ("sha256:<hex>" or bare hex) / checksum_url (a
+        .sha256/.md5 style file) / Digest or Content-MD5 headers are checked
+        against it; a server provided digest is verified even without an
+        algorithm. Returns "SUCCESS:<algorithm>:<hex>" when a digest was
+        computed, plain "SUCCESS" otherwise.
+
+    mirrors: other URLs for the same file. All candidates are probed and the
+        fastest is used; ranged downloads move to the next one mid-way if
+        throughput collapses.
+
+    extract: unpack a .zip into a folder next to it (core.extract) while it
+        downloads. Ranged downloads then fetch the file front to back in
+        chunks, so entries can be extracted as soon as they have arrived.
+
+    on_saved(final_path): called after a successful download with the path
+        the file was saved as.
+
+    response: an open streamed GET of url (see AnkerClient.open_all_links)
+        to continue on instead of requesting url again. Closed unused when
+        another mirror is picked.
+
+    post_process(final_path): True when the caller goes on processing the
+        file (e.g. unpacks it). The download then ends on a PROCESSING
+        event and the caller reports the final state.
     """
+    state = None
+    extractor = None
     try:
-        progress_callback("Starting connection...", 0.0)
-        
-        if session:
-            request_func = session.get
-            kwargs = {
-                "stream": True, 
-                "allow_redirects": True
-            }
-        else:
-            request_func = requests.get
-            kwargs = {
-                "stream": True, 
-                "headers": {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}, 
-                "allow_redirects": True
-            }
-        
-        with request_func(url, **kwargs) as r:
+        progress_callback(ProgressEvent(DownloadState.STARTING, "Starting connection..."))
+
+        if not session:
+            session = requests.Session()
+            session.headers.update({"User-Agent": USER_AGENT})
+
+        pool = _pick_mirror(session, url, mirrors, progress_callback)
+        if pool:
+            url = pool.current.url
+
+        if response is not None and response.url != url:
+            response.close()  # A mirror won the race
+            response = None
+        if response is None:
+            response = session.get(url, stream=True, allow_redirects=True)
+        with response as r:
             content_type = r.headers.get('Content-Type', '').lower()
             if 'text/html' in content_type:
-                progress_callback("Error: Resolved link is a webpage, not a file.", 0)
+                progress_callback(ProgressEvent(DownloadState.ERROR, "Error: Resolved link is a webpage, not a file."))
                 return "IS_HTML"
 
             r.raise_for_status()
-            
+
             # --- Determine Final Save Path ---
-            final_path = save_path
-            
-            # Check if save_path is likely a directory (or existing dir).
             # The caller (GUI) might pass a specific path or a dir.
             # If user selected a directory, we need to append filename.
-            
-            if os.path.isdir(save_path):
-                # Extract filename from headers
-                filename = (
-                    _extract_filename_from_content_disposition(
-                        r.headers.get("Content-Disposition")
-                    )
-                    or _extract_filename_from_url(r.url)
-                    or _extract_filename_from_url(url)
-                    or "downloaded_file"
+            final_path = _resolve_target_path(save_path, r, url)
+            if final_path != save_path:
+                progress_callback(ProgressEvent(DownloadState.STARTING, f"Saving as: {os.path.basename(final_path)}"))
+            part_path = final_path + PART_SUFFIX
+
+            total_length = body_length(r)
+
+            algorithm, expected = _resolve_checksum(
+                session, r, final_path, checksum_algorithm, expected_hash, checksum_url
+            )
+            hasher = checksum.StreamingHash(algorithm) if algorithm else None
+            extractor = start_extractor(extract, part_path, final_path)
+
+            if _supports_ranges(r, total_length):
+                chunk_size = SEQUENTIAL_SEGMENT_SIZE if extractor else None
+                state, resumed = _prepare_state(r, url, part_path, total_length, connections, chunk_size)
+                if resumed:
+                    progress_callback(ProgressEvent(
+                        DownloadState.DOWNLOADING,
+                        f"Resuming at {format_size(state.downloaded)} / {format_size(total_length)}",
+                        done=state.downloaded, total=total_length,
+                    ))
+                _download_ranges(
+                    session, r, part_path, state, progress_callback, controller, hasher, pool,
+                    connections, extractor,
                 )
-                filename = _sanitize_filename(filename)
-                
-                # If still no extension, try to infer from URL or content-type
-                _, ext = os.path.splitext(filename)
-                if not ext:
-                    if r.url.lower().endswith(".rar") or url.lower().endswith(".rar"):
-                        filename += ".rar"
-                    elif r.url.lower().endswith(".7z") or url.lower().endswith(".7z"):
-                        filename += ".7z"
-                    elif r.url.lower().endswith(".zip") or url.lower().endswith(".zip"):
-                        filename += ".zip"
-                    elif "zip" in content_type:
-                        filename += ".zip"
-                    elif "rar" in content_type:
-                        filename += ".rar"
-                    elif "7z" in content_type:
-                        filename += ".7z"
-
-                final_path = os.path.join(save_path, filename)
-                progress_callback(f"Saving as: {filename}", 0.0)
-
-            total_length = int(r.headers.get('content-length', 0))
-            downloaded = 0
-            start_time = time.time()
-            last_update_time = start_time
-            last_downloaded = 0
-            speed_samples = []  # For moving average
-            
-            def format_size(bytes_val):
-                """Convert bytes to human readable format"""
-                for unit in ['B', 'KB', 'MB', 'GB']:
-                    if bytes_val < 1024.0:
-                        return f"{bytes_val:.2f} {unit}"
-                    bytes_val /= 1024.0
-                return f"{bytes_val:.2f} TB"
-            
-            def format_time(seconds):
-                """Convert seconds to human readable format"""
-                if seconds < 60:
-                    return f"{int(seconds)}s"
-                elif seconds < 3600:
-                    mins = int(seconds / 60)
-                    secs = int(seconds % 60)
-                    return f"{mins}m {secs}s"
-                else:
-                    hours = int(seconds / 3600)
-                    mins = int((seconds % 3600) / 60)
-                    return f"{hours}h {mins}m"
-            
-            with open(final_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=65536): # 64KB chunks
-                    if control_flags['stopped']: break
-                    
-                    while control_flags['paused']:
-                        if control_flags['stopped']: break
-                        time.sleep(0.5)
-                        # Reset timing after pause
-                        start_time = time.time()
-                        last_update_time = start_time
-                        last_downloaded = downloaded
-                        speed_samples.clear()
-
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        current_time = time.time()
-                        
-                        # Update progress every 0.5 seconds to avoid UI spam
-                        if current_time - last_update_time >= 0.5:
-                            elapsed = current_time - start_time
-                            
-                            # Calculate instantaneous speed
-                            time_delta = current_time - last_update_time
-                            bytes_delta = downloaded - last_downloaded
-                            instant_speed = bytes_delta / time_delta if time_delta > 0 else 0
-                            
-                            # Moving average for smoother display (last 5 samples)
-                            speed_samples.append(instant_speed)
-                            if len(speed_samples) > 5:
-                                speed_samples.pop(0)
-                            avg_speed = sum(speed_samples) / len(speed_samples)
-                            
-                            if total_length > 0:
-                                percent = downloaded / total_length
-                                remaining = total_length - downloaded
-                                
-                                # Calculate ETA
-                                if avg_speed > 0:
-                                    eta_seconds = remaining / avg_speed
-                                    eta_str = format_time(eta_seconds)
-                                else:
-                                    eta_str = "calculating..."
-                                
-                                # Format progress message
-                                progress_msg = (
-                                    f"{format_size(downloaded)} / {format_size(total_length)} "
-                                    f"({int(percent*100)}%) • "
-                                    f"{format_size(avg_speed)}/s • "
-                                    f"ETA: {eta_str}"
-                                )
-                                progress_callback(progress_msg, percent)
-                            else:
-                                # If no content-length, show downloaded and speed
-                                speed_str = format_size(avg_speed) if avg_speed > 0 else "0 B"
-                                progress_callback(
-                                    f"Downloaded {format_size(downloaded)} • {speed_str}/s", 
-                                    0.5
-                                )
-                            
-                            last_update_time = current_time
-                            last_downloaded = downloaded
-        
-        if control_flags['stopped']:
-            try: os.remove(final_path)
-            except: pass
-            progress_callback("Download Stopped & File Deleted.", 0)
-            return "STOPPED"
-        else:
-            progress_callback("Download Complete!", 1.0)
-            return "SUCCESS"
+            else:
+                _download_single(r, part_path, total_length, progress_callback, controller, hasher, extractor)
+
+        if controller.cancelled:
+            return _handle_stopped(part_path, state, progress_callback)
+        result = _finish_download(
+            part_path, final_path, state, hasher, expected, progress_callback, extractor, post_process,
+        )
+        if on_saved and result.startswith("SUCCESS"):
+            on_saved(final_path)
+        return result
 
     except Exception as e:
-        if control_flags['stopped']:
-            try: 
-                 if 'final_path' in locals(): os.remove(final_path)
-            except: pass
-            progress_callback("Download Stopped.", 0)
-            return "STOPPED"
-        else:
-            progress_callback(f"Error: {e}", 0)
-            return f"ERROR: {e}"
+        if controller.cancelled and 'part_path' in locals():
+            return _handle_stopped(part_path, state, progress_callback)
+        progress_callback(ProgressEvent(DownloadState.ERROR, f"Error: {e}"))
+        return f"ERROR: {e}"
+    finally:
+        if extractor:
+            # No-op after a completed extraction; otherwise lets go of the .part
+            extractor.finish(complete=False)
+
+
+def _pick_mirror(session, url, mirrors, progress_callback):
+    """Races url and its mirrors; returns a MirrorPool, or None to just use url."""
+    candidates = list(dict.fromkeys([url, *(mirrors or [])]))
+    if len(candidates) < 2:
+        return None
+    progress_callback(ProgressEvent(DownloadState.STARTING, f"Testing {len(candidates)} mirrors..."))
+    ranked = race(session, candidates)
+    if not ranked:
+        return None  # Let the normal request report what is wrong with url
+    print(f"[DEBUG] Mirror ranking: {[(m.host, int(m.speed)) for m in ranked]}")
+    return MirrorPool(ranked)
+
+
+def start_extractor(extract, part_path, final_path):
+    """A StreamingZipExtractor for part_path when extraction was asked for and it is a .zip."""
+    if not extract or not is_zip(final_path):
+        return None
+    dest_dir = extract_dir_for(final_path)
+    print(f"[DEBUG] Extracting {os.path.basename(final_path)} to {dest_dir} while downloading")
+    return StreamingZipExtractor(part_path, dest_dir)
+
+
+def _finish_download(part_path, final_path, state, hasher, expected, progress_callback, extractor=None,
+                     post_process=None):
+    """Moves the completed .part into place and reports the (verified) result."""
+    verified = not hasher or hasher.verify(expected)
+    extract_error = None
+    if extractor:
+        # Before the rename: Windows can't move a file the extractor has open
+        progress_callback(ProgressEvent(DownloadState.PROCESSING, "Extracting archive...", progress=1.0))
+        try:
+            extractor.finish(complete=verified)
+        except Exception as e:
+            extract_error = e
+
+    # A file failing its checksum never gets the final name; it is kept for inspection
+    saved_path = final_path if verified else final_path + CORRUPT_SUFFIX
+    os.replace(part_path, saved_path)
+    if state:
+        state.discard()
+
+    if not verified:
+        algorithm = hasher.algorithm
+        digest = hasher.hexdigest()
+        print(f"[DEBUG] Checksum mismatch, kept as {os.path.basename(saved_path)}")
+        progress_callback(ProgressEvent(
+            DownloadState.ERROR, f"Error: {algorithm} mismatch (expected {expected}, got {digest})", progress=1.0
+        ))
+        return f"ERROR: Checksum mismatch ({algorithm} expected {expected}, got {digest})"
+    if extract_error is not None:
+        progress_callback(ProgressEvent(
+            DownloadState.ERROR, f"Error: Could not extract archive: {extract_error}", progress=1.0
+        ))
+        return f"ERROR: Extraction failed ({extract_error})"
+
+    message = "Download Complete!"
+    result = "SUCCESS"
+    if extractor:
+        message += f" Extracted to {os.path.basename(extractor.dest_dir)}"
+    if hasher:
+        algorithm = hasher.algorithm
+        digest = hasher.hexdigest()
+        label = "verified" if expected else digest
+        message += f" {algorithm}: {label}"
+        result = f"SUCCESS:{algorithm}:{digest}"
+
+    if post_process and post_process(final_path):
+        # Not finished yet; the caller reports the final state once it is done
+        progress_callback(ProgressEvent(DownloadState.PROCESSING, f"{message} Preparing to extract...", progress=1.0))
+    else:
+        progress_callback(ProgressEvent(DownloadState.FINISHED, message))
+    return result
+
+
+def _handle_stopped(part_path, state, progress_callback):
+    if state:
+        # Keep the .part file and sidecar so the next attempt resumes
+        progress_callback(ProgressEvent(DownloadState.STOPPED, "Download Stopped. Progress saved for resume."))
+    else:
+        try: os.remove(part_path)
+        except OSError: pass
+        progress_callback(ProgressEvent(DownloadState.STOPPED, "Download Stopped & File Deleted."))
+    return "STOPPED"
@@ -402,10 +402,10 @@ def resolve_direct_download_url(option: EmulatorOption, timeout_s: float = 10.0)
         return None
 
     try:
-        import requests
+        from core.http_session import shared_session
 
         api_url = f"https://api.github.com/repos/{option.github_repo}/releases/latest"
-        r = requests.get(
+        r = shared_session().get(
             api_url,
             headers={
                 "Accept": "application/vnd.github+json",
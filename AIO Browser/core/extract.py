@@ -0,0 +1,581 @@
+# core/extract.py
+# Archive extraction for finished downloads. ZIP files can be unpacked while
+# they are still downloading: a consumer thread follows the written prefix of
+# the .part file and extracts each entry as soon as its data has arrived.
+# Everything else (.7z, .rar, zips downloaded without streaming) goes to
+# ExtractionPool after the download, which unpacks in worker processes.
+import concurrent.futures
+import multiprocessing
+import os
+import shutil
+import struct
+import threading
+import time
+import zipfile
+import zlib
+
+try:
+    import py7zr
+    from py7zr.callbacks import ExtractCallback
+except ImportError:
+    py7zr = None
+
+try:
+    import rarfile
+except ImportError:
+    rarfile = None
+
+from core.progress import DownloadState, ProgressEvent, format_size
+
+READ_SIZE = 1024 * 1024
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_LOCAL_SIG = b"PK\x03\x04"
+_CENTRAL_SIG = b"PK\x01\x02"
+_END_SIG = b"PK\x05\x06"
+_DESCRIPTOR_SIG = b"PK\x07\x08"
+_ZIP64_EXTRA = 0x0001
+
+STORED = 0
+DEFLATED = 8
+
+FLAG_ENCRYPTED = 0x1
+FLAG_DESCRIPTOR = 0x8  # sizes/CRC follow the data instead of the header
+FLAG_UTF8 = 0x800
+
+
+def is_zip(path):
+    return path.lower().endswith(".zip")
+
+
+def is_archive(path):
+    """True for archive types ExtractionPool can open with what is installed."""
+    lower = path.lower()
+    if lower.endswith(".7z"):
+        return py7zr is not None
+    if lower.endswith(".rar"):
+        return rarfile is not None
+    return lower.endswith(".zip")
+
+
+def extract_dir_for(archive_path):
+    """Folder an archive is unpacked into: next to it, named after it."""
+    return os.path.splitext(archive_path)[0]
+
+
+def _safe_target(dest_dir, name):
+    """
+    Maps an archive member name to a path inside dest_dir, dropping absolute
+    prefixes, drive letters and '..' like zipfile does. None for empty names.
+    """
+    name = name.replace("\\", "/")
+    parts = []
+    for part in name.split("/"):
+        part = os.path.splitdrive(part)[1]
+        if part in ("", ".", ".."):
+            continue
+        parts.append(part)
+    if not parts:
+        return None
+    return os.path.join(dest_dir, *parts)
+
+
+class _Unsupported(Exception):
+    """The archive needs something streaming can't do; extract after download."""
+
+
+class _Incomplete(Exception):
+    """The download ended before the bytes needed arrived."""
+
+
+# =========================================================================
+# STREAMING ZIP EXTRACTION
+# =========================================================================
+class _SpoolReader:
+    """Sequential reads from a file that is still being written."""
+
+    def __init__(self, f, extractor):
+        self.f = f
+        self.extractor = extractor
+        self.position = 0
+
+    def read(self, size):
+        """Exactly size bytes, waiting for the downloader to write them."""
+        data = b""
+        while len(data) < size:
+            data += self.read_some(size - len(data))
+        return data
+
+    def read_some(self, size):
+        """Between 1 and size bytes of what has been written so far."""
+        available = self.extractor._wait_for(self.position + 1)
+        data = self.f.read(min(size, available - self.position))
+        if not data:
+            raise _Incomplete()
+        self.position += len(data)
+        return data
+
+    def unread(self, data):
+        self.f.seek(-len(data), os.SEEK_CUR)
+        self.position -= len(data)
+
+
+class StreamingZipExtractor:
+    """
+    Extracts a ZIP from a .part file while it downloads. The downloader calls
+    advance(n) whenever bytes [0, n) are on disk and finish() once it is done.
+    Entries using features that can't be streamed (encryption, unusual
+    compression, stored entries with trailing sizes) make it stop; finish()
+    then extracts the remainder from the complete file with zipfile.
+    """
+
+    def __init__(self, part_path, dest_dir):
+        self.part_path = part_path
+        self.dest_dir = dest_dir
+        self.extracted = set()  # member names written and CRC checked
+        self.error = None
+        self._available = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="zip-extract", daemon=True)
+        self._thread.start()
+
+    # ---------------------------------------------------------------------
+    # Producer side
+    # ---------------------------------------------------------------------
+    def advance(self, available):
+        with self._cond:
+            if available > self._available:
+                self._available = available
+                self._cond.notify_all()
+
+    def finish(self, complete=True):
+        """
+        Waits for the consumer to catch up with everything written. If the
+        download completed, extracts whatever streaming couldn't and returns
+        the number of entries; otherwise stops and returns None.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if not complete:
+            return None
+        if self.error is not None:
+            print(f"[DEBUG] Streaming extraction stopped ({self.error}); extracting the rest now")
+        return self._extract_remaining()
+
+    # ---------------------------------------------------------------------
+    # Consumer side
+    # ---------------------------------------------------------------------
+    def _wait_for(self, position):
+        """Blocks until position bytes are available or the download ended."""
+        with self._cond:
+            while self._available < position and not self._closed:
+                self._cond.wait()
+            return self._available
+
+    def _run(self):
+        # The .part may not exist yet; it does once the first bytes are written
+        if self._wait_for(1) < 1:
+            return
+        try:
+            with open(self.part_path, "rb") as f:
+                reader = _SpoolReader(f, self)
+                while True:
+                    signature = reader.read(4)
+                    if signature in (_CENTRAL_SIG, _END_SIG):
+                        return  # All entries seen
+                    if signature != _LOCAL_SIG:
+                        raise _Unsupported(f"unexpected record {signature!r} at {reader.position - 4}")
+                    self._extract_entry(reader, signature)
+        except _Incomplete:
+            pass  # Stopped or cancelled; finish() decides what happens next
+        except Exception as e:
+            self.error = e
+
+    def _extract_entry(self, reader, signature):
+        (_, _, flags, method, _, _, crc, compressed, size, name_len, extra_len) = _LOCAL_HEADER.unpack(
+            signature + reader.read(_LOCAL_HEADER.size - 4)
+        )
+        raw_name = reader.read(name_len)
+        extra = reader.read(extra_len)
+        name = raw_name.decode("utf-8" if flags & FLAG_UTF8 else "cp437")
+
+        # A Zip64 extra field also means 8-byte sizes in the data descriptor
+        zip64, size, compressed = self._zip64_sizes(extra, size, compressed)
+        if flags & FLAG_ENCRYPTED:
+            raise _Unsupported(f"{name} is encrypted")
+        if method not in (STORED, DEFLATED):
+            raise _Unsupported(f"{name} uses compression method {method}")
+        descriptor = bool(flags & FLAG_DESCRIPTOR)
+        is_dir = name.endswith("/")
+        # Directories have no data, so their missing sizes don't matter
+        if descriptor and method == STORED and not is_dir:
+            raise _Unsupported(f"{name} is stored without sizes")
+
+        target = _safe_target(self.dest_dir, name)
+        if target is None or is_dir:
+            if target:
+                os.makedirs(target, exist_ok=True)
+            self._skip(reader, method, compressed, descriptor, zip64)
+            return
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as out:
+            if method == STORED:
+                actual_crc = self._copy(reader, out, compressed)
+            else:
+                actual_crc = self._inflate(reader, out, None if descriptor else compressed)
+        if descriptor:
+            crc = self._read_descriptor(reader, zip64)
+        if actual_crc != crc:
+            raise _Unsupported(f"CRC mismatch in {name}")
+        self.extracted.add(name)
+
+    @staticmethod
+    def _zip64_sizes(extra, size, compressed):
+        """Returns (has_zip64_field, size, compressed) with 64-bit sizes filled in."""
+        offset = 0
+        while offset + 4 <= len(extra):
+            header_id, length = struct.unpack_from("<HH", extra, offset)
+            if header_id == _ZIP64_EXTRA:
+                data = extra[offset + 4: offset + 4 + length]
+                fields = list(struct.unpack_from(f"<{len(data) // 8}Q", data))
+                if size == 0xFFFFFFFF and fields:
+                    size = fields.pop(0)
+                if compressed == 0xFFFFFFFF and fields:
+                    compressed = fields.pop(0)
+                return True, size, compressed
+            offset += 4 + length
+        return False, size, compressed
+
+    @staticmethod
+    def _copy(reader, out, remaining):
+        crc = 0
+        while remaining:
+            data = reader.read_some(min(READ_SIZE, remaining))
+            out.write(data)
+            crc = zlib.crc32(data, crc)
+            remaining -= len(data)
+        return crc
+
+    @staticmethod
+    def _inflate(reader, out, remaining):
+        """
+        Inflates one raw deflate stream into out (None discards it).
+        remaining None means 'until the stream ends'.
+        """
+        crc = 0
+        inflater = zlib.decompressobj(-15)
+        while not inflater.eof:
+            limit = READ_SIZE if remaining is None else min(READ_SIZE, remaining)
+            if limit <= 0:
+                raise _Unsupported("deflate stream longer than its entry")
+            data = reader.read_some(limit)
+            if remaining is not None:
+                remaining -= len(data)
+            chunk = inflater.decompress(data)
+            if out is not None:
+                out.write(chunk)
+                crc = zlib.crc32(chunk, crc)
+        if inflater.unused_data:
+            reader.unread(inflater.unused_data)
+        return crc
+
+    def _skip(self, reader, method, compressed, descriptor, zip64):
+        if descriptor:
+            if method == DEFLATED:
+                self._inflate(reader, None, None)
+            self._read_descriptor(reader, zip64)
+        else:
+            while compressed:
+                compressed -= len(reader.read_some(min(READ_SIZE, compressed)))
+
+    @staticmethod
+    def _read_descriptor(reader, zip64):
+        """Returns the CRC from the data descriptor after an entry."""
+        head = reader.read(4)
+        if head == _DESCRIPTOR_SIG:
+            head = reader.read(4)
+        reader.read(16 if zip64 else 8)  # compressed and uncompressed sizes
+        return struct.unpack("<I", head)[0]
+
+    def _extract_remaining(self):
+        """Extracts every member the stream didn't, checking against the central directory."""
+        with zipfile.ZipFile(self.part_path) as archive:
+            members = archive.infolist()
+            for info in members:
+                if info.filename in self.extracted or info.is_dir():
+                    continue
+                target = _safe_target(self.dest_dir, info.filename)
+                if target is None:
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with archive.open(info) as src, open(target, "wb") as out:
+                    while True:
+                        data = src.read(READ_SIZE)
+                        if not data:
+                            break
+                        out.write(data)
+        return len(members)
+
+
+# =========================================================================
+# POST-DOWNLOAD EXTRACTION (worker processes)
+# =========================================================================
+PROGRESS_INTERVAL = 0.25  # seconds between progress reports from a worker
+
+
+class ExtractionError(Exception):
+    """The archive is damaged, encrypted or doesn't fit on the disk."""
+
+
+class _Progress:
+    """Worker side: counts extracted bytes and reports them at most every PROGRESS_INTERVAL."""
+
+    def __init__(self, key, progress_queue, cancel_event, total):
+        self.key = key
+        self.queue = progress_queue
+        self.cancel_event = cancel_event
+        self.total = total
+        self.done = 0
+        self.last_report = 0.0
+
+    def add(self, amount):
+        self.done += amount
+        now = time.monotonic()
+        if now - self.last_report >= PROGRESS_INTERVAL:
+            self.last_report = now
+            self.queue.put((self.key, self.done, self.total))
+        if self.cancel_event.is_set():
+            raise _Cancelled()
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _check_space(dest_dir, needed):
+    parent = dest_dir
+    while not os.path.isdir(parent):
+        parent = os.path.dirname(parent) or "."
+    free = shutil.disk_usage(parent).free
+    if needed > free:
+        raise ExtractionError(f"Not enough disk space ({format_size(needed)} needed, {format_size(free)} free)")
+
+
+def _extract_zip(path, dest_dir, key, progress_queue, cancel_event):
+    try:
+        archive = zipfile.ZipFile(path)
+    except zipfile.BadZipFile as e:
+        raise ExtractionError(f"Damaged archive: {e}")
+    with archive:
+        members = archive.infolist()
+        if any(info.flag_bits & FLAG_ENCRYPTED for info in members):
+            raise ExtractionError("Archive is password protected")
+        total = sum(info.file_size for info in members)
+        _check_space(dest_dir, total)
+        progress = _Progress(key, progress_queue, cancel_event, total)
+        for info in members:
+            target = _safe_target(dest_dir, info.filename)
+            if target is None:
+                continue
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Reading to the end checks the member's CRC
+            with archive.open(info) as src, open(target, "wb") as out:
+                while True:
+                    data = src.read(READ_SIZE)
+                    if not data:
+                        break
+                    out.write(data)
+                    progress.add(len(data))
+    return [path]
+
+
+def _extract_7z(path, dest_dir, key, progress_queue, cancel_event):
+    try:
+        archive = py7zr.SevenZipFile(path)
+    except py7zr.Bad7zFile as e:
+        raise ExtractionError(f"Damaged archive: {e}")
+    with archive:
+        if archive.needs_password():
+            raise ExtractionError("Archive is password protected")
+        total = archive.archiveinfo().uncompressed
+        _check_space(dest_dir, total)
+        progress = _Progress(key, progress_queue, cancel_event, total)
+
+        class Callback(ExtractCallback):
+            def report_start_preparation(self): pass
+            def report_start(self, processing_file_path, processing_bytes): pass
+            def report_update(self, decompressed_bytes): pass
+            def report_end(self, processing_file_path, wrote_bytes): progress.add(int(wrote_bytes))
+            def report_postprocess(self): pass
+            def report_warning(self, message): print(f"[DEBUG] 7z: {message}")
+
+        # py7zr verifies CRCs and refuses paths outside dest_dir itself
+        archive.extractall(path=dest_dir, callback=Callback())
+    return [path]
+
+
+def _extract_rar(path, dest_dir, key, progress_queue, cancel_event):
+    try:
+        archive = rarfile.RarFile(path)
+    except rarfile.Error as e:
+        raise ExtractionError(f"Damaged archive: {e}")
+    with archive:
+        if archive.needs_password():
+            raise ExtractionError("Archive is password protected")
+        members = archive.infolist()
+        total = sum(info.file_size for info in members)
+        _check_space(dest_dir, total)
+        progress = _Progress(key, progress_queue, cancel_event, total)
+        if archive.is_solid():
+            # Each member of a solid archive depends on the ones before it;
+            # opening them one by one would decompress the archive n times.
+            archive.extractall(dest_dir)
+            progress.add(total)
+        else:
+            for info in members:
+                archive.extract(info, dest_dir)
+                progress.add(info.file_size)
+        return archive.volumelist()
+
+
+_EXTRACTORS = {
+    ".zip": _extract_zip,
+    ".7z": _extract_7z,
+    ".rar": _extract_rar,
+}
+
+
+def _extract_worker(path, dest_dir, key, progress_queue, cancel_event):
+    """
+    Runs in a pool process. Returns ("SUCCESS", archive_files),
+    ("STOPPED", None) or ("ERROR", message).
+    """
+    extractor = _EXTRACTORS[os.path.splitext(path)[1].lower()]
+    try:
+        os.makedirs(dest_dir, exist_ok=True)
+        return "SUCCESS", extractor(path, dest_dir, key, progress_queue, cancel_event)
+    except _Cancelled:
+        return "STOPPED", None
+    except ExtractionError as e:
+        return "ERROR", str(e)
+    except Exception as e:
+        # CRC errors, truncated data, missing unrar tool...
+        return "ERROR", f"{type(e).__name__}: {e}"
+
+
+class ExtractionPool:
+    """
+    Unpacks finished downloads in worker processes, so LZMA/RAR decompression
+    neither holds the GIL the UI needs nor waits for other archives: up to
+    max_workers (default: one per CPU core) extract at the same time.
+    Progress comes back as PROCESSING events on the download's callback.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._queue = None
+        self._callbacks = {}  # key -> progress_callback
+        self._keys = 0
+
+    def _start(self):
+        # Worker processes and the manager are only spawned on first use
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+            self._queue = self._manager.Queue()
+            threading.Thread(target=self._relay_progress, args=(self._queue,), daemon=True).start()
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def _submit(self, *args):
+        try:
+            return self._executor.submit(_extract_worker, *args)
+        except concurrent.futures.process.BrokenProcessPool:
+            # A worker died earlier (e.g. out of memory); start a fresh pool
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor.submit(_extract_worker, *args)
+
+    def submit(self, path, dest_dir, progress_callback, controller, on_done, delete_archive=False):
+        """
+        Extracts path into dest_dir. on_done(result) gets "SUCCESS",
+        "STOPPED" (controller cancelled) or "ERROR: ...". With
+        delete_archive the archive (all volumes) is removed after a
+        successful extraction.
+        """
+        with self._lock:
+            self._start()
+            self._keys += 1
+            key = self._keys
+            self._callbacks[key] = progress_callback
+            cancel_event = self._manager.Event()
+            future = self._submit(path, dest_dir, key, self._queue, cancel_event)
+
+        def on_control():
+            if controller.cancelled:
+                cancel_event.set()
+                future.cancel()
+
+        controller.add_listener(on_control)
+        progress_callback(ProgressEvent(
+            DownloadState.PROCESSING, f"Extracting {os.path.basename(path)}...", progress=0.0
+        ))
+
+        def finished(future):
+            controller.remove_listener(on_control)
+            with self._lock:
+                self._callbacks.pop(key, None)
+            on_done(self._result(future, path, delete_archive))
+
+        future.add_done_callback(finished)
+
+    @staticmethod
+    def _result(future, path, delete_archive):
+        if future.cancelled():
+            return "STOPPED"
+        try:
+            status, detail = future.result()
+        except Exception as e:
+            # The worker process died (e.g. out of memory)
+            return f"ERROR: Extraction failed ({e})"
+        if status != "SUCCESS":
+            return status if status == "STOPPED" else f"ERROR: Extraction failed ({detail})"
+        if delete_archive:
+            for archive_file in detail:
+                try:
+                    os.remove(archive_file)
+                except OSError as e:
+                    print(f"[DEBUG] Could not delete {archive_file}: {e}")
+        return "SUCCESS"
+
+    def _relay_progress(self, progress_queue):
+        while True:
+            try:
+                key, done, total = progress_queue.get()
+            except (EOFError, OSError):
+                return  # Manager shut down
+            with self._lock:
+                callback = self._callbacks.get(key)
+            if callback and total:
+                callback(ProgressEvent(
+                    DownloadState.PROCESSING,
+                    f"Extracting... {format_size(done)} / {format_size(total)}",
+                    progress=min(done / total, 1.0),
+                ))
+
+    def shutdown(self):
+        with self._lock:
+            executor, manager = self._executor, self._manager
+            self._executor = self._manager = None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if manager:
+            manager.shutdown()
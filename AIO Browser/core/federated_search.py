@@ -0,0 +1,137 @@
+# core/federated_search.py
+# One search across every game source. Each source runs in its own thread
+# against its own deadline and results are handed out as they arrive, merged
+# on a normalized title, so a search takes at most as long as the largest
+# source timeout rather than the sum of all sources. Matches from the local
+# catalog come first, so results show at once (and offline).
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from core import scraper
+from core.catalog import catalog
+
+SOURCES = (
+    # name, card type, search(query, cancelled) -> iterator of result dicts
+    ("AnkerGames", "direct", lambda query, cancelled: scraper.AnkerClient().iter_search(query, cancelled)),
+    ("FitGirl", "torrent", scraper.iter_fitgirl),
+    ("Axekin", "roms", scraper.iter_axekin),
+)
+
+# Seconds each source may take; results arriving later are dropped.
+# FitGirl fetches every game page after the search page, so it gets longer
+SOURCE_TIMEOUTS = {"AnkerGames": 15, "FitGirl": 25, "Axekin": 15}
+CANCEL_POLL = 0.2  # seconds between checks of cancelled() while waiting
+
+# Where a release title stops naming the game: "Game – v1.2 + 3 DLCs",
+# "Game (USA)", "Game [FitGirl Repack]", "Game, v1.0", "Game v1.0.3"
+_TITLE_SUFFIX_RE = re.compile(r"\s[–—]\s|\s\+\s|[(\[]|,?\s+v\d|\s+build\s+\d")
+
+
+def normalize_title(title):
+    """Key results are merged on: the game name in lower case without punctuation or release details."""
+    name = _TITLE_SUFFIX_RE.split(title.lower(), 1)[0]
+    return " ".join(re.sub(r"[^\w]+", " ", name).split())
+
+
+@dataclass
+class SearchHit:
+    """
+    One result from one source. first is False when it merges into an
+    earlier result's title. cached hits come from the local catalog; update
+    marks the live result replacing a cached hit of the same source.
+    """
+    key: str
+    source: str
+    kind: str  # card type: "direct", "torrent" or "roms"
+    game: dict
+    first: bool
+    cached: bool = False
+    update: bool = False
+
+
+def _run_source(name, search, query, out, stop):
+    results = None
+    try:
+        # Requests still in flight are cancelled once the search is over
+        results = search(query, cancelled=stop.is_set)
+        for game in results:
+            if stop.is_set():
+                break
+            out.put((name, game))
+    except Exception as e:
+        print(f"[DEBUG] {name} search failed: {e}")
+    finally:
+        if hasattr(results, "close"):
+            results.close()
+        out.put((name, None))
+
+
+def search_all(query, timeouts=None, use_catalog=True, cancelled=None):
+    """
+    Searches every source concurrently and yields a SearchHit per result as
+    soon as it arrives, after the matches already in the local catalog. A
+    title already found by another source comes with first=False; repeats of
+    a title from the same source are dropped, except the first live result
+    for a cached one, which comes with update=True.
+    Returns once every source has finished or run out of time, or once
+    cancelled() returns True.
+    """
+    timeouts = {**SOURCE_TIMEOUTS, **(timeouts or {})}
+    kinds = {name: kind for name, kind, _ in SOURCES}
+    out = queue.Queue()
+    stop = threading.Event()
+    started = time.monotonic()
+    deadlines = {name: started + timeouts[name] for name, _, _ in SOURCES}
+
+    for name, _, search in SOURCES:
+        threading.Thread(target=_run_source, args=(name, search, query, out, stop), daemon=True).start()
+
+    pending = set(deadlines)
+    seen = {}  # key -> {source: True while only the catalog has returned it}
+    try:
+        if use_catalog:
+            for name, game in catalog.search(query):
+                if name not in kinds:
+                    continue
+                key = normalize_title(game.get("title") or "")
+                sources = seen.setdefault(key, {})
+                if name not in sources:
+                    sources[name] = True
+                    yield SearchHit(key, name, kinds[name], game, first=len(sources) == 1, cached=True)
+
+        while pending:
+            now = time.monotonic()
+            for name in [n for n in pending if deadlines[n] <= now]:
+                print(f"[DEBUG] {name} search timed out after {timeouts[name]}s")
+                pending.discard(name)
+            if not pending:
+                break
+            if cancelled and cancelled():
+                break
+            wait = min(deadlines[n] for n in pending) - now
+            try:
+                name, game = out.get(timeout=min(wait, CANCEL_POLL) if cancelled else wait)
+            except queue.Empty:
+                continue
+            if name not in pending:
+                continue  # Late result from a source that already timed out
+            if game is None:
+                pending.discard(name)
+                continue
+
+            key = normalize_title(game.get("title") or "")
+            sources = seen.setdefault(key, {})
+            if name in sources:
+                if sources[name]:
+                    sources[name] = False
+                    yield SearchHit(key, name, kinds[name], game, first=False, update=True)
+                continue
+            sources[name] = False
+            yield SearchHit(key, name, kinds[name], game, first=len(sources) == 1)
+    finally:
+        # Sources still running stop at their next result
+        stop.set()
+        print(f"[DEBUG] Search for {query!r} done in {time.monotonic() - started:.1f}s")
@@ -0,0 +1,174 @@
+# core/host_policy.py
+# Per-host request policy shared by the scrapers and API clients: a token
+# bucket spacing out requests to each host, and a circuit breaker that stops
+# sending to a host once most recent requests to it failed. While a circuit
+# is open requests fail at once with CircuitOpenError instead of each waiting
+# out its timeout; after a pause one probe request is let through (half-open)
+# and its outcome closes the circuit or keeps it open for longer.
+import asyncio
+import collections
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+from core.rate_limit import TokenBucket
+
+# Requests per second and burst per host; hosts not listed get DEFAULT_RATE
+DEFAULT_RATE = (10, 20)
+HOST_RATES = {
+    "ankergames.net": (4, 8),  # every download link is a POST to its API
+}
+
+WINDOW = 60  # seconds of outcomes the failure rate is taken over
+MIN_REQUESTS = 5  # outcomes needed in the window before the circuit can open
+FAILURE_RATE = 0.5  # share of failed requests that opens the circuit
+OPEN_SECONDS = 15  # first pause before probing a failing host; doubles per failed probe
+MAX_OPEN_SECONDS = 300
+PROBE_GRACE = 30  # seconds before another probe goes out if one never reports back
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+def is_failure(status):
+    """Transport errors (status None), 429 and 5xx count against a host; other statuses don't."""
+    return status is None or status == 429 or status >= 500
+
+
+class _RequestBucket(TokenBucket):
+    """TokenBucket counting requests, holding up to burst of them and starting full."""
+
+    def __init__(self, rate, burst):
+        self.burst = burst
+        super().__init__(rate)
+        self._tokens = self.capacity
+
+    @property
+    def capacity(self):
+        return float(self.burst)
+
+
+class HostPolicy:
+    def __init__(self, host, rate=DEFAULT_RATE[0], burst=DEFAULT_RATE[1]):
+        self.host = host
+        self.bucket = _RequestBucket(rate, burst)
+        self.state = CLOSED
+        self._lock = threading.Lock()
+        self._outcomes = collections.deque()  # (time, failed) within WINDOW
+        self._open_for = OPEN_SECONDS
+        self._open_until = 0.0
+
+    # ---------------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------------
+    def before_request(self):
+        """Blocks for the host's rate limit. Raises CircuitOpenError while the host is failing."""
+        self._admit()
+        self.bucket.consume(1)
+
+    async def before_request_async(self):
+        """before_request for asyncio callers."""
+        self._admit()
+        delay = self.bucket.reserve(1)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, status, retry_after=None):
+        """
+        Reports a request's outcome: its HTTP status, or None if it failed on
+        the network. retry_after (a 429/503's Retry-After header) opens the
+        circuit for that long.
+        """
+        failed = is_failure(status)
+        now = time.monotonic()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if failed:
+                    self._open(now, min(self._open_for * 2, MAX_OPEN_SECONDS), "probe failed")
+                else:
+                    print(f"[DEBUG] {self.host} is back, closing its circuit")
+                    self.state = CLOSED
+                    self._open_for = OPEN_SECONDS
+                    self._outcomes.clear()
+                return
+            if self.state == OPEN:
+                return  # Sent before the circuit opened
+
+            self._outcomes.append((now, failed))
+            while self._outcomes and self._outcomes[0][0] < now - WINDOW:
+                self._outcomes.popleft()
+            seconds = _retry_after_seconds(retry_after) if failed else None
+            if seconds:
+                self._open(now, min(seconds, MAX_OPEN_SECONDS), f"asked to retry after {seconds}s")
+                return
+            failures = sum(1 for _, f in self._outcomes if f)
+            if len(self._outcomes) >= MIN_REQUESTS and failures / len(self._outcomes) >= FAILURE_RATE:
+                self._open(now, self._open_for, f"{failures}/{len(self._outcomes)} requests failed")
+
+    # ---------------------------------------------------------------------
+    # Circuit
+    # ---------------------------------------------------------------------
+    def _admit(self):
+        now = time.monotonic()
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if now < self._open_until:
+                raise CircuitOpenError(
+                    f"{self.host} is failing; not retrying for {self._open_until - now:.0f}s"
+                )
+            # Let this request through as the probe; the rest keep failing fast
+            self.state = HALF_OPEN
+            self._open_until = now + PROBE_GRACE
+
+    def _open(self, now, seconds, reason):
+        print(f"[DEBUG] {self.host} circuit open for {seconds:.0f}s ({reason})")
+        self.state = OPEN
+        self._open_for = seconds
+        self._open_until = now + seconds
+        self._outcomes.clear()
+
+
+def _retry_after_seconds(value):
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None  # Absent or an HTTP date
+
+
+_policies = {}
+_policies_lock = threading.Lock()
+
+
+def policy_for(url):
+    """The HostPolicy of url's host, created on first use."""
+    host = (urlparse(url).hostname or "").lower()
+    with _policies_lock:
+        policy = _policies.get(host)
+        if policy is None:
+            rate, burst = HOST_RATES.get(host.removeprefix("www."), DEFAULT_RATE)
+            policy = _policies[host] = HostPolicy(host, rate, burst)
+        return policy
+
+
+def guarded(url, request, *args, **kwargs):
+    """
+    Calls request(*args, **kwargs), a requests call to url (session.get, an
+    adapter's send, ...), under url's host policy and returns its response.
+    """
+    policy = policy_for(url)
+    policy.before_request()
+    try:
+        response = request(*args, **kwargs)
+    except requests.RequestException:
+        policy.record(None)
+        raise
+    policy.record(response.status_code, response.headers.get("Retry-After"))
+    return response
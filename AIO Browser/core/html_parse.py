@@ -0,0 +1,27 @@
+# core/html_parse.py
+# BeautifulSoup construction for the scrapers. Uses the lxml tree builder when
+# it is installed (several times faster than the pure-Python html.parser) and
+# falls back to html.parser otherwise. Callers pass a SoupStrainer so only the
+# tags they read are turned into a tree.
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+# Subtrees the scrapers read
+ENTRY_CONTENT = SoupStrainer(class_="entry-content")  # WordPress post body (FitGirl)
+ARTICLES = SoupStrainer("article")  # WordPress search/listing results
+MAGNET_LINKS = SoupStrainer("a", href=lambda h: h and h.startswith("magnet:"))
+CSRF_META = SoupStrainer("meta", attrs={"name": "csrf-token"})
+REDIRECT_TAGS = SoupStrainer(["meta", "a"])  # meta refresh and download buttons
+
+
+def make_soup(markup, parse_only=None):
+    """
+    Parses markup with the fastest available tree builder. With parse_only
+    (a SoupStrainer) only the matching tags and their contents are kept.
+    """
+    return BeautifulSoup(markup, PARSER, parse_only=parse_only)
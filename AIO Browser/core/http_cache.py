@@ -0,0 +1,256 @@
+# core/http_cache.py
+# Disk cache for scraped pages. Responses are stored per URL; within their TTL
+# they are served straight from disk, after it they are revalidated with
+# If-None-Match / If-Modified-Since, so an unchanged page only costs a 304.
+# The least recently used entries are evicted once the cache outgrows its budget.
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from core.http_session import shared_session
+from core.path_utils import get_root_dir
+
+DEFAULT_TTL = 10 * 60  # seconds a page is used without asking the server
+MAX_BYTES = 64 * 1024 * 1024
+INDEX_NAME = "index.json"
+
+# Stored alongside the body and handed back on hits
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class CachedResponse:
+    """The parts of a requests.Response the scrapers use, rebuilt from disk."""
+
+    from_cache = True
+
+    def __init__(self, url, headers, content, encoding):
+        self.url = url
+        self.status_code = 200
+        self.ok = True
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        pass
+
+
+class HttpCache:
+    """
+    URL-keyed response cache on disk. index.json holds the metadata of every
+    entry (validators, size, last use); bodies live next to it as <key>.body.
+    Safe to use from several threads at once.
+    """
+
+    def __init__(self, directory, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = None
+
+    # ---------------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------------
+    def get(self, url, session=None, ttl=DEFAULT_TTL, **kwargs):
+        """
+        GET url through the cache. session defaults to the shared pooled one; kwargs
+        (headers, timeout, ...) are passed on to its get(). Only 200 responses
+        are stored. If revalidation fails on the network a stale copy is
+        returned rather than nothing.
+        """
+        key = self._key(url)
+        entry = self._entry(key)
+        if entry and time.time() - entry["stored"] < ttl:
+            cached = self._load(key, entry)
+            if cached:
+                return cached
+
+        request_headers = kwargs.pop("headers", None) or {}
+        headers = dict(request_headers)
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            resp = (session or shared_session()).get(url, headers=headers, **kwargs)
+        except requests.RequestException:
+            cached = self._load(key, entry) if entry else None
+            if cached:
+                print(f"[DEBUG] Offline, using cached copy of {url}")
+                return cached
+            raise
+
+        if resp.status_code == 304 and entry:
+            cached = self._load(key, entry)
+            if cached:
+                self._touch(key, stored=True)
+                return cached
+            # Body went missing; forget the entry and ask again without validators
+            with self._lock:
+                self._remove(key)
+                self._save_index()
+            return self.get(url, session, ttl, headers=request_headers, **kwargs)
+
+        if resp.status_code == 200:
+            self._store(key, url, resp)
+        return resp
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._load_index()):
+                self._remove(key)
+            self._save_index()
+
+    # ---------------------------------------------------------------------
+    # For callers making the request themselves (core.async_scraper)
+    # ---------------------------------------------------------------------
+    def lookup(self, url, ttl=DEFAULT_TTL):
+        """
+        Returns (response, validators): the cached response when it is younger
+        than ttl (else None) and the headers to revalidate the entry with.
+        """
+        key = self._key(url)
+        entry = self._entry(key)
+        if not entry:
+            return None, {}
+        if time.time() - entry["stored"] < ttl:
+            cached = self._load(key, entry)
+            if cached:
+                return cached, {}
+        validators = {}
+        if entry.get("etag"):
+            validators["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            validators["If-Modified-Since"] = entry["last_modified"]
+        return None, validators
+
+    def cached(self, url, revalidated=False):
+        """The stored copy of url whatever its age, or None. revalidated: the server answered 304."""
+        key = self._key(url)
+        entry = self._entry(key)
+        cached = self._load(key, entry) if entry else None
+        if cached and revalidated:
+            self._touch(key, stored=True)
+        return cached
+
+    def store(self, url, resp):
+        """Stores a 200 response for url; resp needs url, headers, content and encoding."""
+        self._store(self._key(url), url, resp)
+
+    # ---------------------------------------------------------------------
+    # Storage
+    # ---------------------------------------------------------------------
+    @staticmethod
+    def _key(url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, key + ".body")
+
+    def _load_index(self):
+        if self._entries is None:
+            try:
+                with open(os.path.join(self.directory, INDEX_NAME), "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save_index(self):
+        path = os.path.join(self.directory, INDEX_NAME)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[DEBUG] Could not save HTTP cache index: {e}")
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._load_index().get(key)
+            return dict(entry) if entry else None
+
+    def _touch(self, key, stored=False):
+        """Marks an entry used (and revalidated). Use times alone are saved with the next write."""
+        with self._lock:
+            entry = self._load_index().get(key)
+            if entry:
+                entry["used"] = time.time()
+                if stored:
+                    entry["stored"] = entry["used"]
+                    self._save_index()
+
+    def _load(self, key, entry):
+        try:
+            with open(self._body_path(key), "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        self._touch(key)
+        return CachedResponse(entry.get("final_url") or entry["url"], entry["headers"], content, entry.get("encoding"))
+
+    def _store(self, key, url, resp):
+        if "no-store" in resp.headers.get("Cache-Control", "").lower():
+            return
+        content = resp.content
+        now = time.time()
+        entry = {
+            "url": url,
+            "final_url": str(resp.url),
+            "headers": {h: resp.headers[h] for h in _KEPT_HEADERS if h in resp.headers},
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "encoding": resp.encoding,
+            "size": len(content),
+            "stored": now,
+            "used": now,
+        }
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = self._body_path(key) + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_path, self._body_path(key))
+            except OSError as e:
+                print(f"[DEBUG] Could not cache {url}: {e}")
+                return
+            self._load_index()[key] = entry
+            self._evict()
+            self._save_index()
+
+    def _evict(self):
+        """Drops least recently used entries until the cache fits max_bytes."""
+        entries = self._entries
+        total = sum(e["size"] for e in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["used"]):
+            if total <= self.max_bytes:
+                break
+            total -= entries[key]["size"]
+            self._remove(key)
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+
+
+cache = HttpCache(str(get_root_dir() / "cache" / "http"))
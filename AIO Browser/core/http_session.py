@@ -0,0 +1,88 @@
+# core/http_session.py
+# One pooled requests.Session for the app's page and API requests (scrapers,
+# Steam, emulator releases, TVMaze). Reusing it keeps connections alive, so
+# repeat requests to a host skip the TCP and TLS handshakes. Every request
+# goes through the per-host rate limit and circuit breaker (core.host_policy).
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core import host_policy
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+POOL_SIZE = 5  # kept-alive connections per host; matches the FitGirl enrichment workers
+POOL_HOSTS = 20  # hosts whose pools are kept around
+DEFAULT_TIMEOUT = (10, 20)  # (connect, read) seconds when the caller gives none
+RETRIES = 2
+RETRY_BACKOFF = 0.5  # seconds, doubled per retry
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class _PolicyAdapter(HTTPAdapter):
+    """HTTPAdapter that sends under the host's core.host_policy."""
+
+    def send(self, request, **kwargs):
+        return host_policy.guarded(request.url, super().send, request, **kwargs)
+
+
+class _DefaultTimeoutAdapter(_PolicyAdapter):
+    """_PolicyAdapter that applies a timeout to requests made without one."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def create_session(pool_size=POOL_SIZE, retries=RETRIES, timeout=DEFAULT_TIMEOUT):
+    """
+    A Session with keep-alive pools of pool_size connections per host,
+    retries with backoff for idempotent requests (connection errors and
+    429/5xx) and a default timeout. Retry-After is left to core.host_policy,
+    which opens the host's circuit for that long instead of sleeping here.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        # Sleeping out Retry-After here would hold the caller before the host policy sees it
+        respect_retry_after_header=False,
+        # Hand the last response back instead of raising; callers check status
+        raise_on_status=False,
+    )
+    adapter = _DefaultTimeoutAdapter(
+        timeout, pool_connections=POOL_HOSTS, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def guard(session, *prefixes):
+    """Sends session's requests to URLs starting with prefixes under core.host_policy."""
+    for prefix in prefixes:
+        session.mount(prefix, _PolicyAdapter())
+    return session
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_session():
+    """The app-wide pooled session, created on first use. Safe to share between threads."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = create_session()
+        return _shared
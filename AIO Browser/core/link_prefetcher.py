@@ -0,0 +1,76 @@
+# core/link_prefetcher.py
+# Resolves Anker download links in the background before they are clicked
+# (for the result card under the pointer), so the download prompt can open
+# at once. Results go to scraper.resolved_links, which the download flow
+# checks first; a click on a link still being resolved waits for it.
+import concurrent.futures
+import threading
+
+from core import scraper
+
+MAX_WORKERS = 2  # resolutions in flight at once; browsing should not hammer the site
+
+
+class LinkPrefetcher:
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefetch"
+        )
+        self._lock = threading.Lock()
+        self._pending = {}  # game page URL -> future
+
+    # ---------------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------------
+    def prefetch(self, game_page_url, anker):
+        """Queues resolving game_page_url with anker unless it is resolved or queued already."""
+        if scraper.resolved_links.get(game_page_url):
+            return
+        with self._lock:
+            if game_page_url in self._pending:
+                return
+            future = self._executor.submit(self._resolve, game_page_url, anker)
+            self._pending[game_page_url] = future
+        future.add_done_callback(lambda f: self._forget(game_page_url, f))
+
+    def cancel(self, game_page_url):
+        """Drops a queued prefetch. One already running is left to finish (and cached)."""
+        with self._lock:
+            future = self._pending.get(game_page_url)
+        if future is not None:
+            future.cancel()
+
+    def wait(self, game_page_url, timeout=None):
+        """Blocks until a prefetch of game_page_url in progress has finished, if there is one."""
+        with self._lock:
+            future = self._pending.get(game_page_url)
+        if future is None:
+            return
+        try:
+            future.result(timeout=timeout)
+        except (concurrent.futures.CancelledError, concurrent.futures.TimeoutError):
+            pass
+
+    # ---------------------------------------------------------------------
+    # Workers
+    # ---------------------------------------------------------------------
+    def _forget(self, game_page_url, future):
+        with self._lock:
+            if self._pending.get(game_page_url) is future:
+                del self._pending[game_page_url]
+
+    @staticmethod
+    def _resolve(game_page_url, anker):
+        try:
+            final_url, error = anker.get_download_link(game_page_url)
+            if error or not final_url:
+                print(f"[DEBUG] Prefetch of {game_page_url} failed: {error}")
+                return
+            links, filename = anker.resolve_all_links(final_url)
+            scraper.resolved_links.put(game_page_url, links, filename, anker.session)
+            print(f"[DEBUG] Prefetched {len(links)} link(s) for {game_page_url}")
+        except Exception as e:
+            print(f"[DEBUG] Prefetch of {game_page_url} failed: {e}")
+
+
+prefetcher = LinkPrefetcher()
@@ -0,0 +1,262 @@
+# core/mirrors.py
+# Choosing between several URLs that serve the same file: short ranged probes
+# race the candidates, a throughput monitor notices when the mirror in use
+# collapses mid-download, and per-host speed history ranks hosts next time.
+import collections
+import concurrent.futures
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+from core.path_utils import get_root_dir
+
+PROBE_BYTES = 512 * 1024
+PROBE_TIMEOUT = (5, 10)  # (connect, read) seconds
+
+# Weight of the newest sample in a host's remembered speed
+HISTORY_ALPHA = 0.3
+HISTORY_LIMIT = 200  # hosts kept in mirror_stats.json
+
+# Mid-download switching
+WARMUP = 10.0  # seconds on a mirror before it can be judged
+WINDOW = 8.0  # seconds of throughput compared against the best window seen
+COLLAPSE_RATIO = 0.2  # switch when a window drops below this share of the best
+STALL_SPEED = 16 * 1024  # ...or below this many bytes/s regardless
+
+
+def host_of(url):
+    try:
+        return urlparse(url).netloc.lower() or None
+    except Exception:
+        return None
+
+
+# =========================================================================
+# SPEED HISTORY
+# =========================================================================
+class MirrorHistory:
+    """Moving average of the download speed seen per host, in bytes/s."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._hosts = None
+
+    def _load(self):
+        if self._hosts is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._hosts = json.load(f)
+            except (OSError, ValueError):
+                self._hosts = {}
+        return self._hosts
+
+    def speed(self, url):
+        with self._lock:
+            entry = self._load().get(host_of(url))
+        return entry["speed"] if entry else None
+
+    def record(self, url, speed):
+        """Folds a measured speed (0 for a failure) into the host's average."""
+        host = host_of(url)
+        if not host:
+            return
+        with self._lock:
+            hosts = self._load()
+            old = hosts.get(host)
+            if old:
+                speed = old["speed"] + HISTORY_ALPHA * (speed - old["speed"])
+            hosts[host] = {"speed": speed, "updated": time.time()}
+            if len(hosts) > HISTORY_LIMIT:
+                for stale in sorted(hosts, key=lambda h: hosts[h]["updated"])[:len(hosts) - HISTORY_LIMIT]:
+                    del hosts[stale]
+            try:
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(hosts, f)
+            except OSError as e:
+                print(f"[DEBUG] Could not save mirror history: {e}")
+
+
+history = MirrorHistory(str(get_root_dir() / "mirror_stats.json"))
+
+
+# =========================================================================
+# PROBING
+# =========================================================================
+class Mirror:
+    """One usable candidate: where it ended up after redirects and what it serves."""
+
+    def __init__(self, source, url, speed, total, ranges, validator):
+        self.source = source
+        self.url = url
+        self.speed = speed
+        self.total = total
+        self.ranges = ranges
+        self.validator = validator
+
+    @property
+    def host(self):
+        return host_of(self.url)
+
+
+def _total_size(r):
+    content_range = r.headers.get("Content-Range", "")
+    if r.status_code == 206 and "/" in content_range:
+        total = content_range.rsplit("/", 1)[-1].strip()
+        return int(total) if total.isdigit() else 0
+    return int(r.headers.get("content-length", 0) or 0)
+
+
+def _probe(session, url, probe_bytes):
+    """Fetches the first probe_bytes of url. Returns a Mirror, or None if it isn't a file."""
+    started = time.perf_counter()
+    headers = {"Range": f"bytes=0-{probe_bytes - 1}"}
+    with session.get(url, stream=True, headers=headers, timeout=PROBE_TIMEOUT, allow_redirects=True) as r:
+        r.raise_for_status()
+        if "text/html" in r.headers.get("Content-Type", "").lower():
+            return None
+        received = 0
+        for chunk in r.iter_content(chunk_size=64 * 1024):
+            received += len(chunk)
+            if received >= probe_bytes:
+                break
+        etag = r.headers.get("ETag")
+        validator = etag if etag and not etag.startswith("W/") else r.headers.get("Last-Modified")
+        return Mirror(
+            url,
+            str(r.url),
+            received / max(time.perf_counter() - started, 1e-3),
+            _total_size(r),
+            r.status_code == 206,
+            validator,
+        )
+
+
+def race(session, urls, probe_bytes=PROBE_BYTES):
+    """
+    Probes every url at once and returns the usable Mirrors, best first.
+    The first url (in the given order) that answers defines the file; other
+    mirrors only count if they report the same size. Probe speeds go into the
+    history, and the ranking uses the updated averages, so a host that was
+    fast on earlier downloads isn't dropped for one slow probe.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(urls), 8)) as pool:
+        futures = [pool.submit(_probe, session, url, probe_bytes) for url in urls]
+
+    probed = []
+    for url, future in zip(urls, futures):
+        try:
+            mirror = future.result()
+        except Exception as e:
+            print(f"[DEBUG] Mirror probe failed for {url}: {e}")
+            mirror = None
+        history.record(url, mirror.speed if mirror else 0)
+        if mirror:
+            probed.append(mirror)
+
+    if not probed:
+        return []
+    reference = probed[0].total
+    usable = [m for m in probed if m.total == reference]
+    score = {m.url: history.speed(m.url) or m.speed for m in usable}
+    return sorted(usable, key=lambda m: -score[m.url])
+
+
+# =========================================================================
+# MID-DOWNLOAD SWITCHING
+# =========================================================================
+class _ThroughputMonitor:
+    """Sliding-window speed of the current mirror compared with its best window."""
+
+    def reset(self, downloaded):
+        now = time.monotonic()
+        self.started = now
+        self.start_bytes = downloaded
+        self.samples = collections.deque([(now, downloaded)])
+        self.best = 0.0
+        self.speed = None  # last full window
+
+    def collapsed(self, downloaded):
+        now = time.monotonic()
+        self.samples.append((now, downloaded))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= WINDOW:
+            self.samples.popleft()
+        stamp, start = self.samples[0]
+        if now - stamp < WINDOW:
+            return False
+        self.speed = (downloaded - start) / (now - stamp)
+        self.best = max(self.best, self.speed)
+        if now - self.started < WARMUP:
+            return False
+        return self.speed < max(self.best * COLLAPSE_RATIO, STALL_SPEED)
+
+    def average(self, downloaded):
+        elapsed = time.monotonic() - self.started
+        return (downloaded - self.start_bytes) / elapsed if elapsed >= 2 else None
+
+
+class MirrorPool:
+    """
+    The mirrors of one download, best first. Segment workers take .current
+    for every new request, so after switch() their reconnects resume at the
+    offset they had reached on the new mirror.
+    """
+
+    def __init__(self, mirrors):
+        self.mirrors = list(mirrors)
+        self.index = 0
+        self.downloaded = 0
+        self._lock = threading.Lock()
+        self._monitor = _ThroughputMonitor()
+        self._monitor.reset(0)
+
+    @property
+    def current(self):
+        return self.mirrors[self.index]
+
+    def _next_index(self):
+        for i in range(self.index + 1, len(self.mirrors)):
+            if self.mirrors[i].ranges:
+                return i
+        return None
+
+    def reset(self, downloaded):
+        """Restarts the throughput measurement, e.g. after a pause."""
+        with self._lock:
+            self.downloaded = downloaded
+            self._monitor.reset(downloaded)
+
+    def should_switch(self, downloaded):
+        """Call periodically; True when throughput collapsed and another mirror is left."""
+        with self._lock:
+            self.downloaded = downloaded
+            return self._next_index() is not None and self._monitor.collapsed(downloaded)
+
+    def switch(self, failed_url=None):
+        """
+        Moves on to the next range-capable mirror and returns it, or None when
+        none is left. failed_url: a worker gave up on that mirror; only switch
+        if it is still the current one.
+        """
+        with self._lock:
+            old = self.current
+            if failed_url is not None and failed_url != old.url:
+                return None
+            index = self._next_index()
+            if index is None:
+                return None
+            # Remember the host as it performed when we gave up on it
+            speed = 0 if failed_url else self._monitor.speed
+            history.record(old.url, speed or 0)
+            self.index = index
+            self._monitor.reset(self.downloaded)
+            print(f"[DEBUG] Switching mirror {old.host} -> {self.current.host}")
+            return self.current
+
+    def finish(self, downloaded):
+        """Records how fast the current mirror was over the rest of the download."""
+        with self._lock:
+            speed = self._monitor.average(downloaded)
+        if speed:
+            history.record(self.current.url, speed)
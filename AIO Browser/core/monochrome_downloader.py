@@ -7,11 +7,16 @@ import requests
 import json
 import base64
 from pathlib import Path
-from typing import Optional, Dict, List, Any, Literal
+from typing import Optional, Dict, List, Any, Literal, Tuple
 from mutagen.flac import FLAC
 from mutagen.mp4 import MP4
 from mutagen.id3 import ID3, TIT2, TPE1, TALB, TPE2, TDRC, TRCK, TPOS, APIC
 
+from core import host_policy
+from core.download_control import DownloadCancelled, DownloadController
+from core.progress import DownloadState, ProgressEvent, ProgressTracker
+from core.stream_io import ChunkReader, body_length, preallocate
+
 
 class MonochromeAPIError(Exception):
     """Raised for Monochrome API errors, includes optional status code and response text."""
@@ -83,7 +88,10 @@ class MonochromeAPI:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'Referer': 'https://monochrome-api.samidy.com/'
             }
-            response = self.session.get(url, params=params, headers=headers, timeout=30)
+            # Fails at once while the API host is known to be failing
+            response = host_policy.guarded(
+                url, self.session.get, url, params=params, headers=headers, timeout=30
+            )
             status = response.status_code
             text = response.text
             print(f"[MONOCHROME] Response status: {status}")
@@ -339,34 +347,77 @@ class MonochromeDownloader:
         self.api = api
         self.session = requests.Session()
 
-    def download_file(self, url: str, output_path: Path, progress_callback=None) -> None:
-        """Download file with progress tracking"""
+    def download_file(self, url: str, output_path: Path, progress_callback=None, controller=None) -> None:
+        """
+        Download file with progress tracking. progress_callback receives
+        ProgressEvents. Raises DownloadCancelled if the controller cancels.
+        """
+        # A private controller still applies the global bandwidth limit
+        controller = controller or DownloadController()
         response = self.session.get(url, stream=True)
         response.raise_for_status()
 
-        total_size = int(response.headers.get('content-length', 0))
+        total_size = body_length(response)
         downloaded = 0
+        reporter = ProgressTracker(progress_callback, total_size) if progress_callback else None
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-
-                    if progress_callback and total_size > 0:
-                        progress = (downloaded / total_size) * 100
-                        progress_callback(progress, downloaded, total_size)
+        controller.attach(response)
+        try:
+            with open(output_path, 'wb') as f:
+                preallocate(f, total_size)
+                for chunk in ChunkReader(response):
+                    controller.check()
+                    if chunk:
+                        f.write(chunk)
+                        downloaded += len(chunk)
+
+                        if reporter:
+                            reporter.update(downloaded)
+                        controller.throttle(len(chunk))
+            controller.check()
+            if total_size and downloaded != total_size:
+                raise IOError(f"Incomplete download ({downloaded} of {total_size} bytes)")
+        except Exception:
+            # Don't leave a truncated track behind, it would be skipped as "EXISTS" next time
+            output_path.unlink(missing_ok=True)
+            if controller.cancelled:
+                raise DownloadCancelled()
+            raise
+        finally:
+            controller.detach(response)
 
     def download_track(
         self,
         track_data: Dict[str, Any],
         output_dir: Path,
         quality: AudioQuality = "LOSSLESS",
-        progress_callback=None
+        progress_callback=None,
+        controller=None
     ) -> str:
         """Download a single track with metadata"""
+        output_path, download_url, file_ext = self.prepare_track(track_data, output_dir, quality)
+        if download_url is None:
+            return f"EXISTS:{output_path}"
+
+        self.download_file(download_url, output_path, progress_callback, controller)
+        print(f"[MONOCHROME] Download complete")
+        if progress_callback:
+            progress_callback(ProgressEvent(DownloadState.PROCESSING, "Adding cover art and tags...", progress=1.0))
+
+        return self.finish_track(track_data, output_path, file_ext)
+
+    def prepare_track(
+        self,
+        track_data: Dict[str, Any],
+        output_dir: Path,
+        quality: AudioQuality = "LOSSLESS"
+    ) -> Tuple[Path, Optional[str], str]:
+        """
+        Resolves the stream for a track. Returns (output_path, download_url, file_ext);
+        download_url is None when the file already exists.
+        """
         track_id = str(track_data["id"])
         track_title = track_data.get("title", "Unknown")
         print(f"[MONOCHROME] Starting download for track: {track_title} (ID: {track_id})")
@@ -398,7 +449,7 @@ class MonochromeDownloader:
         # Check if file already exists
         if output_path.exists():
             print(f"[MONOCHROME] File already exists, skipping download")
-            return f"EXISTS:{output_path}"
+            return output_path, None, file_ext
 
         # Download the audio file
         download_url = stream_data.get("url")
@@ -432,9 +483,10 @@ class MonochromeDownloader:
             raise Exception("No download URL available")
 
         print(f"[MONOCHROME] Downloading from: {download_url[:100]}...")
-        self.download_file(download_url, output_path, progress_callback)
-        print(f"[MONOCHROME] Download complete")
+        return output_path, download_url, file_ext
 
+    def finish_track(self, track_data: Dict[str, Any], output_path: Path, file_ext: str) -> str:
+        """Adds cover art and tags to a downloaded track"""
         # Download cover art
         cover_data = None
         if track_data.get("album", {}).get("cover"):
@@ -0,0 +1,164 @@
+# core/progress.py
+# Structured download progress. Workers emit ProgressEvents instead of
+# preformatted strings; the UI coalesces them per download and redraws at a
+# fixed frame rate (see ProgressAggregator).
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+class DownloadState(str, Enum):
+    QUEUED = "queued"
+    STARTING = "starting"  # resolving links, connecting, probing mirrors
+    DOWNLOADING = "downloading"
+    PAUSED = "paused"
+    PROCESSING = "processing"  # post-download work: merging, tagging, verifying
+    FINISHED = "finished"
+    STOPPED = "stopped"
+    ERROR = "error"
+
+    @property
+    def terminal(self) -> bool:
+        return self in (DownloadState.FINISHED, DownloadState.STOPPED, DownloadState.ERROR)
+
+
+def format_size(bytes_val):
+    """Convert bytes to human readable format"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if bytes_val < 1024.0:
+            return f"{bytes_val:.2f} {unit}"
+        bytes_val /= 1024.0
+    return f"{bytes_val:.2f} TB"
+
+
+def format_time(seconds):
+    """Convert seconds to human readable format"""
+    if seconds < 60:
+        return f"{int(seconds)}s"
+    elif seconds < 3600:
+        mins = int(seconds / 60)
+        secs = int(seconds % 60)
+        return f"{mins}m {secs}s"
+    else:
+        hours = int(seconds / 3600)
+        mins = int((seconds % 3600) / 60)
+        return f"{hours}h {mins}m"
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """
+    One progress update. done/total are bytes (total 0 = unknown), rate is
+    bytes/s and eta seconds. message carries status lines ("Resuming at ...",
+    errors); progress overrides done/total for work not measured in bytes.
+    """
+    state: DownloadState
+    message: str = ""
+    done: int = 0
+    total: int = 0
+    rate: float = 0.0
+    eta: Optional[float] = None
+    progress: Optional[float] = None
+
+    @property
+    def fraction(self) -> float:
+        if self.progress is not None:
+            return self.progress
+        if self.total > 0:
+            return min(self.done / self.total, 1.0)
+        return 1.0 if self.state == DownloadState.FINISHED else 0.0
+
+    @property
+    def text(self) -> str:
+        """The line shown under a download's progress bar."""
+        if self.message:
+            return self.message
+        if self.state == DownloadState.PAUSED:
+            if self.total > 0:
+                return f"Paused • {format_size(self.done)} / {format_size(self.total)}"
+            return "Paused"
+        if self.state != DownloadState.DOWNLOADING:
+            return ""
+        if self.total > 0:
+            eta = format_time(self.eta) if self.eta is not None else "calculating..."
+            return (
+                f"{format_size(self.done)} / {format_size(self.total)} "
+                f"({int(self.fraction * 100)}%) • "
+                f"{format_size(self.rate)}/s • "
+                f"ETA: {eta}"
+            )
+        return f"Downloaded {format_size(self.done)} • {format_size(self.rate)}/s"
+
+
+class ProgressTracker:
+    """
+    Turns raw byte counts into DOWNLOADING events: at most one every
+    INTERVAL seconds, with a moving-average rate and an ETA.
+    """
+
+    INTERVAL = 0.5  # seconds between events
+
+    def __init__(self, callback, total):
+        self.callback = callback
+        self.total = total
+        self.speed_samples = []  # For moving average
+        self.reset(0)
+
+    def reset(self, done):
+        """Restart speed measurement, e.g. after a pause."""
+        self.done = done
+        self.last_update_time = time.time()
+        self.last_done = done
+        self.speed_samples.clear()
+
+    def update(self, done):
+        self.done = done
+        current_time = time.time()
+        time_delta = current_time - self.last_update_time
+        if time_delta < self.INTERVAL:
+            return
+
+        # Moving average of the last 5 samples for a steadier rate and ETA
+        self.speed_samples.append((done - self.last_done) / time_delta)
+        if len(self.speed_samples) > 5:
+            self.speed_samples.pop(0)
+        rate = sum(self.speed_samples) / len(self.speed_samples)
+
+        eta = (self.total - done) / rate if self.total > 0 and rate > 0 else None
+        self.callback(ProgressEvent(DownloadState.DOWNLOADING, done=done, total=self.total, rate=rate, eta=eta))
+
+        self.last_update_time = current_time
+        self.last_done = done
+
+    def paused(self, done):
+        self.callback(ProgressEvent(DownloadState.PAUSED, done=done, total=self.total))
+
+
+class ProgressAggregator:
+    """
+    Thread-safe mailbox holding only the newest event per download. Workers
+    post() from any thread without touching Qt; the UI drain()s it on a timer,
+    so redraws happen at a fixed rate however many downloads are reporting.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def post(self, key, event):
+        with self._lock:
+            current = self._pending.get(key)
+            # A final state must not be overwritten by a late in-flight update
+            if current is not None and current.state.terminal and not event.state.terminal:
+                return
+            self._pending[key] = event
+
+    def drain(self):
+        """Returns {key: newest event} posted since the last drain."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
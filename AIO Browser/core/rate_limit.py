@@ -0,0 +1,91 @@
+# core/rate_limit.py
+# Token-bucket bandwidth limiting shared by all download paths.
+import threading
+import time
+
+# How much unused bandwidth may be saved up, in seconds of the current rate
+BURST_SECONDS = 0.5
+# Upper bound on a single sleep so rate changes and cancels apply quickly
+MAX_WAIT = 0.25
+
+
+class TokenBucket:
+    """
+    Classic token bucket measured in bytes. rate == 0 means unlimited.
+    set_rate() can be called at any time; waiting consumers pick it up
+    immediately.
+    """
+
+    def __init__(self, rate=0):
+        self._cond = threading.Condition()
+        self._rate = 0
+        self._tokens = 0.0
+        self._stamp = time.monotonic()
+        self.set_rate(rate)
+
+    @property
+    def rate(self):
+        return self._rate
+
+    @property
+    def capacity(self):
+        return max(self._rate * BURST_SECONDS, 1.0)
+
+    def set_rate(self, rate):
+        """Sets the limit in bytes per second (0 or None disables it)."""
+        with self._cond:
+            self._refill()
+            self._rate = max(0, int(rate or 0))
+            self._tokens = min(self._tokens, self.capacity)
+            self._cond.notify_all()
+
+    def _refill(self):
+        now = time.monotonic()
+        if self._rate:
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self._rate)
+        self._stamp = now
+
+    def consume(self, amount, cancelled=None):
+        """
+        Blocks until amount bytes may pass. Chunks larger than the bucket are
+        let through once it is full and paid back as debt by later callers.
+        Returns False if cancelled() became true while waiting.
+        """
+        with self._cond:
+            while True:
+                if not self._rate:
+                    return True
+                self._refill()
+                needed = min(amount, self.capacity)
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return True
+                if cancelled and cancelled():
+                    return False
+                self._cond.wait(min((needed - self._tokens) / self._rate, MAX_WAIT))
+
+    def reserve(self, amount):
+        """
+        Non-blocking variant for asyncio callers: takes amount bytes (possibly
+        going into debt) and returns how many seconds to wait before using
+        them. reserve(0) re-reads the remaining wait after a rate change.
+        """
+        with self._cond:
+            if not self._rate:
+                self._tokens = 0.0
+                return 0.0
+            self._refill()
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self._rate)
+
+
+# Shared by every download; configured from the "max_download_speed" setting
+global_limiter = TokenBucket()
+
+
+def kb_to_rate(kb_per_sec):
+    """Settings store KB/s; the buckets work in bytes."""
+    try:
+        return max(0, int(kb_per_sec or 0)) * 1024
+    except (TypeError, ValueError):
+        return 0
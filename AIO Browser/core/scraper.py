@@ -1,11 +1,19 @@
 # Web scraping module. Implements searching for AnkerGames (Direct) and FitGirl Repacks (Torrents).
 import requests
-from bs4 import BeautifulSoup
 import json
 import html as html_lib
+import asyncio
 import re
+import threading
+import time
 from urllib.parse import quote, unquote
 
+from core import async_scraper
+from core.catalog import catalog
+from core.html_parse import ARTICLES, CSRF_META, ENTRY_CONTENT, MAGNET_LINKS, REDIRECT_TAGS, make_soup
+from core.http_cache import cache
+from core.http_session import POOL_SIZE, guard
+
 # =========================================================================
 # CONFIGURATION & CONSTANTS
 # =========================================================================
@@ -15,16 +23,71 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
+# One kept-alive connection per enrichment worker (see core.http_session)
+FITGIRL_WORKERS = POOL_SIZE
+
+# How long pages are reused from the disk cache before being revalidated
+SEARCH_TTL = 10 * 60
+PAGE_TTL = 24 * 60 * 60  # article/game pages rarely change
+
+def _get_page(url, headers=HEADERS, ttl=SEARCH_TTL, timeout=10, cancelled=None):
+    """
+    GET a page through the disk cache: on the asyncio scraping core when
+    aiohttp is installed (cancelled() turning true cancels it), else on the
+    pooled session.
+    """
+    if async_scraper.available():
+        return async_scraper.get(url, cancelled, headers=headers, ttl=ttl, timeout=timeout)
+    return cache.get(url, headers=headers, timeout=timeout, ttl=ttl)
+
+def _recorded(source, results):
+    """Passes results through and adds them to the local catalog when the search ends."""
+    found = []
+    try:
+        for game in results:
+            found.append(game)
+            yield game
+    finally:
+        catalog.upsert(source, found)
+
 # =========================================================================
 # FITGIRL MODULE (TORRENTS)
 # =========================================================================
+def _fitgirl_search_url(query):
+    return f"https://fitgirl-repacks.site/?s={query}"
+
 def search_fitgirl(query):
     # 1. Get basic results from search page
-    initial_results = scrape_search_results(f"https://fitgirl-repacks.site/?s={query}", "FitGirl")
+    initial_results = scrape_search_results(_fitgirl_search_url(query), "FitGirl")
 
     # 2. Enrich with images and magnets (in parallel)
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_game = {executor.submit(enrich_fitgirl_game, game): game for game in initial_results}
+    for _ in _recorded("FitGirl", _enrich_fitgirl(initial_results)):
+        pass
+
+    # 3. FILTER: Only keep results that have a magnet link
+    games_only = [game for game in initial_results if game.get('magnet')]
+
+    return games_only
+
+def iter_fitgirl(query, cancelled=None):
+    """
+    Yields FitGirl results one by one as soon as each game page has been
+    enriched, so the first card can be shown after the first article rather
+    than the slowest. Completion order, not search page order.
+    cancelled: returns True once the results are no longer wanted.
+    """
+    initial_results = scrape_search_results(_fitgirl_search_url(query), "FitGirl", cancelled)
+    yield from _recorded("FitGirl", _enrich_fitgirl(initial_results, cancelled))
+
+def _enrich_fitgirl(games, cancelled=None):
+    """Enriches games in parallel, yielding each one that has a magnet link as it completes."""
+    if async_scraper.available():
+        yield from async_scraper.iterate(_enrich_fitgirl_async(games), cancelled)
+        return
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=FITGIRL_WORKERS)
+    try:
+        future_to_game = {executor.submit(enrich_fitgirl_game, game): game for game in games}
         
         for future in concurrent.futures.as_completed(future_to_game):
             game = future_to_game[future]
@@ -36,39 +99,72 @@ def search_fitgirl(query):
             except Exception as e:
                 print(f"[DEBUG] Error enriching {game['title']}: {e}")
 
-    # 3. FILTER: Only keep results that have a magnet link
-    games_only = [game for game in initial_results if game.get('magnet')]
+            if game.get('magnet'):
+                yield game
+    finally:
+        # Closed early (the caller moved on to another search): skip pages not fetched yet
+        executor.shutdown(wait=False, cancel_futures=True)
 
-    return games_only
+async def _enrich_fitgirl_async(games):
+    """_enrich_fitgirl on the asyncio core: every game page is a task, not a thread."""
+    tasks = [asyncio.create_task(_enrich_fitgirl_game_async(game)) for game in games]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            game = await next_done
+            if game.get('magnet'):
+                yield game
+    finally:
+        # Closed or cancelled early: drop the pages still being fetched
+        for task in tasks:
+            task.cancel()
+
+async def _enrich_fitgirl_game_async(game):
+    try:
+        resp = await async_scraper.fetch(game['link'], headers=HEADERS, ttl=PAGE_TTL, timeout=5)
+        if resp.status_code == 200:
+            # Parsed off the loop so downloads sharing it keep flowing
+            data = await async_scraper.in_worker(_parse_fitgirl_game, resp.text)
+            game['image'] = data.get('image')
+            game['magnet'] = data.get('magnet')
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"[DEBUG] Error enriching {game['title']}: {e}")
+    return game
 
 def enrich_fitgirl_game(game):
     data = {"image": None, "magnet": None}
     try:
-        resp = requests.get(game['link'], headers=HEADERS, timeout=5)
+        resp = cache.get(game['link'], headers=HEADERS, timeout=5, ttl=PAGE_TTL)
         if resp.status_code == 200:
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            
-            # 1. Look for Image
-            content = soup.find(class_='entry-content')
-            if content:
-                img = content.find('img')
-                if img:
-                    data['image'] = img.get('data-src') or img.get('src')
-                
-                # 2. Look for Magnet Link
-                magnet = content.find('a', href=lambda h: h and h.startswith('magnet:?'))
-                if magnet:
-                    data['magnet'] = magnet['href']
+            data = _parse_fitgirl_game(resp.text)
     except:
         pass
     return data
 
-def scrape_search_results(url, source):
+def _parse_fitgirl_game(html_content):
+    data = {"image": None, "magnet": None}
+    soup = make_soup(html_content, ENTRY_CONTENT)
+    
+    # 1. Look for Image
+    content = soup.find(class_='entry-content')
+    if content:
+        img = content.find('img')
+        if img:
+            data['image'] = img.get('data-src') or img.get('src')
+        
+        # 2. Look for Magnet Link
+        magnet = content.find('a', href=lambda h: h and h.startswith('magnet:?'))
+        if magnet:
+            data['magnet'] = magnet['href']
+    return data
+
+def scrape_search_results(url, source, cancelled=None):
     results = []
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
+        resp = _get_page(url, cancelled=cancelled)
         if resp.status_code == 200:
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            soup = make_soup(resp.text, ARTICLES)
             articles = soup.find_all('article')
             for article in articles:
                 title_tag = article.find(class_="entry-title")
@@ -86,9 +182,9 @@ def scrape_search_results(url, source):
 
 def scrape_magnet(url):
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
+        resp = cache.get(url, headers=HEADERS, timeout=10, ttl=PAGE_TTL)
         if resp.status_code == 200:
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            soup = make_soup(resp.text, MAGNET_LINKS)
             magnet = soup.find('a', href=lambda href: href and href.startswith("magnet:"))
             if magnet:
                 return magnet['href']
@@ -99,6 +195,165 @@ def scrape_magnet(url):
 # =========================================================================
 # ANKERGAMES MODULE (DIRECT)
 # =========================================================================
+# Download link candidates on an intermediate page. Every candidate except
+# the Alpine variable and x-data contains "http", so one pass over the
+# occurrences of "http" finds them: each is classified as a dlproxy URL, a
+# quoted archive URL and/or a JS redirect target from the text around it.
+# The prefixes of the JS redirects, in rank order (quote follows)
+_JS_REDIRECT_PREFIX_RE = re.compile(
+    r'(?:(?P<js0>window\.location\.href\s*=)|(?P<js1>window\.location\s*=)|(?P<js2>location\.href\s*=)'
+    r'|(?P<js3>location\.replace\s*\()|(?P<js4>window\.open\s*\()|(?P<js5>var\s+downloadUrl\s*=)'
+    r'|(?P<js6>let\s+downloadUrl\s*=)|(?P<js7>const\s+downloadUrl\s*=)|(?P<js8>var\s+url\s*=))'
+    r'\s*\Z'
+)
+_JS_PREFIX_WINDOW = 80  # characters looked back from a quote for a redirect prefix
+_JS_REPLACE_CLOSE_RE = re.compile(r'\s*\)')
+_URL_RE = re.compile(r'https?://[^\'"\s<>]+')
+_DLPROXY_RE = re.compile(r'https?://(?:[\w-]+\.)?dlproxy\.uk/[^\'"\s<>]+')
+_ARCHIVE_EXT_RE = re.compile(r'\.(?:zip|rar|7z|exe|iso)$', re.I)
+_ALPINE_RE = re.compile(r'downloadUrl\s*[:=]\s*["\'](.*?)["\']')
+_XDATA_RE = re.compile(r"x-data=\"downloadPage\('([^']+)'")
+_META_REFRESH_RE = re.compile(r'^refresh$', re.I)
+_DOWNLOAD_ID_RE = re.compile(r'download', re.I)
+_META_URL_RE = re.compile(r'url=', re.I)
+
+# Strategy ranks: links are tried in this order (meta refresh first)
+(RANK_META, RANK_JS, RANK_BUTTON, RANK_REVEAL, RANK_DLPROXY,
+ RANK_ARCHIVE, RANK_ALPINE, RANK_XDATA) = range(8)
+
+
+def _scan_http(html_content, ranked):
+    """Adds the JS redirect, dlproxy and archive candidates around every "http"."""
+    quoted_values = set()  # opening quotes of JS values already looked at
+    dlproxy_end = 0
+    pos = html_content.find("http")
+    while pos != -1:
+        # Deep scan: dlproxy URLs (not inside an earlier one)
+        if pos >= dlproxy_end:
+            match = _DLPROXY_RE.match(html_content, pos)
+            if match:
+                ranked.append((RANK_DLPROXY, 0, pos, match.group()))
+                dlproxy_end = match.end()
+
+        # Quoted string this "http" is in: from the last quote before it to the next one, on one line
+        start = max(html_content.rfind('"', 0, pos), html_content.rfind("'", 0, pos))
+        if start != -1 and start not in quoted_values:
+            quoted_values.add(start)
+            ends = [i for i in (html_content.find('"', pos), html_content.find("'", pos)) if i != -1]
+            end = min(ends) if ends else -1
+            value = html_content[start + 1:end] if end != -1 else ""
+            if value and "\n" not in value:
+                # Archive URL: the whole quoted string
+                if start == pos - 1:
+                    url = _URL_RE.match(html_content, pos)
+                    if (url and url.end() == end and _ARCHIVE_EXT_RE.search(url.group())
+                            and "assets" not in value and "jquery" not in value):
+                        ranked.append((RANK_ARCHIVE, 0, pos, value))
+                # JS redirect: the quote follows a redirect prefix
+                prefix = _JS_REDIRECT_PREFIX_RE.search(html_content, max(0, start - _JS_PREFIX_WINDOW), start)
+                if prefix and (prefix.lastgroup != "js3" or _JS_REPLACE_CLOSE_RE.match(html_content, end + 1)):
+                    ranked.append((RANK_JS, int(prefix.lastgroup[2:]), start, value))
+        pos = html_content.find("http", pos + 4)
+
+
+def extract_download_links(html_content, soup):
+    """
+    All download link candidates on an intermediate page, best first. soup
+    must hold at least the page's meta and a tags (html_parse.REDIRECT_TAGS).
+    """
+    ranked = []  # (rank, sub-rank, position, link)
+
+    # 1. Meta Refresh
+    meta_refresh = soup.find('meta', attrs={'http-equiv': _META_REFRESH_RE})
+    if meta_refresh:
+        content = meta_refresh.get('content', '')
+        if 'url=' in content.lower():
+            ranked.append((RANK_META, 0, 0, _META_URL_RE.split(content)[-1].strip()))
+
+    # 2, 5, 6. JS redirects, dlproxy deep scan, archive URLs
+    _scan_http(html_content, ranked)
+
+    # 7. Alpine variable (first assignment only)
+    dl_var = _ALPINE_RE.search(html_content)
+    if dl_var:
+        try:
+            curr = unquote(dl_var.group(1))
+            if "dlproxy" in curr or "http" in curr:
+                ranked.append((RANK_ALPINE, 0, dl_var.start(), curr))
+        except Exception:
+            pass
+
+    # 8. x-data hidden URL (User Provided Strategy)
+    for match in _XDATA_RE.finditer(html_content):
+        try:
+            decoded = unquote(match.group(1))
+            print(f"[DEBUG] Found x-data URL: {decoded}")
+            ranked.append((RANK_XDATA, 0, match.start(), decoded))
+        except Exception as e:
+            print(f"[DEBUG] Error parsing x-data: {e}")
+
+    # 3-4. Download buttons and reveal buttons, in one pass over the links
+    id_button = soup.find(id=_DOWNLOAD_ID_RE)
+    if id_button and id_button.name == 'a' and id_button.get('href'):
+        ranked.append((RANK_BUTTON, 0, 0, id_button['href']))
+    for position, a in enumerate(soup.find_all('a', href=True)):
+        href = a['href']
+        text = a.text.strip().lower()
+        if "download" in text or "click here" in text:
+            if "ankergames" not in href or "download" in href:
+                if href and href != "#" and not href.startswith("javascript"):
+                    ranked.append((RANK_BUTTON, 1, position, href))
+        if "dlproxy" in href and 'download-btn-reveal' in ' '.join(a.get('class', [])):
+            ranked.append((RANK_REVEAL, 0, position, href))
+
+    links = []
+    for *_, link in sorted(ranked, key=lambda item: item[:3]):
+        if link and link not in links:
+            links.append(link)
+    return links
+
+
+# Generated download URLs are short-lived, so resolved links are only kept a while
+RESOLVED_TTL = 30 * 60
+# Laravel sessions (and their CSRF token) last two hours by default; stay well inside
+CSRF_TTL = 60 * 60
+
+
+class ResolvedLinks:
+    """
+    Download links resolved per Anker game page, with the session that
+    resolved them (the links may depend on its cookies). Kept in memory for
+    ttl seconds so retries and re-downloads skip the resolution chain.
+    """
+
+    def __init__(self, ttl=RESOLVED_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}  # game page URL -> (links, filename, session, resolved at)
+
+    def get(self, game_page_url):
+        """Returns (links, filename, session), or None when unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(game_page_url)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[3] > self.ttl:
+                del self._entries[game_page_url]
+                return None
+            return entry[:3]
+
+    def put(self, game_page_url, links, filename, session):
+        with self._lock:
+            self._entries[game_page_url] = (list(links), filename, session, time.monotonic())
+
+    def invalidate(self, game_page_url):
+        with self._lock:
+            self._entries.pop(game_page_url, None)
+
+
+resolved_links = ResolvedLinks()
+
+
 class AnkerClient:
     def __init__(self):
         self.session = requests.Session()
@@ -108,16 +363,30 @@ class AnkerClient:
             "X-Requested-With": "XMLHttpRequest"
         })
         self.base_url = "https://ankergames.net"
+        # Page and API requests obey the host policy; downloads on this session go elsewhere
+        guard(self.session, self.base_url)
+        self._csrf = None  # (token, fetched at); valid for the whole session
+        self._game_ids = {}  # game page URL -> id for /generate-download-url
 
     def search(self, query):
+        return list(self.iter_search(query))
+
+    def iter_search(self, query, cancelled=None):
+        """Yields each game found on the Anker search page as it is parsed."""
+        yield from _recorded("AnkerGames", self._scrape_search(query, cancelled))
+
+    def _scrape_search(self, query, cancelled=None):
         clean_name = query.strip()
         search_url = f"{self.base_url}/search/{quote(clean_name)}"
         print(f"[DEBUG] Searching Anker: {search_url}")
         
-        results = []
         try:
-            resp = self.session.get(search_url)
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            if async_scraper.available():
+                resp = _get_page(search_url, dict(self.session.headers), timeout=20, cancelled=cancelled)
+            else:
+                resp = cache.get(search_url, session=self.session, ttl=SEARCH_TTL)
+            # Not strained: each result's image is looked up through the link's parent
+            soup = make_soup(resp.text)
             
             # AnkerGames usually lists results in a grid or list
             # We look for links that look like game pages
@@ -156,43 +425,29 @@ class AnkerClient:
                         # clean title
                         if not title: title = href.split('/')[-1].replace('-', ' ').title()
 
-                        results.append({
+                        yield {
                             "title": title,
                             "link": full_link,
                             "image": image_url,
                             "source": "AnkerGames"
-                        })
-            
-            return results
+                        }
         except Exception as e:
             print(f"[DEBUG] Anker Search Error: {e}")
-            return []
 
     def get_download_link(self, game_page_url):
         try:
-            print(f"[DEBUG] Fetching game page: {game_page_url}")
-            resp = self.session.get(game_page_url)
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            game_id, error = self._game_page_state(game_page_url)
+            if error: return None, error
+
+            resp_post = self._request_download_url(game_page_url, game_id)
+            if resp_post.status_code == 419 and self._csrf is not None:
+                # CSRF token expired with the server session: fetch the page again
+                print("[DEBUG] CSRF token rejected, refreshing")
+                self._csrf = None
+                game_id, error = self._game_page_state(game_page_url)
+                if error: return None, error
+                resp_post = self._request_download_url(game_page_url, game_id)
 
-            csrf_token = soup.find('meta', {'name': 'csrf-token'})
-            if csrf_token: csrf_token = csrf_token['content']
-            else: return None, "CSRF Token not found"
-
-            game_id_match = re.search(r'generateDownloadUrl\((\d+)\)', resp.text)
-            if not game_id_match: return None, "Game ID not found"
-            
-            game_id = game_id_match.group(1)
-            
-            post_url = f"{self.base_url}/generate-download-url/{game_id}"
-            payload = {"g-recaptcha-response": "development-mode"}
-            
-            self.session.headers.update({
-                "X-CSRF-TOKEN": csrf_token,
-                "Content-Type": "application/json",
-                "Referer": game_page_url
-            })
-            
-            resp_post = self.session.post(post_url, json=payload)
             if resp_post.status_code == 200:
                 data = resp_post.json()
                 if data.get('success') and data.get('download_url'):
@@ -203,10 +458,69 @@ class AnkerClient:
         except Exception as e:
             return None, str(e)
 
+    def _game_page_state(self, game_page_url):
+        """
+        Returns (game_id, error). The game page is only fetched when its id
+        is unknown or the session's CSRF token is older than CSRF_TTL.
+        """
+        game_id = self._game_ids.get(game_page_url)
+        if game_id and self._csrf and time.monotonic() - self._csrf[1] < CSRF_TTL:
+            return game_id, None
+
+        print(f"[DEBUG] Fetching game page: {game_page_url}")
+        # Not cached: the CSRF token belongs to this session's cookies
+        resp = self.session.get(game_page_url)
+        soup = make_soup(resp.text, CSRF_META)
+
+        csrf_token = soup.find('meta', {'name': 'csrf-token'})
+        if not csrf_token: return None, "CSRF Token not found"
+        self._csrf = (csrf_token['content'], time.monotonic())
+
+        game_id_match = re.search(r'generateDownloadUrl\((\d+)\)', resp.text)
+        if not game_id_match: return None, "Game ID not found"
+
+        self._game_ids[game_page_url] = game_id_match.group(1)
+        return self._game_ids[game_page_url], None
+
+    def _request_download_url(self, game_page_url, game_id):
+        post_url = f"{self.base_url}/generate-download-url/{game_id}"
+        payload = {"g-recaptcha-response": "development-mode"}
+        # Per request: prefetch and download threads share this session
+        headers = {
+            "X-CSRF-TOKEN": self._csrf[0],
+            "Content-Type": "application/json",
+            "Referer": game_page_url
+        }
+        return self.session.post(post_url, json=payload, headers=headers)
+
     # -------------------------------------------------------------------------
     # ANKER RESOLVER: Deep Link Extraction
     # -------------------------------------------------------------------------
     def resolve_final_link(self, url):
+        """Returns (url, filename) for the best candidate of resolve_all_links."""
+        links, filename = self.resolve_all_links(url)
+        return links[0], filename
+
+    def resolve_all_links(self, url):
+        """
+        Returns (links, filename). links holds every download URL found on an
+        intermediate page, most likely first (the order the strategies below
+        have always been tried in), so the downloader can race them as
+        mirrors. Always contains at least one URL.
+        """
+        links, filename, response = self.open_all_links(url)
+        if response is not None:
+            response.close()
+        return links, filename
+
+    def open_all_links(self, url):
+        """
+        resolve_all_links, returning (links, filename, response). When url
+        leads straight to the file, response is the open streamed GET of it,
+        so the download can continue on that connection (download_file's
+        response argument); the caller must close it otherwise. None for
+        intermediate pages.
+        """
         try:
             # Follow redirects first
             resp = self.session.get(url, stream=True, allow_redirects=True)
@@ -223,89 +537,21 @@ class AnkerClient:
                         filename = fnames[0].strip().strip('"').strip("'")
                         if "UTF-8''" in filename:
                             filename = filename.split("UTF-8''")[-1]
-                return final_url, filename
+                return [final_url], filename, resp
 
             # If HTML, scrape
             print(f"[DEBUG] Hit intermediate page: {final_url}")
             html_content = resp.text
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 1. Meta Refresh
-            meta_refresh = soup.find('meta', attrs={'http-equiv': re.compile(r'^refresh$', re.I)})
-            if meta_refresh:
-                content = meta_refresh.get('content', '')
-                if 'url=' in content.lower():
-                    redirect_url = re.split(r'url=', content, flags=re.I)[-1].strip()
-                    if redirect_url: return redirect_url, None
-
-            # 2. JS Redirects
-            patterns = [
-                r'window\.location\.href\s*=\s*["\'](.*?)["\']',
-                r'window\.location\s*=\s*["\'](.*?)["\']',
-                r'location\.href\s*=\s*["\'](.*?)["\']',
-                r'location\.replace\s*\(\s*["\'](.*?)["\']\s*\)',
-                r'window\.open\s*\(\s*["\'](.*?)["\']',
-                r'var\s+downloadUrl\s*=\s*["\'](.*?)["\']',
-                r'let\s+downloadUrl\s*=\s*["\'](.*?)["\']',
-                r'const\s+downloadUrl\s*=\s*["\'](.*?)["\']',
-                r'var\s+url\s*=\s*["\'](.*?)["\']'
-            ]
-            for p in patterns:
-                match = re.search(p, html_content)
-                if match and "http" in match.group(1):
-                    return match.group(1), None
-
-            # 3. Download Button
-            btn_id = soup.find(id=re.compile(r'download', re.I))
-            if btn_id and btn_id.name == 'a' and btn_id.get('href'): return btn_id['href'], None
-
-            for a in soup.find_all('a', href=True):
-                href = a['href']
-                text = a.text.strip().lower()
-                if "download" in text or "click here" in text:
-                     if "ankergames" not in href or "download" in href:
-                        if href and href != "#" and not href.startswith("javascript"):
-                            return href, None
-            
-            # 4. Reveal Button
-            reveal_btn = soup.find('a', class_=re.compile(r'download-btn-reveal'))
-            if reveal_btn and reveal_btn.get('href') and "dlproxy" in reveal_btn['href']:
-                return reveal_btn['href'], None
-
-            # 5. Deep Scan
-            deep = re.findall(r'(https?://(?:[\w-]+\.)?dlproxy\.uk/[^\'"\s<>]+)', html_content)
-            if deep: return deep[0], None
-
-            # 6. Archive Pattern
-            archive = re.findall(r'["\'](https?://.*?\.(?:zip|rar|7z|exe|iso))["\']', html_content, re.I)
-            if archive:
-                 for link in archive:
-                     if "assets" not in link and "jquery" not in link: return link, None
-
-            # 7. Alpine variable
-            dl_var = re.search(r'downloadUrl\s*[:=]\s*["\'](.*?)["\']', html_content)
-            if dl_var:
-                try:
-                    curr = unquote(dl_var.group(1))
-                    if "dlproxy" in curr or "http" in curr: return curr, None
-                except: pass
-
-            # 8. x-data hidden URL (User Provided Strategy)
-            x_data_match = re.search(r"x-data=\"downloadPage\('([^']+)'", html_content)
-            if x_data_match:
-                try:
-                    encoded_url = x_data_match.group(1)
-                    final_url = unquote(encoded_url)
-                    print(f"[DEBUG] Found x-data URL: {final_url}")
-                    return final_url, None
-                except Exception as e:
-                    print(f"[DEBUG] Error parsing x-data: {e}")
-
-            return final_url, None
+            soup = make_soup(html_content, REDIRECT_TAGS)
+            links = extract_download_links(html_content, soup)
+
+            if len(links) > 1:
+                print(f"[DEBUG] Found {len(links)} candidate links")
+            return links or [final_url], None, None
 
         except Exception as e:
             print(f"[DEBUG] Resolution failed: {e}")
-            return url, None
+            return [url], None, None
 
 
 # =========================================================================
@@ -336,20 +582,28 @@ def search_axekin(query, platform=None, page=1):
     Each returned item matches the UI's card shape:
       {title, link, image, source, size, platforms, page_url}
     """
+    return list(iter_axekin(query, platform, page))
+
+
+def iter_axekin(query, platform=None, page=1, cancelled=None):
+    """Like search_axekin, but yields each item as it is read from the page."""
+    yield from _recorded("Axekin", _scrape_axekin(query, platform, page, cancelled))
+
+
+def _scrape_axekin(query, platform, page, cancelled=None):
     clean_query = (query or "").strip()
     if not clean_query:
-        return []
+        return
 
     search_url = f"{AXEKIN_BASE_URL}/games?search={quote(clean_query)}&page={page}"
-    results = []
     try:
-        resp = requests.get(search_url, headers=HEADERS, timeout=10)
+        resp = _get_page(search_url, cancelled=cancelled)
         if resp.status_code != 200:
-            return []
+            return
 
         page_data = _parse_inertia_data_page(resp.text)
         if not page_data:
-            return []
+            return
 
         games = page_data.get("props", {}).get("data", []) or []
         desired_platform = (platform or "").strip().lower()
@@ -395,19 +649,15 @@ def search_axekin(query, platform=None, page=1):
                 label = (dl.get("label") or "").strip()
                 title = name if not label else f"{name} ({label})"
 
-                results.append(
-                    {
-                        "title": title,
-                        "link": link,
-                        "image": cover_url,
-                        "source": source,
-                        "size": file_size,
-                        "platforms": platforms,
-                        "page_url": page_url,
-                    }
-                )
+                yield {
+                    "title": title,
+                    "link": link,
+                    "image": cover_url,
+                    "source": source,
+                    "size": file_size,
+                    "platforms": platforms,
+                    "page_url": page_url,
+                }
 
     except Exception as e:
         print(f"[DEBUG] Error Axekin: {e}")
-
-    return results
@@ -116,14 +116,15 @@ def get_installed_games():
 
 def search_steam_games(query):
     """Search Steam storefront for games."""
-    import requests
-    from bs4 import BeautifulSoup
+    from bs4 import SoupStrainer
+    from core.html_parse import make_soup
+    from core.http_session import shared_session
     
     params = {"term": query, "count": 25, "start": 0, "category1": 998} # category1=998 is games
     try:
         url = "https://store.steampowered.com/search/results"
-        response = requests.get(url, params=params, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = shared_session().get(url, params=params, timeout=10)
+        soup = make_soup(response.text, SoupStrainer("a", class_="search_result_row"))
         
         results = []
         for row in soup.select("a.search_result_row"):
@@ -150,17 +151,18 @@ def fetch_dlcs(app_id):
     """
     Fetch DLC list for a given AppID with Steam Storefront and SteamDB fallback.
     """
-    import requests
     import json
     import re
-    
+    from core.http_session import shared_session
+
+    session = shared_session()
     print(f"[FETCH] Fetching DLCs for AppID: {app_id}...")
     dlcs = []
     
     # 1. Try Steam Storefront API (Official)
     try:
         url = f"https://store.steampowered.com/api/appdetails?appids={app_id}"
-        response = requests.get(url, timeout=10)
+        response = session.get(url, timeout=10)
         data = response.json()
         
         if str(app_id) in data and data[str(app_id)].get("success"):
@@ -175,7 +177,7 @@ def fetch_dlcs(app_id):
                 for i in range(0, len(dlc_ids), chunk_size):
                     chunk = dlc_ids[i:i + chunk_size]
                     resolve_url = f"https://store.steampowered.com/api/appdetails?appids={','.join(map(str, chunk))}&filters=basic"
-                    r_resp = requests.get(resolve_url, timeout=10).json()
+                    r_resp = session.get(resolve_url, timeout=10).json()
                     
                     for d_id in chunk:
                         sid = str(d_id)
@@ -192,12 +194,12 @@ def fetch_dlcs(app_id):
         try:
             steam_db_url = f"https://steamdb.info/app/{app_id}/dlc/"
             wayback_api = f"https://archive.org/wayback/available?url={steam_db_url}"
-            wb_resp = requests.get(wayback_api, timeout=10).json()
+            wb_resp = session.get(wayback_api, timeout=10).json()
             
             if "archived_snapshots" in wb_resp and "closest" in wb_resp["archived_snapshots"]:
                 raw_url = wb_resp["archived_snapshots"]["closest"]["url"].replace("/http", "id_/http")
                 print(f"[FETCH] Downloading SteamDB snapshot: {raw_url}")
-                content = requests.get(raw_url, timeout=15).text
+                content = session.get(raw_url, timeout=15).text
                 
                 # More robust regex for SteamDB AppID rows
                 # Looking for: <tr class="app" data-appid="XXXX"> ... <td>Name</td>
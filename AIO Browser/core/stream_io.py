@@ -0,0 +1,206 @@
+# core/stream_io.py
+# Low-overhead helpers for writing HTTP bodies to disk: file preallocation, a
+# reader with a throughput-adapted read size, and a background writer thread.
+import os
+import queue
+import threading
+import time
+
+MIN_CHUNK = 64 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+# Aim for reads that take roughly this long; faster reads grow the chunk size
+TARGET_READ_TIME = 0.05
+
+# Writer pool: at most WRITE_BUFFERS buffers may be waiting on the disk at once
+WRITE_BUFFERS = 8
+WRITE_BUFFER_SIZE = 2 * 1024 * 1024
+# fill() hands a buffer over after this long even if it isn't full yet
+FILL_TIME = 0.1
+
+
+def preallocate(f, size):
+    """
+    Reserves size bytes for an open file so the filesystem can lay it out in
+    one go. Uses posix_fallocate where available, otherwise truncate.
+    """
+    if size <= 0:
+        return
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+            return
+        except OSError:
+            pass  # e.g. filesystems without fallocate support
+    f.truncate(size)
+
+
+def body_length(response):
+    """
+    Bytes the body of a requests or aiohttp response yields when read, or 0
+    when unknown. A compressed body is decoded as it is read, so its
+    Content-Length doesn't count them.
+    """
+    if response.headers.get("Content-Encoding", "identity").lower() != "identity":
+        return 0
+    return int(response.headers.get("Content-Length", 0) or 0)
+
+
+class ChunkReader:
+    """
+    Reads a requests response body. For identity-encoded bodies readinto()
+    goes straight to the underlying http.client response, so no bytes object
+    is allocated per chunk; the read size doubles while reads return quickly
+    and halves when they stall. Compressed bodies are decoded through
+    iter_content() and copied in.
+
+    Iterating yields memoryviews into one internal buffer that are only valid
+    until the next iteration.
+    """
+
+    def __init__(self, response, min_chunk=MIN_CHUNK, max_chunk=MAX_CHUNK):
+        self.response = response
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.chunk_size = min_chunk
+
+        encoding = response.headers.get("Content-Encoding", "identity").lower()
+        fp = getattr(response.raw, "_fp", None)
+        if encoding in ("", "identity") and hasattr(fp, "readinto"):
+            self._readinto = fp.readinto
+            self._chunks = None
+        else:
+            self._readinto = None
+            self._chunks = response.iter_content(chunk_size=min_chunk)
+        self._pending = b""
+        self._buffer = None
+
+    def readinto(self, view):
+        """Fills up to chunk_size bytes of view; returns 0 at the end of the body."""
+        size = min(self.chunk_size, len(view))
+        if self._readinto is None:
+            return self._copy_decoded(view[:size])
+
+        started = time.perf_counter()
+        n = self._readinto(view[:size])
+        if n:
+            self._adapt(n, size, time.perf_counter() - started)
+        return n or 0
+
+    def fill(self, view, max_time=FILL_TIME):
+        """
+        Reads until view is full, the body ends or max_time has passed, so
+        writer buffers carry as much data as the connection delivers.
+        """
+        total = 0
+        deadline = time.perf_counter() + max_time
+        while total < len(view):
+            n = self.readinto(view[total:])
+            if not n:
+                break
+            total += n
+            if time.perf_counter() >= deadline:
+                break
+        return total
+
+    def __iter__(self):
+        if self._buffer is None:
+            self._buffer = memoryview(bytearray(self.max_chunk))
+        while True:
+            n = self.readinto(self._buffer)
+            if not n:
+                return
+            yield self._buffer[:n]
+
+    def _copy_decoded(self, view):
+        if not self._pending:
+            self._pending = next(self._chunks, b"")
+        n = min(len(view), len(self._pending))
+        view[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def _adapt(self, n, requested, elapsed):
+        if n == requested and elapsed < TARGET_READ_TIME / 2:
+            self.chunk_size = min(self.chunk_size * 2, self.max_chunk)
+        elif elapsed > TARGET_READ_TIME * 2:
+            self.chunk_size = max(self.chunk_size // 2, self.min_chunk)
+
+
+class BackgroundWriter:
+    """
+    Writes buffers to an open file on a dedicated thread so a slow disk
+    doesn't stall the socket reads. acquire() hands out one of a fixed pool of
+    reusable bytearrays and blocks while all of them are queued for writing,
+    which pushes back on the network side instead of buffering without bound.
+
+    The file should be opened unbuffered; only the writer thread touches it
+    until join() returns.
+    """
+
+    def __init__(self, f, buffers=WRITE_BUFFERS, buffer_size=WRITE_BUFFER_SIZE):
+        self.file = f
+        self.error = None
+        self.buffer_size = buffer_size
+        # Buffers are allocated lazily, so a fast disk only ever uses one or two
+        self._unallocated = buffers
+        self._lock = threading.Lock()
+        self._free = queue.Queue()
+        self._pending = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def acquire(self):
+        """Returns a free buffer, waiting for the writer if none is left."""
+        if self.error is not None:
+            raise self.error
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            allocate = self._unallocated > 0
+            if allocate:
+                self._unallocated -= 1
+        if allocate:
+            return bytearray(self.buffer_size)
+        return self._free.get()
+
+    def release(self, buffer):
+        """Gives back a buffer that ended up not being submitted."""
+        self._free.put(buffer)
+
+    def submit(self, buffer, length, offset=None, on_written=None):
+        """
+        Queues buffer[:length] to be written at offset (or the current file
+        position). on_written(length) runs on the writer thread once the data
+        has reached the OS.
+        """
+        self._pending.put((buffer, length, offset, on_written))
+
+    def join(self):
+        """Waits for every queued write, stops the thread and re-raises a write error."""
+        self._pending.put(None)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            buffer, length, offset, on_written = item
+            try:
+                # After a failure keep draining so producers never block forever
+                if self.error is None:
+                    if offset is not None:
+                        self.file.seek(offset)
+                    view = memoryview(buffer)[:length]
+                    while view:
+                        view = view[self.file.write(view):]
+                    if on_written:
+                        on_written(length)
+            except Exception as e:
+                self.error = e
+            finally:
+                self._free.put(buffer)
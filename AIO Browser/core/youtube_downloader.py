@@ -3,6 +3,9 @@ import threading
 import time
 from pathlib import Path
 
+from core.download_control import DownloadController
+from core.progress import DownloadState, ProgressEvent
+
 try:
     import yt_dlp
 except ImportError:
@@ -16,38 +19,32 @@ class YoutubeDownloader:
 
     def __init__(self, progress_callback=None):
         """
-        :param progress_callback: A function that accepts (status_text, progress_float)
+        :param progress_callback: A function that accepts a core.progress.ProgressEvent
         """
         self.progress_callback = progress_callback
-        self.is_cancelled = False
+        self.controller = DownloadController()
 
     def _progress_hook(self, d):
-        if self.is_cancelled:
+        # Blocks inside yt-dlp's download loop while paused
+        if not self.controller.wait_while_paused():
             raise Exception("DOWNLOAD_STOPPED")
 
+        if not self.progress_callback:
+            return
+
         if d["status"] == "downloading":
-            p = d.get("_percent_str", "0%").replace("%", "")
-            try:
-                progress_float = float(p) / 100.0
-            except:
-                progress_float = 0.0
-
-            speed = d.get("_speed_str", "N/A")
-            eta = d.get("_eta_str", "N/A")
-            downloaded = d.get("_downloaded_bytes_str", "N/A")
-            total = d.get("_total_bytes_str", d.get("_total_bytes_estimate_str", "N/A"))
-
-            status_text = (
-                f"Downloading: {downloaded}/{total} ({p}%) • {speed} • ETA: {eta}"
-            )
-            if self.progress_callback:
-                self.progress_callback(status_text, progress_float)
+            self.progress_callback(ProgressEvent(
+                DownloadState.DOWNLOADING,
+                done=int(d.get("downloaded_bytes") or 0),
+                total=int(d.get("total_bytes") or d.get("total_bytes_estimate") or 0),
+                rate=float(d.get("speed") or 0),
+                eta=d.get("eta"),
+            ))
 
         elif d["status"] == "finished":
-            if self.progress_callback:
-                self.progress_callback("Processing / Finalizing...", 0.95)
+            self.progress_callback(ProgressEvent(DownloadState.PROCESSING, "Processing / Finalizing...", progress=0.95))
 
-    def download(self, url, save_path, mode="video", quality="Best Available"):
+    def download(self, url, save_path, mode="video", quality="Best Available", controller=None):
         """
         Downloads a video or audio from YouTube.
 
@@ -55,9 +52,10 @@ class YoutubeDownloader:
         :param save_path: Directory to save the file
         :param mode: 'video' or 'audio'
         :param quality: Resolution (e.g. '1080p') or bitrate (e.g. '320kbps')
+        :param controller: Optional DownloadController used to pause/cancel
         :return: 'SUCCESS', 'STOPPED', or 'ERROR: message'
         """
-        self.is_cancelled = False
+        self.controller = controller or DownloadController()
 
         # Ensure directory exists
         if not os.path.exists(save_path):
@@ -121,28 +119,28 @@ class YoutubeDownloader:
 
         try:
             if self.progress_callback:
-                self.progress_callback("Fetching video information...", 0.05)
+                self.progress_callback(ProgressEvent(DownloadState.STARTING, "Fetching video information...", progress=0.05))
 
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
 
             if self.progress_callback:
-                self.progress_callback("Download Complete!", 1.0)
+                self.progress_callback(ProgressEvent(DownloadState.FINISHED, "Download Complete!"))
             return "SUCCESS"
 
         except Exception as e:
             error_msg = str(e)
             if "DOWNLOAD_STOPPED" in error_msg:
                 if self.progress_callback:
-                    self.progress_callback("Download Stopped.", 0)
+                    self.progress_callback(ProgressEvent(DownloadState.STOPPED, "Download Stopped."))
                 return "STOPPED"
 
             if self.progress_callback:
-                self.progress_callback(f"Error: {error_msg}", 0)
+                self.progress_callback(ProgressEvent(DownloadState.ERROR, f"Error: {error_msg}"))
             return f"ERROR: {error_msg}"
 
     def cancel(self):
-        self.is_cancelled = True
+        self.controller.cancel()
 
 
 def get_video_info(url):
@@ -1,7 +1,10 @@
 # main_pyqt.py
 # Entry point for PyQt6 application
+import multiprocessing
 import sys
 from ui.core.main_window import main
 
 if __name__ == "__main__":
+    # Archive extraction runs in worker processes; needed for packaged builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Benchmark for the background download writer: socket reads and disk writes
+on one thread vs. core.stream_io.BackgroundWriter, against a deliberately
+slow sink (a file whose writes sleep to emulate a USB drive that stalls
+while it flushes its cache).
+
+The server runs in a separate process and sends at most --net-mbps with a
+small socket buffer. Time it spends blocked is lost, as with a real link
+whose TCP window collapses. Usage (from "AIO Browser"):
+
+    python tests/bench_background_writer.py --size-mb 256 --net-mbps 80
+"""
+import argparse
+import http.server
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.stream_io import BackgroundWriter, ChunkReader  # noqa: E402
+
+BLOCK_SIZE = 64 * 1024
+SOCKET_BUFFER = 256 * 1024
+
+
+def _serve(size, net_rate, port_queue):
+    block = os.urandom(BLOCK_SIZE)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+            sent = 0
+            next_send = time.perf_counter()
+            try:
+                while sent < size:
+                    chunk = block[: size - sent]
+                    self.wfile.write(chunk)
+                    sent += len(chunk)
+                    # Never faster than net_rate; time lost while blocked isn't made up
+                    next_send = max(next_send + len(chunk) / net_rate, time.perf_counter())
+                    delay = next_send - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+            except OSError:
+                pass
+
+    class Server(http.server.ThreadingHTTPServer):
+        def server_bind(self):
+            # Keep the kernel from buffering megabytes on loopback
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER)
+            super().server_bind()
+
+    server = Server(("127.0.0.1", 0), Handler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class SlowFile:
+    """
+    Unbuffered file wrapper whose writes take len / rate seconds and which
+    stalls for stall seconds after every stall_every bytes.
+    """
+
+    def __init__(self, path, rate, stall, stall_every=32 * 1024 * 1024):
+        self._file = open(path, "wb", buffering=0)
+        self.rate = rate
+        self.stall = stall
+        self.stall_every = stall_every
+        self._since_stall = 0
+
+    def write(self, data):
+        time.sleep(len(data) / self.rate)
+        self._since_stall += len(data)
+        if self._since_stall >= self.stall_every:
+            self._since_stall = 0
+            time.sleep(self.stall)
+        return self._file.write(data)
+
+    def seek(self, offset):
+        return self._file.seek(offset)
+
+    def close(self):
+        self._file.close()
+
+
+def inline_writer(url, sink):
+    with requests.get(url, stream=True) as r:
+        for chunk in ChunkReader(r):
+            sink.write(chunk)
+
+
+def background_writer(url, sink):
+    with requests.get(url, stream=True) as r:
+        reader = ChunkReader(r)
+        writer = BackgroundWriter(sink)
+        try:
+            while True:
+                buffer = writer.acquire()
+                n = reader.fill(memoryview(buffer))
+                if not n:
+                    writer.release(buffer)
+                    break
+                writer.submit(buffer, n)
+        finally:
+            writer.join()
+
+
+WRITERS = [
+    ("read + write on one thread", inline_writer),
+    ("BackgroundWriter", background_writer),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--net-mbps", type=float, default=80, help="server speed in MB/s")
+    parser.add_argument("--disk-mbps", type=float, default=200, help="sink speed in MB/s")
+    parser.add_argument("--stall", type=float, default=0.15, help="sink stall per 32 MB in seconds")
+    args = parser.parse_args()
+    size = args.size_mb * 1024 * 1024
+    mb = 1024 * 1024
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=_serve, args=(size, args.net_mbps * mb, port_queue), daemon=True
+    )
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}/bench.bin"
+
+    disk_time = args.size_mb / args.disk_mbps + args.size_mb / 32 * args.stall
+    ideal = max(args.size_mb / args.net_mbps, disk_time)
+    print(f"{args.size_mb} MB, network {args.net_mbps:g} MB/s, disk {args.disk_mbps:g} MB/s "
+          f"+ {args.stall:g} s stall per 32 MB (ideal {ideal:.1f} s)")
+    print(f"{'writer':30} {'seconds':>8} {'MB/s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.bin")
+        for name, writer in WRITERS:
+            sink = SlowFile(path, args.disk_mbps * mb, args.stall)
+            started = time.perf_counter()
+            try:
+                writer(url, sink)
+            finally:
+                sink.close()
+            elapsed = time.perf_counter() - started
+            assert os.path.getsize(path) == size
+            os.remove(path)
+            print(f"{name:30} {elapsed:8.1f} {args.size_mb / elapsed:8.1f}")
+
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
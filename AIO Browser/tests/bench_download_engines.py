@@ -0,0 +1,146 @@
+"""
+Benchmark for the two download engines: one OS thread per download
+(core.downloader) vs. one asyncio loop for all of them (core.async_engine),
+with many concurrent small transfers against a local HTTP server.
+
+Each engine runs in its own process so peak threads and memory don't mix.
+Needs aiohttp. Usage (from the "AIO Browser" folder):
+
+    python tests/bench_download_engines.py --transfers 200 --size-kb 256
+"""
+import argparse
+import http.server
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _serve(size, port_queue):
+    body = os.urandom(size)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except OSError:
+                pass
+
+    class Server(http.server.ThreadingHTTPServer):
+        request_queue_size = 512
+
+    server = Server(("127.0.0.1", 0), Handler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def _run_threads(url, folders):
+    from core import downloader
+    from core.download_control import DownloadController
+
+    results = []
+
+    def worker(folder):
+        results.append(downloader.download_file(url, folder, lambda *a: None, DownloadController(), connections=1))
+
+    workers = [threading.Thread(target=worker, args=(folder,)) for folder in folders]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return results
+
+
+def _run_asyncio(url, folders):
+    import asyncio
+
+    from core import async_engine
+    from core.download_control import DownloadController
+
+    async def run_all():
+        return await asyncio.gather(*(
+            async_engine.download_file_async(url, folder, lambda *a: None, DownloadController())
+            for folder in folders
+        ))
+
+    try:
+        return async_engine.submit(run_all()).result()
+    finally:
+        async_engine.close()
+
+
+ENGINES = [
+    ("threads (download_file)", _run_threads),
+    ("asyncio (download_file_async)", _run_asyncio),
+]
+
+
+def _measure(engine_index, url, transfers, result_queue):
+    name, run = ENGINES[engine_index]
+    peak_threads = 0
+    sampling = True
+
+    def sample():
+        nonlocal peak_threads
+        while sampling:
+            peak_threads = max(peak_threads, threading.active_count() - 1)
+            time.sleep(0.005)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folders = [os.path.join(tmp, str(i)) for i in range(transfers)]
+        for folder in folders:
+            os.makedirs(folder)
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        cpu, wall = time.process_time(), time.perf_counter()
+        results = run(url, folders)
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        sampling = False
+
+    ok = sum(1 for r in results if r.startswith("SUCCESS"))
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    result_queue.put((name, ok, wall, cpu, peak_threads, rss_mb))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--transfers", type=int, default=200)
+    parser.add_argument("--size-kb", type=int, default=256)
+    args = parser.parse_args()
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve, args=(args.size_kb * 1024, port_queue), daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}/track.flac"
+
+    print(f"{args.transfers} concurrent transfers of {args.size_kb} KB")
+    print(f"{'engine':32} {'ok':>5} {'wall s':>8} {'CPU s':>8} {'threads':>8} {'max RSS MB':>11}")
+    result_queue = multiprocessing.Queue()
+    for index in range(len(ENGINES)):
+        child = multiprocessing.Process(target=_measure, args=(index, url, args.transfers, result_queue))
+        child.start()
+        name, ok, wall, cpu, threads, rss = result_queue.get()
+        child.join()
+        print(f"{name:32} {ok:5d} {wall:8.2f} {cpu:8.2f} {threads:8d} {rss:11.1f}")
+
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
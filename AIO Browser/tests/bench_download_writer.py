@@ -0,0 +1,119 @@
+"""
+Benchmark for the download writer: CPU time per GB of the old fixed-size
+iter_content loops vs. preallocation + adaptive readinto (core.stream_io).
+
+Runs a local HTTP server in a separate process so only the client side is
+measured. Usage (from the "AIO Browser" folder):
+
+    python tests/bench_download_writer.py --size-mb 1024
+"""
+import argparse
+import http.server
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import downloader  # noqa: E402
+from core.download_control import DownloadController  # noqa: E402
+from core.stream_io import ChunkReader, preallocate  # noqa: E402
+
+BLOCK = os.urandom(1024 * 1024)
+
+
+def _serve(size, port_queue):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+            sent = 0
+            try:
+                while sent < size:
+                    block = BLOCK[: size - sent]
+                    self.wfile.write(block)
+                    sent += len(block)
+            except OSError:
+                pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+# -------------------------------------------------------------------------
+# Writers
+# -------------------------------------------------------------------------
+def legacy_writer(chunk_size):
+    def run(url, path):
+        with requests.get(url, stream=True) as r, open(path, "wb") as f:
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    f.write(chunk)
+    return run
+
+
+def stream_io_writer(url, path):
+    with requests.get(url, stream=True) as r, open(path, "wb") as f:
+        preallocate(f, int(r.headers.get("content-length", 0)))
+        for chunk in ChunkReader(r):
+            f.write(chunk)
+
+
+def download_file_writer(url, path):
+    result = downloader.download_file(url, path, lambda *a: None, DownloadController(), connections=1)
+    assert result.startswith("SUCCESS"), result
+
+
+WRITERS = [
+    ("iter_content 8 KB (old Monochrome)", legacy_writer(8192)),
+    ("iter_content 64 KB (old download_file)", legacy_writer(65536)),
+    ("preallocate + readinto", stream_io_writer),
+    ("download_file (single stream)", download_file_writer),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    size = args.size_mb * 1024 * 1024
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve, args=(size, port_queue), daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}/bench.bin"
+
+    print(f"{args.size_mb} MB per run, best of {args.runs}")
+    print(f"{'writer':40} {'CPU s/GB':>10} {'MB/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.bin")
+        for name, writer in WRITERS:
+            best_cpu = best_wall = float("inf")
+            for _ in range(args.runs):
+                cpu, wall = time.process_time(), time.perf_counter()
+                writer(url, path)
+                best_cpu = min(best_cpu, time.process_time() - cpu)
+                best_wall = min(best_wall, time.perf_counter() - wall)
+                assert os.path.getsize(path) == size
+                os.remove(path)
+            gb = size / 1024 ** 3
+            print(f"{name:40} {best_cpu / gb:10.2f} {args.size_mb / best_wall:10.0f}")
+
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark for scraper page parsing: a full html.parser tree (what the
+scrapers used to build) vs. core.html_parse with and without a SoupStrainer,
+for each tree builder that is installed.
+
+Runs over saved pages: pass --fixtures with a folder holding any of
+fitgirl_search.html, fitgirl_game.html, anker_search.html and
+anker_download.html (save them from a browser). Pages that are missing are
+replaced by generated ones shaped like the real sites (WordPress theme with
+inline scripts, sidebars and comments; Tailwind/Alpine grid). Usage (from the
+"AIO Browser" folder):
+
+    python tests/bench_html_parse.py --fixtures path/to/pages --repeat 20
+"""
+import argparse
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import html_parse  # noqa: E402
+
+
+def _wordpress_page(body, title):
+    head = "".join(
+        f'<link rel="stylesheet" href="https://example.org/wp-content/plugins/p{i}/style.css?ver=6.{i}" media="all">\n'
+        f'<script src="https://example.org/wp-includes/js/s{i}.min.js?ver=3.{i}"></script>\n'
+        for i in range(30)
+    )
+    head += "<style>" + "".join(f".c{i}{{margin:{i}px;padding:{i}px}}" for i in range(1500)) + "</style>"
+    head += "<script>var wpData = " + repr({f"k{i}": "v" * 40 for i in range(300)}) + ";</script>"
+    nav = "<ul class='menu'>" + "".join(f"<li><a href='/cat/{i}/'>Category {i}</a></li>" for i in range(60)) + "</ul>"
+    sidebar = "".join(
+        f"<section class='widget'><h2>Widget {w}</h2><ul>"
+        + "".join(f"<li><a href='/post-{w}-{i}/'>Recent post {w}.{i}</a> <span>Jan {i}</span></li>" for i in range(25))
+        + "</ul></section>"
+        for w in range(6)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>{title}</title>{head}</head><body class='home blog'>"
+        f"<header id='masthead'><nav>{nav}</nav></header><div id='content'><main id='main'>{body}</main>"
+        f"<aside id='secondary'>{sidebar}</aside></div><footer><p>Footer</p>{nav}</footer></body></html>"
+    )
+
+
+def _fitgirl_search():
+    articles = "".join(
+        f"<article id='post-{i}' class='post type-post'><header class='entry-header'>"
+        f"<h1 class='entry-title'><a href='https://fitgirl-repacks.site/game-{i}/' rel='bookmark'>Game {i} – v1.{i} + {i} DLCs</a></h1>"
+        f"<div class='entry-meta'><span class='posted-on'>Posted on <time>Jan {i}</time></span></div></header>"
+        f"<div class='entry-summary'><p>{'Summary text. ' * 40}</p></div></article>"
+        for i in range(10)
+    )
+    return _wordpress_page(articles, "Search results")
+
+
+def _fitgirl_game():
+    content = (
+        "<div class='entry-content'><h3>#1234 Game – v1.0 + DLC</h3>"
+        "<p><a href='https://example.org/cover.jpg'><img class='alignleft' src='https://example.org/cover.jpg' width='200'></a>"
+        "Genres/Tags: Action, RPG<br>Companies: Studio<br>Languages: ENG/MULTI10<br>Original Size: 50 GB<br>Repack Size: 20 GB</p>"
+        "<h3>Download Mirrors</h3><ul>"
+        + "".join(f"<li><a href='https://mirror{i}.example.org/file' target='_blank'>Mirror {i}</a></li>" for i in range(8))
+        + "<li><a href='magnet:?xt=urn:btih:0123456789abcdef&dn=Game'>magnet</a></li></ul>"
+        + "<h3>Screenshots</h3><p>"
+        + "".join(f"<a href='https://example.org/s{i}.jpg'><img src='https://example.org/s{i}_t.jpg'></a>" for i in range(12))
+        + "</p><h3>Repack Features</h3><ul>" + "".join(f"<li>Feature {i}</li>" for i in range(20)) + "</ul>"
+        + "<div class='su-spoiler'><div class='su-spoiler-content'>" + "<p>Selective download file list</p>" * 40 + "</div></div></div>"
+    )
+    comments = "<ol class='comment-list'>" + "".join(
+        f"<li class='comment'><article class='comment-body'><footer class='comment-meta'><b class='fn'>User {i}</b>"
+        f"<time>Jan {i % 28}</time></footer><div class='comment-content'><p>{'Thanks for the repack! ' * 8}</p></div>"
+        f"<div class='reply'><a class='comment-reply-link' href='?replytocom={i}#respond'>Reply</a></div></article></li>"
+        for i in range(150)
+    ) + "</ol>"
+    return _wordpress_page(f"<article id='post-1' class='post'>{content}</article><div id='comments'>{comments}</div>", "Game")
+
+
+def _anker_search():
+    head = "".join(f"<script src='/build/assets/app{i}.js' defer></script>" for i in range(15))
+    head += "<script>window.__ziggy = " + repr({f"route{i}": f"/r/{i}/" for i in range(400)}) + ";</script>"
+    cards = "".join(
+        f"<div class='relative group rounded-xl overflow-hidden bg-gray-900' x-data='{{hover: false}}'>"
+        f"<img class='w-full h-48 object-cover' data-src='/storage/covers/game-{i}.webp' alt=''>"
+        f"<div class='p-3'><span class='text-xs'>Action, RPG</span><span class='text-xs'>{i} GB</span></div>"
+        f"<a href='/game/game-{i}' aria-label='Game {i} view details' class='absolute inset-0'></a></div>"
+        for i in range(48)
+    )
+    nav = "".join(f"<a href='/genre/{i}' class='px-2'>Genre {i}</a>" for i in range(40))
+    return (
+        f"<!DOCTYPE html><html><head><meta name='csrf-token' content='abc'>{head}</head><body>"
+        f"<nav>{nav}</nav><main><div class='grid grid-cols-6 gap-4'>{cards}</div></main><footer>{nav}</footer></body></html>"
+    )
+
+
+def _anker_download():
+    return (
+        "<!DOCTYPE html><html><head><meta name='csrf-token' content='abc'>"
+        + "".join(f"<script src='/build/assets/app{i}.js' defer></script>" for i in range(15))
+        + "<style>" + "".join(f".t{i}{{color:#{i:06x}}}" for i in range(2000)) + "</style></head><body>"
+        "<div x-data=\"downloadPage('https%3A%2F%2Ffiles.dlproxy.uk%2Fgame.zip')\">"
+        "<a id='download-button' class='download-btn-reveal' href='https://files.dlproxy.uk/game.zip'>Download now</a></div>"
+        + "".join(f"<div class='card'><a href='/game/related-{i}'><img src='/c/{i}.webp'></a><p>Related {i}</p></div>" for i in range(30))
+        + "</body></html>"
+    )
+
+
+PAGES = {
+    # name: (generator, strainer the scraper uses, check on the parsed soup)
+    "fitgirl_search": (_fitgirl_search, html_parse.ARTICLES, lambda s: len(s.find_all("article"))),
+    "fitgirl_game": (
+        _fitgirl_game,
+        html_parse.ENTRY_CONTENT,
+        lambda s: s.find(class_="entry-content").find("a", href=lambda h: h and h.startswith("magnet:?"))["href"],
+    ),
+    "anker_search": (_anker_search, None, lambda s: len(s.find_all("a", href=lambda h: h and "/game/" in h))),
+    "anker_download": (
+        _anker_download,
+        html_parse.REDIRECT_TAGS,
+        lambda s: s.find("a", class_="download-btn-reveal")["href"],
+    ),
+}
+
+
+def _time(parse, markup, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        soup = parse(markup)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, soup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", help="folder with saved pages (<name>.html)")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    builders = ["html.parser"]
+    if html_parse.PARSER != "html.parser":
+        builders.append(html_parse.PARSER)
+    print(f"tree builders: {', '.join(builders)} (make_soup uses {html_parse.PARSER}); best of {args.repeat}")
+    print(f"{'page':16} {'KB':>6} {'variant':28} {'ms':>8} {'speedup':>8}")
+
+    for name, (generate, strainer, check) in PAGES.items():
+        markup = None
+        if args.fixtures:
+            path = os.path.join(args.fixtures, name + ".html")
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    markup = f.read()
+        source = "saved" if markup else "generated"
+        markup = markup or generate()
+
+        baseline, soup = _time(lambda m: BeautifulSoup(m, "html.parser"), markup, args.repeat)
+        expected = check(soup)
+        variants = [(f"html.parser full ({source})", baseline)]
+        for builder in builders:
+            if builder != "html.parser":
+                ms, soup = _time(lambda m: BeautifulSoup(m, builder), markup, args.repeat)
+                assert check(soup) == expected, (name, builder)
+                variants.append((f"{builder} full", ms))
+            if strainer is not None:
+                ms, soup = _time(lambda m: BeautifulSoup(m, builder, parse_only=strainer), markup, args.repeat)
+                assert check(soup) == expected, (name, builder, "strained")
+                variants.append((f"{builder} strained", ms))
+
+        for label, ms in variants:
+            print(f"{name:16} {len(markup) / 1024:6.0f} {label:28} {ms:8.2f} {baseline / ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
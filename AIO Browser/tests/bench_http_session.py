@@ -0,0 +1,102 @@
+"""
+Benchmark for the FitGirl search pattern (one search page, then every result
+page fetched by FITGIRL_WORKERS threads) with bare requests.get vs. the
+pooled core.http_session client, against a local HTTP server.
+
+The server counts new connections and delays each one by --handshake-ms to
+stand in for the TCP + TLS handshake a real HTTPS host costs (about three
+round trips). Usage (from the "AIO Browser" folder):
+
+    python tests/bench_http_session.py --searches 5 --results 20 --handshake-ms 60
+"""
+import argparse
+import concurrent.futures
+import http.server
+import os
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.http_session import create_session  # noqa: E402
+from core.scraper import FITGIRL_WORKERS  # noqa: E402
+
+
+def _serve(handshake_s):
+    body = b"<html>" + b"x" * 20000 + b"</html>"
+    connections = [0]
+    lock = threading.Lock()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body in one segment, or kept-alive connections hit the
+        # Nagle / delayed-ACK stall (~40 ms per response)
+        wbufsize = 64 * 1024
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            super().setup()
+            with lock:
+                connections[0] += 1
+            time.sleep(handshake_s)
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, connections
+
+
+def _search(get, base, results):
+    get(f"{base}/?s=query")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=FITGIRL_WORKERS) as executor:
+        list(executor.map(get, [f"{base}/game-{i}/" for i in range(results)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--searches", type=int, default=5)
+    parser.add_argument("--results", type=int, default=20)
+    parser.add_argument("--handshake-ms", type=float, default=60)
+    args = parser.parse_args()
+
+    server, connections = _serve(args.handshake_ms / 1000)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    session = create_session()
+    clients = [
+        ("requests.get", lambda url: requests.get(url, timeout=10).content),
+        ("shared pooled session", lambda url: session.get(url, timeout=10).content),
+    ]
+
+    requests_per_search = args.results + 1
+    print(f"{args.searches} searches x {requests_per_search} requests, "
+          f"{FITGIRL_WORKERS} workers, {args.handshake_ms:.0f} ms per handshake")
+    print(f"{'client':24} {'conns/search':>13} {'ms/search':>10} {'first ms':>9} {'repeat ms':>10}")
+    for name, get in clients:
+        connections[0] = 0
+        times = []
+        for _ in range(args.searches):
+            started = time.perf_counter()
+            _search(get, base, args.results)
+            times.append((time.perf_counter() - started) * 1000)
+        repeat = sum(times[1:]) / max(len(times) - 1, 1)
+        print(f"{name:24} {connections[0] / args.searches:13.1f} {sum(times) / len(times):10.1f} "
+              f"{times[0]:9.1f} {repeat:10.1f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark for download link extraction on intermediate pages: the old
+per-strategy scans (nine JS redirect regexes run one by one, then the deep
+scans and three passes over the links) vs. core.scraper.extract_download_links
+(one pass over the "http" occurrences with precompiled patterns, one pass
+over the links).
+
+Runs over captured pages: pass --fixtures with a folder of saved
+intermediate pages (*.html). Without it, pages shaped like the Anker
+download pages (inline Alpine/Livewire payloads, Tailwind markup, a
+dlproxy link) are generated. Usage (from the "AIO Browser" folder):
+
+    python tests/bench_link_extraction.py --fixtures path/to/pages --repeat 50
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from urllib.parse import unquote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.html_parse import REDIRECT_TAGS, make_soup  # noqa: E402
+from core.scraper import extract_download_links  # noqa: E402
+
+
+def _per_strategy_links(html_content, soup):
+    """The extraction resolve_all_links used before, kept for comparison."""
+    links = []
+
+    def add(link):
+        if link and link not in links:
+            links.append(link)
+
+    meta_refresh = soup.find('meta', attrs={'http-equiv': re.compile(r'^refresh$', re.I)})
+    if meta_refresh:
+        content = meta_refresh.get('content', '')
+        if 'url=' in content.lower():
+            add(re.split(r'url=', content, flags=re.I)[-1].strip())
+    patterns = [
+        r'window\.location\.href\s*=\s*["\'](.*?)["\']',
+        r'window\.location\s*=\s*["\'](.*?)["\']',
+        r'location\.href\s*=\s*["\'](.*?)["\']',
+        r'location\.replace\s*\(\s*["\'](.*?)["\']\s*\)',
+        r'window\.open\s*\(\s*["\'](.*?)["\']',
+        r'var\s+downloadUrl\s*=\s*["\'](.*?)["\']',
+        r'let\s+downloadUrl\s*=\s*["\'](.*?)["\']',
+        r'const\s+downloadUrl\s*=\s*["\'](.*?)["\']',
+        r'var\s+url\s*=\s*["\'](.*?)["\']'
+    ]
+    for p in patterns:
+        for match in re.finditer(p, html_content):
+            if "http" in match.group(1):
+                add(match.group(1))
+    btn_id = soup.find(id=re.compile(r'download', re.I))
+    if btn_id and btn_id.name == 'a' and btn_id.get('href'):
+        add(btn_id['href'])
+    for a in soup.find_all('a', href=True):
+        href = a['href']
+        text = a.text.strip().lower()
+        if "download" in text or "click here" in text:
+            if "ankergames" not in href or "download" in href:
+                if href and href != "#" and not href.startswith("javascript"):
+                    add(href)
+    for reveal_btn in soup.find_all('a', class_=re.compile(r'download-btn-reveal')):
+        if reveal_btn.get('href') and "dlproxy" in reveal_btn['href']:
+            add(reveal_btn['href'])
+    for link in re.findall(r'(https?://(?:[\w-]+\.)?dlproxy\.uk/[^\'"\s<>]+)', html_content):
+        add(link)
+    for link in re.findall(r'["\'](https?://.*?\.(?:zip|rar|7z|exe|iso))["\']', html_content, re.I):
+        if "assets" not in link and "jquery" not in link:
+            add(link)
+    dl_var = re.search(r'downloadUrl\s*[:=]\s*["\'](.*?)["\']', html_content)
+    if dl_var:
+        curr = unquote(dl_var.group(1))
+        if "dlproxy" in curr or "http" in curr:
+            add(curr)
+    for encoded_url in re.findall(r"x-data=\"downloadPage\('([^']+)'", html_content):
+        add(unquote(encoded_url))
+    return links
+
+
+def _generated_page(seed):
+    payload = ",".join(f'"k{seed}_{i}":"{"v" * 30}"' for i in range(1500))
+    livewire = "".join(
+        f"<div wire:id='w{i}' wire:snapshot='{{&quot;data&quot;:{{&quot;n&quot;:{i}}}}}' class='flex items-center gap-2 px-4'>"
+        f"<span class='text-sm text-gray-400'>Item {i}</span></div>"
+        for i in range(400)
+    )
+    related = "".join(
+        f"<div class='card'><a href='https://ankergames.net/game/related-{seed}-{i}'>"
+        f"<img src='/storage/covers/{i}.webp' alt=''></a><p>Related {i}</p></div>"
+        for i in range(40)
+    )
+    return (
+        "<!DOCTYPE html><html><head><meta name='csrf-token' content='abc'>"
+        + "".join(f"<script src='/build/assets/app{i}.js' defer></script>" for i in range(15))
+        + f"<script>window.__data = {{{payload}}};</script></head><body>{livewire}"
+        f"<div x-data=\"downloadPage('https%3A%2F%2Ffiles.dlproxy.uk%2F{seed}%2Fgame.zip')\">"
+        f"<a id='download-button' class='download-btn-reveal' href='https://files.dlproxy.uk/{seed}/game.zip'>Download now</a>"
+        f"</div>{related}<script>document.addEventListener('alpine:init', () => {{}});</script></body></html>"
+    )
+
+
+def _time(extract, html, soup, repeat, cold):
+    best = float("inf")
+    for _ in range(repeat):
+        if cold:
+            re.purge()  # patterns compiled afresh, as after re's cache is evicted
+        started = time.perf_counter()
+        links = extract(html, soup)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, links
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", help="folder with saved intermediate pages (*.html)")
+    parser.add_argument("--pages", type=int, default=3, help="pages to generate without --fixtures")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cold", action="store_true", help="clear re's pattern cache before every run")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(args.fixtures, "*.html"))):
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                pages.append((os.path.basename(path), f.read()))
+    else:
+        pages = [(f"generated-{i}", _generated_page(i)) for i in range(args.pages)]
+
+    print(f"best of {args.repeat}{', cold re cache' if args.cold else ''}; soup parsed once per page and shared by both")
+    print(f"{'page':24} {'KB':>6} {'per-strategy ms':>16} {'single scan ms':>15} {'speedup':>8} {'links':>6}")
+    for name, html in pages:
+        soup = make_soup(html, REDIRECT_TAGS)
+        old_ms, old_links = _time(_per_strategy_links, html, soup, args.repeat, args.cold)
+        new_ms, new_links = _time(extract_download_links, html, soup, args.repeat, args.cold)
+        print(f"{name[:24]:24} {len(html) / 1024:6.0f} {old_ms:16.2f} {new_ms:15.2f} "
+              f"{old_ms / new_ms:7.1f}x {len(new_links):6d}")
+        if new_links[:1] != old_links[:1]:
+            print(f"  best link differs: {old_links[:1]} -> {new_links[:1]}")
+
+
+if __name__ == "__main__":
+    main()
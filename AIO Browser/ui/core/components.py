@@ -480,6 +480,9 @@ class GamePatcherCard(QFrame):
 # =========================================================================
 # GAME CARD WIDGET
 # =========================================================================
+PREFETCH_HOVER_DELAY = 300  # ms the pointer rests on a card before its link is prefetched
+
+
 class GameCardWidget(QFrame):
     def __init__(self, game, game_type="direct", parent=None, delay=0):
         super().__init__(parent)
@@ -487,8 +490,15 @@ class GameCardWidget(QFrame):
         self.game_type = game_type
         self.parent = parent
         self.setObjectName("Card")
+        self.direct_games = []  # results on this card whose links can be prefetched
         self.initUI()
 
+        # Prefetch direct links once the pointer has rested on the card
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(PREFETCH_HOVER_DELAY)
+        self.prefetch_timer.timeout.connect(self.prefetch_links)
+
         # Entrance Animation
         self.opacity_effect = QGraphicsOpacityEffect(self)
         self.setGraphicsEffect(self.opacity_effect)
@@ -576,11 +586,11 @@ class GameCardWidget(QFrame):
         badge_layout = QHBoxLayout()
         badge_layout.setSpacing(10)
 
-        source_label = QLabel(f"📍 {self.game.get('source', 'Unknown')}")
-        source_label.setStyleSheet(
+        self.source_label = QLabel(f"📍 {self.game.get('source', 'Unknown')}")
+        self.source_label.setStyleSheet(
             f"color: {COLORS['text_secondary']}; font-size: 11px; font-weight: 500; background-color: transparent;"
         )
-        badge_layout.addWidget(source_label)
+        badge_layout.addWidget(self.source_label)
 
         if self.game.get("size"):
             size_label = QLabel(f"📦 {self.game['size']}")
@@ -595,31 +605,48 @@ class GameCardWidget(QFrame):
 
         layout.addLayout(info_layout, 1)
 
-        # Action Button
-        if self.game_type == "direct":
+        # Action Button(s): one per source when results are merged (see add_source)
+        self.sources = [self.game.get("source", "Unknown")]
+        self.actions_layout = QVBoxLayout()
+        self.actions_layout.setSpacing(6)
+        self.download_btn = self.create_action_button(self.game_type, self.game)
+        self.actions_layout.addWidget(self.download_btn)
+        layout.addLayout(self.actions_layout)
+        layout.setAlignment(self.actions_layout, Qt.AlignmentFlag.AlignVCenter)
+
+        self.setLayout(layout)
+
+        # Load image in background
+        if self.game.get("image"):
+            threading.Thread(target=self.load_image, daemon=True).start()
+
+    def create_action_button(self, game_type, game, label=None):
+        if game_type == "direct":
             btn_text = "Download"
             btn_color = COLORS["accent_primary"]
             btn_hover = COLORS["accent_secondary"]
             btn_icon = "📥"
             callback = self.start_direct_download
-        elif self.game_type == "roms":
+            if game not in self.direct_games:
+                self.direct_games.append(game)
+        elif game_type == "roms":
             btn_text = "Download"
             btn_color = COLORS["accent_primary"]
             btn_hover = COLORS["accent_secondary"]
             btn_icon = "📥"
             callback = self.start_rom_download
         else:
-            has_magnet = self.game.get("magnet")
+            has_magnet = game.get("magnet")
             btn_text = "Magnet Link" if has_magnet else "Visit Page"
             btn_color = COLORS["accent_green"]
             btn_hover = COLORS["accent_green_hover"]
             btn_icon = "🧲" if has_magnet else "🔗"
             callback = self.open_torrent_link
 
-        self.download_btn = QPushButton(f"{btn_icon}  {btn_text}")
-        self.download_btn.setFixedSize(150, 45)
-        self.download_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.download_btn.setStyleSheet(f"""
+        button = QPushButton(f"{btn_icon}  {label or btn_text}")
+        button.setFixedSize(150, 45)
+        button.setCursor(Qt.CursorShape.PointingHandCursor)
+        button.setStyleSheet(f"""
             QPushButton {{
                 background-color: {btn_color};
                 color: white;
@@ -631,13 +658,26 @@ class GameCardWidget(QFrame):
                 background-color: {btn_hover};
             }}
         """)
-        self.download_btn.clicked.connect(callback)
-        layout.addWidget(self.download_btn, alignment=Qt.AlignmentFlag.AlignVCenter)
-
-        self.setLayout(layout)
-
-        # Load image in background
-        if self.game.get("image"):
+        button.clicked.connect(lambda checked=False, g=game: callback(g))
+        return button
+
+    def add_source(self, game_type, game, source):
+        """Adds another source's result for the same game: a source badge and its own button."""
+        if len(self.sources) == 1:
+            # Name the first button's source too now that there are several
+            self.actions_layout.removeWidget(self.download_btn)
+            self.download_btn.deleteLater()
+            self.download_btn = self.create_action_button(self.game_type, self.game, self.sources[0])
+            self.actions_layout.addWidget(self.download_btn)
+        self.sources.append(source)
+        self.source_label.setText(f"📍 {' • '.join(self.sources)}")
+        self.actions_layout.addWidget(self.create_action_button(game_type, game, source))
+        # Three buttons still fit the fixed card height
+        height = 45 if len(self.sources) < 3 else 36
+        for i in range(self.actions_layout.count()):
+            self.actions_layout.itemAt(i).widget().setFixedHeight(height)
+        if not self.game.get("image") and game.get("image"):
+            self.game["image"] = game["image"]
             threading.Thread(target=self.load_image, daemon=True).start()
 
     def enterEvent(self, event):
@@ -645,6 +685,8 @@ class GameCardWidget(QFrame):
             self.shadow.setBlurRadius(30)
             self.shadow.setColor(QColor(124, 58, 237, 40))  # Accent primary glow
             self.shadow.setYOffset(8)
+        if self.direct_games:
+            self.prefetch_timer.start()
         super().enterEvent(event)
 
     def leaveEvent(self, event):
@@ -652,8 +694,25 @@ class GameCardWidget(QFrame):
             self.shadow.setBlurRadius(20)
             self.shadow.setColor(QColor(0, 0, 0, 80))
             self.shadow.setYOffset(4)
+        self.cancel_prefetch()
         super().leaveEvent(event)
 
+    def hideEvent(self, event):
+        # Scrolled to another page of results or replaced by a new search
+        self.cancel_prefetch()
+        super().hideEvent(event)
+
+    def prefetch_links(self):
+        if hasattr(self.parent, "prefetch_anker_link"):
+            for game in self.direct_games:
+                self.parent.prefetch_anker_link(game)
+
+    def cancel_prefetch(self):
+        self.prefetch_timer.stop()
+        if hasattr(self.parent, "cancel_anker_prefetch"):
+            for game in self.direct_games:
+                self.parent.cancel_anker_prefetch(game)
+
     def load_image(self):
         try:
             response = requests.get(self.game["image"], timeout=5)
@@ -709,20 +768,23 @@ class GameCardWidget(QFrame):
         )
         self.image_label.setText("")
 
-    def start_direct_download(self):
+    def start_direct_download(self, game=None):
+        game = game or self.game
         # We'll use a signal or callback here usually, but for now we follow the existing pattern
         if hasattr(self.parent, "initiate_anker_download"):
-            self.parent.initiate_anker_download(self.game)
+            self.parent.initiate_anker_download(game)
 
-    def start_rom_download(self):
+    def start_rom_download(self, game=None):
+        game = game or self.game
         if hasattr(self.parent, "initiate_axekin_download"):
-            self.parent.initiate_axekin_download(self.game)
+            self.parent.initiate_axekin_download(game)
         else:
-            webbrowser.open(self.game.get("page_url") or self.game.get("link", ""))
+            webbrowser.open(game.get("page_url") or game.get("link", ""))
 
-    def open_torrent_link(self):
-        has_magnet = self.game.get("magnet")
-        url = self.game["magnet"] if has_magnet else self.game["link"]
+    def open_torrent_link(self, game=None):
+        game = game or self.game
+        has_magnet = game.get("magnet")
+        url = game["magnet"] if has_magnet else game["link"]
         webbrowser.open(url)
 
 
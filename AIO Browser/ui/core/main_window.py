@@ -8,6 +8,11 @@ import webbrowser
 from pathlib import Path
 
 from core import downloader, scraper
+from core import async_engine, async_scraper
+from core.download_manager import DownloadManager
+from core.link_prefetcher import prefetcher
+from core.progress import DownloadState, ProgressEvent
+from core.rate_limit import global_limiter, kb_to_rate
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
 from PyQt6.QtWidgets import *
@@ -44,22 +49,32 @@ from ui.tabs.streaming_hub import StreamingHub
 class GameSearchApp(QMainWindow):
     # Custom Signals for Thread Safety
     download_prompt_ready = pyqtSignal(
-        str, str, object, str
-    )  # url, name, session, download_id
-    download_status_updated = pyqtSignal(
-        str, str, float
-    )  # download_id, status, progress
+        str, str, object, str, list
+    )  # url, name, session, download_id, mirror urls
     download_finished = pyqtSignal(str, str, str)  # download_id, result, save_path
+    download_queue_changed = pyqtSignal()
 
     def __init__(self):
         super().__init__()
         self.settings_manager = SettingsManager()
         self.image_cache = {}
+        self.anker_downloads = {}  # download id -> game page, for Anker downloads
+        self.open_responses = {}  # download id -> (resolver's open file response, opened at)
+        self.download_manager = DownloadManager(
+            max_active=self.settings_manager.get("max_active_downloads", 3),
+            per_host_limit=self.settings_manager.get("max_downloads_per_host", 2),
+        )
+        global_limiter.set_rate(kb_to_rate(self.settings_manager.get("max_download_speed", 0)))
+        self.download_manager.set_engine(self.settings_manager.get("download_engine", "threads"))
+        self.download_manager.add_listener(
+            lambda job: self.download_queue_changed.emit()
+        )
 
         # Connect Signals
         self.download_prompt_ready.connect(self.prompt_download)
-        self.download_status_updated.connect(self.update_download_status)
         self.download_finished.connect(self.on_download_finished)
+        self.download_queue_changed.connect(self.refresh_download_queue)
+        self.settings_manager.settings_changed.connect(self.apply_download_settings)
 
         # Load saved theme and apply it BEFORE initUI
         saved_theme = self.settings_manager.get("theme", "default")
@@ -163,6 +178,10 @@ class GameSearchApp(QMainWindow):
         self.main_stack.addWidget(self.search_tab)
 
         self.downloads_tab = DownloadsPage(self)
+        self.downloads_tab.cancel_requested.connect(self.download_manager.cancel)
+        self.downloads_tab.prioritize_requested.connect(
+            self.download_manager.move_to_front
+        )
         self.main_stack.addWidget(self.downloads_tab)
 
         self.patcher_tab = PatcherTab(self)
@@ -191,6 +210,48 @@ class GameSearchApp(QMainWindow):
         central.setLayout(main_layout)
 
         self.sidebar.set_active("search")
+        self.restore_download_queue()
+
+    def restore_download_queue(self):
+        """Bring back downloads left unfinished last session, then start the scheduler."""
+        for job in self.download_manager.restore():
+            item = self.downloads_tab.add_download(job.id, job.title)
+            job.controller = item.controller
+            callbacks = self.download_job_callbacks(
+                job.id, job.params.get("save_path") or job.params.get("output_dir", "")
+            )
+            job.progress_callback = callbacks["progress_callback"]
+            job.on_finished = callbacks["on_finished"]
+        self.download_manager.start()
+
+    def download_job_callbacks(self, download_id, save_path):
+        """Callbacks routing a job's progress and result to its Downloads card."""
+        return {
+            "progress_callback": lambda event: self.update_download_status(
+                download_id, event
+            ),
+            "on_finished": lambda job: self.download_finished.emit(
+                download_id, job.result or "ERROR", save_path
+            ),
+        }
+
+    @pyqtSlot()
+    def refresh_download_queue(self):
+        if not hasattr(self, "downloads_tab"):
+            return
+        active, queued = self.download_manager.snapshot()
+        self.downloads_tab.render_queue_state(
+            active, queued, self.download_manager.max_active
+        )
+
+    def apply_download_settings(self, settings):
+        self.download_manager.set_limits(
+            max_active=settings.get("max_active_downloads", 3),
+            per_host_limit=settings.get("max_downloads_per_host", 2),
+        )
+        global_limiter.set_rate(kb_to_rate(settings.get("max_download_speed", 0)))
+        self.download_manager.set_engine(settings.get("download_engine", "threads"))
+        self.refresh_download_queue()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -198,12 +259,16 @@ class GameSearchApp(QMainWindow):
             self.content_particles.setGeometry(self.content_container.rect())
 
     def closeEvent(self, event):
-        if hasattr(self, "downloads_tab") and self.downloads_tab.has_active_downloads():
+        # The manager also knows about archives still being extracted
+        if hasattr(self, "downloads_tab") and (
+            self.download_manager.busy() or self.downloads_tab.has_active_downloads()
+        ):
             reply = QMessageBox.question(
                 self,
                 "Warning: Active Downloads",
                 "There are downloads currently in progress.\n\n"
-                "If you close the application now, these downloads will be CANCELLED and incomplete files will be removed.\n\n"
+                "If you close the application now, these downloads will be STOPPED. "
+                "Resumable downloads keep their progress and continue from where they left off next time.\n\n"
                 "Are you sure you want to exit?",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                 QMessageBox.StandardButton.No,
@@ -220,14 +285,15 @@ class GameSearchApp(QMainWindow):
     def cleanup_active_downloads(self):
         """Attempts to stop all active downloads before closing."""
         if hasattr(self, "downloads_tab"):
-            for item in self.downloads_tab.items.values():
-                if not item.control_flags["stopped"]:
-                    item.control_flags["stopped"] = True
+            # Unfinished jobs stay in the persisted queue and resume next launch
+            self.download_manager.shutdown()
 
-            # Give threads a short moment to process the stop flag and delete files
+            # Give threads a short moment to process the stop flag and save their progress
             loop = QEventLoop()
             QTimer.singleShot(1000, loop.quit)
             loop.exec()
+            async_engine.close()
+            async_scraper.close()
 
     def refresh_content_particles(self):
         """Toggle content area particles based on theme"""
@@ -290,6 +356,22 @@ class GameSearchApp(QMainWindow):
         footer.setLayout(footer_layout)
         layout.addWidget(footer)
 
+    def anker_client(self):
+        """The Direct tab's client, so its session and CSRF token are reused."""
+        direct_tab = self.search_tab.direct_tab
+        if direct_tab.anker_client is None:
+            # Results from the All tab can be found before any Direct search
+            direct_tab.anker_client = scraper.AnkerClient()
+        return direct_tab.anker_client
+
+    def prefetch_anker_link(self, game):
+        """Resolves a direct result's link ahead of a click, when enabled in Settings."""
+        if self.settings_manager.get("prefetch_direct_links", False):
+            prefetcher.prefetch(game["link"], self.anker_client())
+
+    def cancel_anker_prefetch(self, game):
+        prefetcher.cancel(game["link"])
+
     def initiate_anker_download(self, game):
         import uuid
 
@@ -301,7 +383,7 @@ class GameSearchApp(QMainWindow):
             args=(
                 game["link"],
                 game["title"],
-                self.search_tab.direct_tab.anker_client,
+                self.anker_client(),
                 download_id,
             ),
             daemon=True,
@@ -325,42 +407,62 @@ class GameSearchApp(QMainWindow):
         download_id = str(uuid.uuid4())
         self.downloads_tab.add_download(download_id, title)
         self.sidebar.set_active("downloads")
-        self.download_prompt_ready.emit(url, title, None, download_id)
+        self.download_prompt_ready.emit(url, title, None, download_id, [])
 
     def process_anker_download_flow(self, game_url, game_title, anker, download_id):
-        self.download_status_updated.emit(
-            download_id, "🔗 Fetching direct link...", 0.1
+        self.anker_downloads[download_id] = game_url
+        # Clicked while the link was being prefetched: its result is the quickest
+        prefetcher.wait(game_url)
+        cached = scraper.resolved_links.get(game_url)
+        if cached:
+            # Prefetched or resolved shortly before (a retry or re-download): skip the round trips
+            links, suggested_name, session = cached
+            print(f"[DEBUG] Reusing resolved links for {game_url}")
+            self.download_prompt_ready.emit(
+                links[0], suggested_name or game_title.strip(), session, download_id, links[1:]
+            )
+            return
+        self.update_download_status(
+            download_id, ProgressEvent(DownloadState.STARTING, "🔗 Fetching direct link...", progress=0.1)
         )
         try:
             final_url, error = anker.get_download_link(game_url)
             if error or not final_url:
-                self.download_status_updated.emit(
-                    download_id, f"❌ Error: {error}. Opening page...", 0
+                self.update_download_status(
+                    download_id, ProgressEvent(DownloadState.ERROR, f"❌ Error: {error}. Opening page...")
                 )
                 time.sleep(2)
                 webbrowser.open(game_url)
                 return
-            self.download_status_updated.emit(
-                download_id, "🔍 Resolving final link...", 0.3
+            self.update_download_status(
+                download_id, ProgressEvent(DownloadState.STARTING, "🔍 Resolving final link...", progress=0.3)
             )
-            real_file_url, suggested_name = anker.resolve_final_link(final_url)
+            links, suggested_name, response = anker.open_all_links(final_url)
+            if response is not None:
+                # Already streaming the file: the download continues on it
+                self.open_responses[download_id] = (response, time.monotonic())
             if not suggested_name:
                 suggested_name = game_title.strip()
+            scraper.resolved_links.put(game_url, links, suggested_name, anker.session)
+            # Any further links are raced as mirrors of the first
             self.download_prompt_ready.emit(
-                real_file_url, suggested_name, anker.session, download_id
+                links[0], suggested_name, anker.session, download_id, links[1:]
             )
         except Exception as e:
             print(f"[DEBUG] Error: {e}")
-            self.download_status_updated.emit(download_id, f"❌ Error: {str(e)}", 0)
+            self.update_download_status(download_id, ProgressEvent(DownloadState.ERROR, f"❌ Error: {str(e)}"))
 
-    @pyqtSlot(str, str, object, str)
-    def prompt_download(self, url, default_name, session, download_id):
+    @pyqtSlot(str, str, object, str, list)
+    def prompt_download(self, url, default_name, session, download_id, mirrors):
+        response, opened = self.open_responses.pop(download_id, (None, 0))
         if "ankergames.net" in url and "treasure-box" in url:
-            self.download_status_updated.emit(
-                download_id, "⚠ Opening manual download page...", 1.0
+            self.update_download_status(
+                download_id, ProgressEvent(DownloadState.FINISHED, "⚠ Opening manual download page...")
             )
             time.sleep(1)
             webbrowser.open(url)
+            if response is not None:
+                response.close()
             return
         initial_dir = self.settings_manager.get("default_download_path", "")
         if not initial_dir or not os.path.exists(initial_dir):
@@ -368,47 +470,52 @@ class GameSearchApp(QMainWindow):
         save_path = QFileDialog.getExistingDirectory(
             self, "Select Download Folder", initial_dir
         )
+        if response is not None and (
+            not save_path or time.monotonic() - opened > downloader.HANDOFF_MAX_AGE
+        ):
+            # Not downloading, or left idle too long while the folder was picked
+            response.close()
+            response = None
         if save_path:
             item_widget = self.downloads_tab.items.get(download_id)
-
-            def progress_callback(text, progress):
-                self.download_status_updated.emit(download_id, text, progress)
-
-            def run_download():
-                self.download_status_updated.emit(
-                    download_id, "⏳ Preparing download...", 0
-                )
-                time.sleep(0.5)
-                if session and "Referer" in session.headers:
-                    del session.headers["Referer"]
-                if session and "X-Requested-With" in session.headers:
-                    del session.headers["X-Requested-With"]
-                result = downloader.download_file(
-                    url,
-                    save_path,
-                    progress_callback,
-                    item_widget.control_flags
-                    if item_widget
-                    else {"paused": False, "stopped": False},
-                    session=session,
-                )
-                self.download_finished.emit(download_id, result, save_path)
-
-            threading.Thread(target=run_download, daemon=True).start()
+            self.download_manager.submit(
+                "http",
+                default_name,
+                {
+                    "url": url,
+                    "save_path": save_path,
+                    "checksum": self.settings_manager.get("download_checksum", ""),
+                    "mirrors": mirrors,
+                    "extract": self.settings_manager.get("extract_zip_while_downloading", False),
+                    "extract_archives": self.settings_manager.get("extract_archives", False),
+                    "delete_archive": self.settings_manager.get("delete_archive_after_extract", False),
+                },
+                job_id=download_id,
+                session=session,
+                response=response,
+                controller=item_widget.controller if item_widget else None,
+                **self.download_job_callbacks(download_id, save_path),
+            )
         else:
-            self.download_status_updated.emit(download_id, "❌ Download cancelled", 0)
+            self.update_download_status(download_id, ProgressEvent(DownloadState.STOPPED, "❌ Download cancelled"))
 
-    @pyqtSlot(str, str, float)
-    def update_download_status(self, download_id, text, progress):
-        item = self.downloads_tab.items.get(download_id)
-        if item:
-            item.update_progress(text, progress)
+    def update_download_status(self, download_id, event):
+        """Callable from any thread; the Downloads page picks it up on its next frame."""
+        self.downloads_tab.post_progress(download_id, event)
 
     @pyqtSlot(str, str, str)
     def on_download_finished(self, download_id, result, save_path):
-        if result == "SUCCESS":
+        game_url = self.anker_downloads.pop(download_id, None)
+        if game_url and result.startswith("ERROR"):
+            # The resolved link may have expired; resolve it afresh next time
+            scraper.resolved_links.invalidate(game_url)
+        if result.startswith("SUCCESS"):
+            # "SUCCESS:<algorithm>:<digest>" when the download was hashed
+            _, _, digest = result.partition(":")
+            suffix = f" ({digest.replace(':', ' ')})" if digest else ""
             self.update_download_status(
-                download_id, f"✅ Complete: {os.path.basename(save_path)}", 1.0
+                download_id,
+                ProgressEvent(DownloadState.FINISHED, f"✅ Complete: {os.path.basename(save_path)}{suffix}"),
             )
 
             def final_cleanup():
@@ -419,9 +526,12 @@ class GameSearchApp(QMainWindow):
 
             QTimer.singleShot(2000, final_cleanup)
         elif result == "STOPPED":
-            self.update_download_status(download_id, "⏹ Download Stopped", 0)
-        elif result == "ERROR":
-            self.update_download_status(download_id, "❌ Error occurred", 0)
+            self.update_download_status(download_id, ProgressEvent(DownloadState.STOPPED, "⏹ Download Stopped"))
+        elif result.startswith("ERROR"):
+            # The manager reports "ERROR: <reason>"
+            _, _, reason = result.partition(":")
+            message = f"❌ Error: {reason.strip()}" if reason.strip() else "❌ Error occurred"
+            self.update_download_status(download_id, ProgressEvent(DownloadState.ERROR, message))
 
     def open_settings(self):
         self.sidebar.set_active("settings")
@@ -4,12 +4,13 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QProgressBar,
 from PyQt6.QtCore import Qt, QPropertyAnimation
 from PyQt6.QtGui import QColor
 from ui.core.styles import COLORS
+from core.download_control import DownloadController
 
 class DownloadDialog(QDialog):
     def __init__(self, game_title, parent=None):
         super().__init__(parent)
         self.game_title = game_title
-        self.control_flags = {"paused": False, "stopped": False}
+        self.controller = DownloadController()
         self.initUI()
     
     def initUI(self):
@@ -122,8 +123,11 @@ class DownloadDialog(QDialog):
         self.setGraphicsEffect(shadow)
     
     def toggle_pause(self):
-        self.control_flags["paused"] = not self.control_flags["paused"]
-        if self.control_flags["paused"]:
+        if self.controller.paused:
+            self.controller.resume()
+        else:
+            self.controller.pause()
+        if self.controller.paused:
             self.pause_btn.setText("▶  Resume")
             self.progress_label.setText("⏸  Download Paused")
             self.pause_btn.setStyleSheet(f"""
@@ -154,7 +158,7 @@ class DownloadDialog(QDialog):
             """)
     
     def stop_download(self):
-        self.control_flags["stopped"] = True
+        self.controller.cancel()
         self.pause_btn.setEnabled(False)
         self.progress_label.setText("⏹  Stopping...")
     
@@ -36,6 +36,15 @@ class SettingsManager(QObject):
             "default_download_path": str(Path(sys.argv[0]).resolve().parent),
             "goldberg_nickname": "AIOUser",
             "goldberg_language": "english",
+            "max_active_downloads": 3,
+            "max_downloads_per_host": 2,
+            "max_download_speed": 0,  # KB/s, 0 = unlimited
+            "download_checksum": "",  # "", "sha256", "md5" or "crc32"
+            "download_engine": "threads",  # or "asyncio" (needs aiohttp)
+            "extract_zip_while_downloading": False,
+            "extract_archives": False,  # unpack .zip/.7z/.rar after download
+            "delete_archive_after_extract": False,
+            "prefetch_direct_links": False,  # resolve direct links on hover
         }
 
         if self.filename.exists():
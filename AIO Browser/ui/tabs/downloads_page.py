@@ -1,8 +1,9 @@
 # ui/downloads.py
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, pyqtSlot
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtWidgets import (
     QFrame,
     QHBoxLayout,
+    QInputDialog,
     QLabel,
     QProgressBar,
     QPushButton,
@@ -11,17 +12,25 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from core.download_control import DownloadController
+from core.progress import DownloadState, ProgressAggregator
+from core.rate_limit import kb_to_rate
 from ui.core.components import InfoBanner
 from ui.core.styles import COLORS
 
+# Progress from all workers is applied to the cards at most this often
+FRAME_INTERVAL_MS = 100
+
 
 class DownloadItemWidget(QFrame):
     removed = pyqtSignal(object)
+    stop_requested = pyqtSignal(object)
+    prioritize_requested = pyqtSignal(object)
 
-    def __init__(self, title, parent=None):
+    def __init__(self, title, controller=None, parent=None):
         super().__init__(parent)
         self.title = title
-        self.control_flags = {"paused": False, "stopped": False}
+        self.controller = controller or DownloadController()
         self.setObjectName("DownloadItem")
         self.initUI()
 
@@ -100,6 +109,23 @@ class DownloadItemWidget(QFrame):
         self.pause_btn.clicked.connect(self.toggle_pause)
         self.btn_layout.addWidget(self.pause_btn)
 
+        self.limit_btn = QPushButton("⏱")
+        self.limit_btn.setFixedSize(35, 35)
+        self.limit_btn.setToolTip("Speed limit: unlimited")
+        self.limit_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.limit_btn.setStyleSheet(self.get_button_style(COLORS["bg_secondary"]))
+        self.limit_btn.clicked.connect(self.edit_speed_limit)
+        self.btn_layout.addWidget(self.limit_btn)
+
+        self.priority_btn = QPushButton("⤒")
+        self.priority_btn.setFixedSize(35, 35)
+        self.priority_btn.setToolTip("Start next")
+        self.priority_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.priority_btn.setStyleSheet(self.get_button_style(COLORS["bg_secondary"]))
+        self.priority_btn.clicked.connect(lambda: self.prioritize_requested.emit(self))
+        self.priority_btn.hide()  # Only while queued
+        self.btn_layout.addWidget(self.priority_btn)
+
         self.stop_btn = QPushButton("✕")
         self.stop_btn.setFixedSize(35, 35)
         self.stop_btn.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -128,8 +154,11 @@ class DownloadItemWidget(QFrame):
         """
 
     def toggle_pause(self):
-        self.control_flags["paused"] = not self.control_flags["paused"]
-        if self.control_flags["paused"]:
+        if self.controller.paused:
+            self.controller.resume()
+        else:
+            self.controller.pause()
+        if self.controller.paused:
             self.pause_btn.setText("▶")
             self.status_label.setText("Paused")
             self.pause_btn.setStyleSheet(self.get_button_style(COLORS["accent_green"]))
@@ -138,8 +167,31 @@ class DownloadItemWidget(QFrame):
             self.status_label.setText("Downloading")
             self.pause_btn.setStyleSheet(self.get_button_style(COLORS["bg_secondary"]))
 
+    def edit_speed_limit(self):
+        current = self.controller.limiter.rate // 1024
+        value, ok = QInputDialog.getInt(
+            self,
+            "Speed Limit",
+            "Max speed for this download in KB/s (0 = unlimited):",
+            current,
+            0,
+            10_000_000,
+            64,
+        )
+        if not ok:
+            return
+        # Takes effect on the running transfer straight away
+        self.controller.limiter.set_rate(kb_to_rate(value))
+        if value:
+            self.limit_btn.setToolTip(f"Speed limit: {value} KB/s")
+            self.limit_btn.setStyleSheet(self.get_button_style(COLORS["accent_primary"]))
+        else:
+            self.limit_btn.setToolTip("Speed limit: unlimited")
+            self.limit_btn.setStyleSheet(self.get_button_style(COLORS["bg_secondary"]))
+
     def stop_download(self):
-        self.control_flags["stopped"] = True
+        self.controller.cancel()
+        self.stop_requested.emit(self)
         self.status_label.setText("Stopped")
         self.setEnabled(False)
         self.info_label.setText("Download cancelled by user.")
@@ -147,7 +199,7 @@ class DownloadItemWidget(QFrame):
     def handle_stop_or_remove(self):
         # If already stopped or finished (indicated by disabled or special status), remove it
         if (
-            self.control_flags["stopped"]
+            self.controller.cancelled
             or self.status_label.text() == "Finished"
             or self.status_label.text() == "Stopped"
             or self.status_label.text() == "Error"
@@ -160,29 +212,53 @@ class DownloadItemWidget(QFrame):
             self.stop_btn.setText("🗑")
             self.setEnabled(True)  # Re-enable so they can click the trash icon
             self.pause_btn.hide()
+            self.limit_btn.hide()
+
+    def set_queued(self, position):
+        """Show the item as waiting in the download queue."""
+        if self.controller.cancelled:
+            return
+        self.status_label.setText(f"Queued (#{position})")
+        self.info_label.setText("Waiting for a free download slot...")
+        self.pause_btn.hide()
+        self.priority_btn.setVisible(position > 1)
+        if not self.btn_frame.isVisible():
+            self.btn_frame.show()
 
-    @pyqtSlot(str, float)
-    def update_progress(self, status_msg, progress):
-        self.info_label.setText(status_msg)
-        self.progress_bar.setValue(int(progress * 100))
-
-        # Check msg for status indicators
-        if "Complete" in status_msg or "✅" in status_msg:
+    def set_active(self):
+        """The scheduler started this item."""
+        if self.status_label.text().startswith("Queued"):
+            self.status_label.setText("Initializing...")
+            self.info_label.setText("Starting...")
+        self.priority_btn.hide()
+        if not self.controller.cancelled:
+            self.pause_btn.show()
+
+    def update_progress(self, event):
+        """Shows a core.progress.ProgressEvent on the card."""
+        if self.status_label.text() in ("Finished", "Stopped", "Error") and not event.state.terminal:
+            return  # A late update from a worker that already ended
+        self.info_label.setText(event.text)
+        self.progress_bar.setValue(int(event.fraction * 100))
+
+        if event.state == DownloadState.FINISHED:
             self.status_label.setText("Finished")
             self.pause_btn.hide()
+            self.limit_btn.hide()
             self.stop_btn.setText("🗑")
-        elif "Error" in status_msg or "❌" in status_msg:
-            self.status_label.setText("Error")
-            self.control_flags["stopped"] = True
+        elif event.state in (DownloadState.ERROR, DownloadState.STOPPED):
+            self.status_label.setText("Error" if event.state == DownloadState.ERROR else "Stopped")
+            self.controller.cancel()
             self.stop_btn.setText("🗑")
             self.pause_btn.hide()
-        elif "Stopped" in status_msg or "⏹" in status_msg:
-            self.status_label.setText("Stopped")
-            self.control_flags["stopped"] = True
-            self.stop_btn.setText("🗑")
-            self.pause_btn.hide()
-        elif self.control_flags["paused"]:
+            self.limit_btn.hide()
+        elif event.state == DownloadState.PAUSED or self.controller.paused:
             self.status_label.setText("Paused")
+        elif event.state == DownloadState.PROCESSING:
+            self.status_label.setText("Processing")
+            # Nothing left to pause or throttle
+            self.pause_btn.hide()
+            self.limit_btn.hide()
         else:
             self.status_label.setText("Downloading")
 
@@ -191,11 +267,23 @@ class DownloadItemWidget(QFrame):
 
 
 class DownloadsPage(QWidget):
+    cancel_requested = pyqtSignal(str)
+    prioritize_requested = pyqtSignal(str)
+    # Emitted on the UI thread for every event applied in a frame
+    progress_updated = pyqtSignal(str, object)  # download_id, ProgressEvent
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.initUI()
         self.items = {}
 
+        # Workers post() from their own threads; the timer applies the newest
+        # event per download, so the UI thread isn't flooded with signals.
+        self.progress = ProgressAggregator()
+        self.progress_timer = QTimer(self)
+        self.progress_timer.timeout.connect(self.flush_progress)
+        self.progress_timer.start(FRAME_INTERVAL_MS)
+
     def initUI(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(40, 30, 40, 30)
@@ -208,6 +296,12 @@ class DownloadsPage(QWidget):
         )
         layout.addWidget(header)
 
+        self.queue_label = QLabel("")
+        self.queue_label.setStyleSheet(
+            f"font-size: 12px; color: {COLORS['text_secondary']};"
+        )
+        layout.addWidget(self.queue_label)
+
         layout.addWidget(
             InfoBanner(
                 title="Downloads",
@@ -242,12 +336,27 @@ class DownloadsPage(QWidget):
         self.empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.container_layout.addWidget(self.empty_label)
 
-    def add_download(self, download_id, title):
+    def post_progress(self, download_id, event):
+        """Thread-safe: queues event for the next frame."""
+        self.progress.post(download_id, event)
+
+    def flush_progress(self):
+        for download_id, event in self.progress.drain().items():
+            item = self.items.get(download_id)
+            if item:
+                item.update_progress(event)
+            self.progress_updated.emit(download_id, event)
+
+    def add_download(self, download_id, title, controller=None):
         if self.empty_label.isVisible():
             self.empty_label.hide()
 
-        item = DownloadItemWidget(title)
+        item = DownloadItemWidget(title, controller)
         item.removed.connect(lambda i: self.remove_download_by_widget(i, download_id))
+        item.stop_requested.connect(lambda i: self.cancel_requested.emit(download_id))
+        item.prioritize_requested.connect(
+            lambda i: self.prioritize_requested.emit(download_id)
+        )
         self.items[download_id] = item
         self.container_layout.insertWidget(0, item)
         return item
@@ -272,6 +381,24 @@ class DownloadsPage(QWidget):
         if not self.items:
             self.empty_label.show()
 
+    def render_queue_state(self, active_jobs, queued_jobs, max_active):
+        """Reflect the download manager's scheduling state on the cards."""
+        for job in active_jobs:
+            item = self.items.get(job.id)
+            if item:
+                item.set_active()
+        for position, job in enumerate(queued_jobs, start=1):
+            item = self.items.get(job.id)
+            if item:
+                item.set_queued(position)
+
+        if active_jobs or queued_jobs:
+            self.queue_label.setText(
+                f"Active: {len(active_jobs)} / {max_active}  •  Queued: {len(queued_jobs)}"
+            )
+        else:
+            self.queue_label.setText("")
+
     def has_active_downloads(self):
         """Check if there are any downloads currently running (not finished/stopped)"""
         for item in self.items.values():
@@ -279,7 +406,9 @@ class DownloadsPage(QWidget):
             if (
                 status == "Downloading"
                 or status == "Paused"
+                or status == "Processing"
                 or status == "Initializing..."
+                or status.startswith("Queued")
             ):
                 return True
         return False
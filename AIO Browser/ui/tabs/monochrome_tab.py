@@ -5,6 +5,7 @@ Powered by Monochrome API - monochrome-api.samidy.com
 """
 import threading
 import sys
+import uuid
 from pathlib import Path
 from typing import Optional, Dict, List
 
@@ -12,7 +13,8 @@ from PyQt6.QtCore import *
 from PyQt6.QtGui import *
 from PyQt6.QtWidgets import *
 
-from core.monochrome_downloader import MonochromeAPI, MonochromeDownloader, MetadataHelper, AudioQuality
+from core.monochrome_downloader import MonochromeAPI, MetadataHelper, AudioQuality
+from core.progress import DownloadState, ProgressEvent
 from ui.core.components import InfoBanner
 from ui.core.styles import COLORS
 
@@ -29,10 +31,11 @@ class MonochromeTab(QWidget):
         super().__init__(parent)
         self.parent = parent
         self.monochrome_api = MonochromeAPI()
-        self.downloader: Optional[MonochromeDownloader] = None
         self.current_tracks: List[Dict] = []
         self.search_results: List[Dict] = []
         self.download_quality: AudioQuality = "LOSSLESS"
+        self._track_downloads: Dict[str, str] = {}  # download_id -> track_id
+        self._progress_connected = False
 
         # Connect signals
         self.metadata_loaded.connect(self.on_metadata_loaded)
@@ -702,10 +705,6 @@ class MonochromeTab(QWidget):
             self.status_label.setStyleSheet(f"color: {COLORS.get('accent_red', '#ff0000')}; font-size: 12px;")
             return
 
-        # Initialize downloader if not already
-        if not self.downloader:
-            self.downloader = MonochromeDownloader(self.monochrome_api)
-
         # Get download path from settings (default to exe dir)
         download_path = self.parent.settings_manager.get("default_download_path", str(Path(sys.argv[0]).resolve().parent))
         monochrome_path = Path(download_path) / "Monochrome"
@@ -718,42 +717,60 @@ class MonochromeTab(QWidget):
         self.status_label.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 12px;")
         self.download_btn.setEnabled(False)
 
-        # Start download threads
+        # Queue every track in the download manager; it limits how many run at once
         for track_id in selected_track_ids:
             track_data = next((t for t in self.current_tracks if t["id"] == track_id), None)
             if track_data:
-                thread = threading.Thread(
-                    target=self._download_track_thread,
-                    args=(track_data, monochrome_path)
-                )
-                thread.daemon = True
-                thread.start()
-
-    def _download_track_thread(self, track_data: Dict, output_dir: Path):
-        """Background thread for downloading a track"""
-        try:
-            track_id = str(track_data["id"])
-            track_title = track_data.get("title", "Unknown")
-            print(f"[MONOCHROME UI] Download thread started for: {track_title} (ID: {track_id})")
-
-            def progress_callback(progress, downloaded, total):
-                self.download_progress.emit(track_id, progress)
-
-            result = self.downloader.download_track(
-                track_data,
-                output_dir,
-                self.download_quality,
-                progress_callback
-            )
-
-            print(f"[MONOCHROME UI] Download complete, result: {result}")
-            self.download_complete.emit(track_id, result)
+                self._submit_track(track_data, monochrome_path)
+
+    def _submit_track(self, track_data: Dict, output_dir: Path):
+        """Queue a single track download"""
+        track_id = str(track_data["id"])
+        track_title = track_data.get("title", "Unknown")
+        artists = track_data.get("artists") or []
+        if artists:
+            track_title = f"{track_title} - {artists[0].get('name', 'Unknown Artist')}"
+
+        download_id = f"mono-{track_id}-{uuid.uuid4().hex[:6]}"
+        downloads_tab = self.parent.downloads_tab
+        item = downloads_tab.add_download(download_id, track_title)
+
+        # Track list percentages follow the Downloads page's frames
+        if not self._progress_connected:
+            downloads_tab.progress_updated.connect(self._on_progress_event)
+            self._progress_connected = True
+        self._track_downloads[download_id] = track_id
+
+        def on_finished(job):
+            if job.result == "SUCCESS":
+                print(f"[MONOCHROME UI] Download complete, result: {job.output}")
+                self.download_complete.emit(track_id, job.output)
+                downloads_tab.post_progress(download_id, ProgressEvent(DownloadState.FINISHED, "✅ Complete"))
+            elif job.result == "STOPPED":
+                downloads_tab.post_progress(download_id, ProgressEvent(DownloadState.STOPPED, "⏹ Download Stopped"))
+            else:
+                print(f"[MONOCHROME UI] Download error: {job.result}")
+                self.download_error.emit(track_id, job.result.replace("ERROR: ", "", 1))
+                downloads_tab.post_progress(download_id, ProgressEvent(DownloadState.ERROR, f"❌ {job.result}"))
+
+        self.parent.download_manager.submit(
+            "monochrome",
+            track_title,
+            {"track": track_data, "output_dir": str(output_dir), "quality": self.download_quality},
+            job_id=download_id,
+            controller=item.controller,
+            progress_callback=lambda event: downloads_tab.post_progress(download_id, event),
+            on_finished=on_finished,
+        )
 
-        except Exception as e:
-            print(f"[MONOCHROME UI] Download error: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            self.download_error.emit(track_id, str(e))
+    def _on_progress_event(self, download_id: str, event):
+        track_id = self._track_downloads.get(download_id)
+        if track_id is None:
+            return
+        if event.state.terminal:
+            del self._track_downloads[download_id]
+        elif event.state == DownloadState.DOWNLOADING:
+            self.download_progress.emit(track_id, event.fraction * 100)
 
     def on_download_progress(self, track_id: str, progress: float):
         """Handle download progress update"""
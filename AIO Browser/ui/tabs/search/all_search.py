@@ -0,0 +1,64 @@
+# ui/search/all_search.py
+from core import federated_search
+
+from ui.core.components import GameCardWidget, InfoBanner
+from ui.tabs.search.base_search import StreamingSearchTab
+
+
+class AllSearchTab(StreamingSearchTab):
+    placeholder = "Search every source..."
+
+    def __init__(self, main_app):
+        super().__init__(main_app)
+        # self.results holds one title key per game, in arrival order
+        self.entries = {}  # title key -> [SearchHit, ...] from every source that has it
+        self.cards = {}  # title key -> card on the page shown
+
+    def create_banner(self):
+        return InfoBanner(
+            title="Search All Sources",
+            body_lines=[
+                "Searches AnkerGames, FitGirl and Axekin at once. Games found on several sources are merged into one card.",
+                "Games found before show up instantly from the local catalog, and while offline.",
+            ],
+            icon="🔎",
+            object_name="AllSearchInfoBanner",
+            compact=True,
+        )
+
+    def reset_results(self):
+        super().reset_results()
+        self.entries = {}
+        self.cards = {}
+
+    def iter_results(self, query, cancelled):
+        return federated_search.search_all(query, cancelled=cancelled)
+
+    def handle_result(self, hit):
+        if hit.update:
+            # Live result for a card shown from the catalog: its buttons read this dict
+            for shown in self.entries[hit.key]:
+                if shown.source == hit.source:
+                    shown.game.update(hit.game)
+            return
+        if not hit.first:
+            # Same game from another source: merge it into the existing card
+            self.entries[hit.key].append(hit)
+            card = self.cards.get(hit.key)
+            if card is not None:
+                card.add_source(hit.kind, hit.game, hit.source)
+            return
+        self.entries[hit.key] = [hit]
+        self.append_result(hit.key)
+
+    def render_page(self):
+        self.cards = {}
+        super().render_page()
+
+    def create_card(self, key, delay=0):
+        first, *others = self.entries[key]
+        card = GameCardWidget(first.game, first.kind, self.main_app, delay=delay)
+        for hit in others:
+            card.add_source(hit.kind, hit.game, hit.source)
+        self.cards[key] = card
+        return card
@@ -0,0 +1,291 @@
+# ui/search/base_search.py
+import threading
+
+from PyQt6.QtCore import *
+from PyQt6.QtGui import *
+from PyQt6.QtWidgets import *
+
+from ui.core.components import LoadingWidget
+from ui.core.styles import COLORS
+
+
+class StreamingSearchTab(QWidget):
+    """
+    Base of the search tabs: the glowing search bar, and results streamed in
+    from a worker thread, shown page_size at a time. Subclasses provide the
+    banner, iter_results() and create_card().
+    """
+
+    # Results arrive one at a time; the int is the search they belong to
+    result_found = pyqtSignal(int, object)
+    search_finished = pyqtSignal(int)
+
+    placeholder = "Search..."
+
+    def __init__(self, main_app):
+        super().__init__()
+        self.main_app = main_app
+        self.results = []
+        self.current_page = 0
+        self.page_size = 5
+        self.search_id = 0
+        self.loading_widget = None
+
+        self.result_found.connect(self.add_result)
+        self.search_finished.connect(self.finish_search)
+        self.initUI()
+        self.setup_animations()
+
+    # ---------------------------------------------------------------------
+    # Per-tab hooks
+    # ---------------------------------------------------------------------
+    def create_banner(self):
+        """The InfoBanner shown above the search bar."""
+        raise NotImplementedError
+
+    def add_search_controls(self, layout):
+        """Adds extra widgets (filters) to the search bar, before the button."""
+
+    def reset_results(self):
+        """Forgets the previous search's results; runs on the UI thread."""
+        self.results = []
+
+    def iter_results(self, query, cancelled):
+        """Generator of the results for query; runs on the search thread."""
+        raise NotImplementedError
+
+    def handle_result(self, item):
+        """Takes a result of the current search; by default every one is shown."""
+        self.append_result(item)
+
+    def create_card(self, item, delay=0):
+        """The card widget for an entry of self.results."""
+        raise NotImplementedError
+
+    # ---------------------------------------------------------------------
+    # UI
+    # ---------------------------------------------------------------------
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(40, 40, 40, 40)
+        layout.setSpacing(12)
+
+        layout.addWidget(self.create_banner())
+
+        self.search_bar = QFrame()
+        self.search_bar.setFixedHeight(60)
+        self.search_bar.setStyleSheet(
+            f"background-color: {COLORS['bg_secondary']}; border: 1px solid {COLORS['border']}; border-radius: 12px;"
+        )
+        sb_layout = QHBoxLayout(self.search_bar)
+        sb_layout.setContentsMargins(10, 5, 10, 5)
+        sb_layout.setSpacing(10)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText(self.placeholder)
+        self.search_input.setFixedHeight(45)
+        self.search_input.setStyleSheet(
+            "border: none; background: transparent; padding: 0 15px; font-size: 16px;"
+        )
+        self.search_input.returnPressed.connect(self.start_search)
+        sb_layout.addWidget(self.search_input, 1)
+
+        self.add_search_controls(sb_layout)
+
+        self.search_btn = QPushButton("Search")
+        self.search_btn.setFixedSize(100, 40)
+        self.search_btn.clicked.connect(self.start_search)
+        sb_layout.addWidget(self.search_btn)
+        layout.addWidget(self.search_bar)
+
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
+        self.results_widget = QWidget()
+        self.results_layout = QVBoxLayout(self.results_widget)
+        self.results_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.results_layout.setSpacing(15)
+        self.scroll.setWidget(self.results_widget)
+        layout.addWidget(self.scroll)
+
+    def setup_animations(self):
+        self.glow_timer = QTimer()
+        self.glow_timer.setInterval(50)
+        self.glow_value = 0
+        self.glow_direction = 1
+        self.glow_timer.timeout.connect(self.animate_glow)
+        self.glow_effect = QGraphicsDropShadowEffect()
+
+    def animate_glow(self):
+        self.glow_value += self.glow_direction * 5
+        if self.glow_value >= 100:
+            self.glow_value = 100
+            self.glow_direction = -1
+        elif self.glow_value <= 0:
+            self.glow_value = 0
+            self.glow_direction = 1
+        glow_intensity = self.glow_value / 100.0
+        c = QColor(COLORS["accent_primary"])
+        border_color = (
+            f"rgba({c.red()}, {c.green()}, {c.blue()}, {0.3 + glow_intensity * 0.7})"
+        )
+        shadow_blur = 10 + int(glow_intensity * 20)
+        self.search_bar.setStyleSheet(
+            f"background-color: {COLORS['bg_secondary']}; border: 2px solid {border_color}; border-radius: 12px;"
+        )
+        if self.glow_effect:
+            try:
+                self.glow_effect.setBlurRadius(shadow_blur)
+                self.glow_effect.setColor(
+                    QColor(
+                        c.red(), c.green(), c.blue(), int(100 + glow_intensity * 155)
+                    )
+                )
+                self.glow_effect.setOffset(0, 0)
+            except:
+                self.glow_effect = QGraphicsDropShadowEffect()
+                self.search_bar.setGraphicsEffect(self.glow_effect)
+
+    def start_glow(self):
+        self.glow_value = 0
+        self.glow_direction = 1
+        self.glow_effect = QGraphicsDropShadowEffect()
+        self.search_bar.setGraphicsEffect(self.glow_effect)
+        self.glow_timer.start()
+
+    def stop_glow(self):
+        self.glow_timer.stop()
+        self.search_bar.setStyleSheet(
+            f"background-color: {COLORS['bg_secondary']}; border: 1px solid {COLORS['border']}; border-radius: 12px;"
+        )
+        try:
+            self.search_bar.setGraphicsEffect(None)
+            self.glow_effect = None
+        except:
+            pass
+
+    def clear_layout(self, layout):
+        if layout is not None:
+            while layout.count():
+                item = layout.takeAt(0)
+                widget = item.widget()
+                if widget is not None:
+                    widget.deleteLater()
+                else:
+                    self.clear_layout(item.layout())
+
+    # ---------------------------------------------------------------------
+    # Searching
+    # ---------------------------------------------------------------------
+    def start_search(self):
+        query = self.search_input.text().strip()
+        if not query:
+            return
+        self.search_id += 1
+        self.reset_results()
+        self.current_page = 0
+        self.clear_layout(self.results_layout)
+        self.loading_widget = LoadingWidget("Searching")
+        self.results_layout.addWidget(
+            self.loading_widget, alignment=Qt.AlignmentFlag.AlignHCenter
+        )
+        self.search_btn.setEnabled(False)
+        self.search_btn.setText("Searching...")
+        self.start_glow()
+        threading.Thread(
+            target=self.perform_search, args=(query, self.search_id), daemon=True
+        ).start()
+
+    def perform_search(self, query, search_id):
+        # A newer search cancels the requests still in flight
+        results = self.iter_results(query, cancelled=lambda: search_id != self.search_id)
+        try:
+            for item in results:
+                if search_id != self.search_id:
+                    break  # A newer search replaced this one
+                self.result_found.emit(search_id, item)
+        finally:
+            results.close()
+            self.search_finished.emit(search_id)
+
+    def hide_loading(self):
+        if self.loading_widget:
+            self.loading_widget.stop()
+            self.loading_widget.deleteLater()
+            self.loading_widget = None
+
+    @pyqtSlot(int, object)
+    def add_result(self, search_id, item):
+        if search_id != self.search_id:
+            return
+        self.handle_result(item)
+
+    def append_result(self, item):
+        """Adds item to the results and shows it if it lands on the page shown."""
+        self.hide_loading()
+        self.results.append(item)
+        self.show_new_result()
+
+    @pyqtSlot(int)
+    def finish_search(self, search_id):
+        if search_id != self.search_id:
+            return
+        self.hide_loading()
+        self.search_btn.setEnabled(True)
+        self.search_btn.setText("Search")
+        self.stop_glow()
+        if not self.results:
+            self.render_page()
+
+    # ---------------------------------------------------------------------
+    # Pages
+    # ---------------------------------------------------------------------
+    def show_new_result(self):
+        """Adds a card for the newest result if it lands on the page shown."""
+        index = len(self.results) - 1
+        start = self.current_page * self.page_size
+        if start <= index < start + self.page_size:
+            card = self.create_card(self.results[index])
+            self.results_layout.insertWidget(index - start, card)
+        if index > 0 and index % self.page_size == 0:
+            self.refresh_pagination()
+
+    def refresh_pagination(self):
+        """Rebuilds the page buttons under the cards after the page count grew."""
+        shown = min(self.page_size, len(self.results) - self.current_page * self.page_size)
+        while self.results_layout.count() > shown:
+            item = self.results_layout.takeAt(shown)
+            if item.widget() is not None:
+                item.widget().deleteLater()
+        self.add_pagination()
+
+    def add_pagination(self):
+        if hasattr(self.main_app, "create_pagination_controls"):
+            self.main_app.create_pagination_controls(
+                self.results_layout,
+                len(self.results),
+                self.current_page,
+                self.page_size,
+                self.change_page,
+            )
+
+    def render_page(self):
+        self.clear_layout(self.results_layout)
+        start = self.current_page * self.page_size
+        end = start + self.page_size
+        page_results = self.results[start:end]
+        if not page_results:
+            empty = QLabel("No results found.")
+            empty.setStyleSheet(
+                f"color: {COLORS['text_muted']}; font-size: 16px; margin-top: 50px;"
+            )
+            empty.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.results_layout.addWidget(empty)
+            return
+        for i, item in enumerate(page_results):
+            self.results_layout.addWidget(self.create_card(item, delay=i * 100))
+        self.add_pagination()
+
+    def change_page(self, new_page):
+        self.current_page = new_page
+        self.render_page()
+        self.scroll.verticalScrollBar().setValue(0)
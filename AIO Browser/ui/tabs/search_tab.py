@@ -2,6 +2,7 @@
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
 from PyQt6.QtWidgets import *
+from ui.tabs.search.all_search import AllSearchTab
 from ui.tabs.search.direct_search import DirectSearchTab
 from ui.tabs.search.roms_search import RomsSearchTab
 from ui.tabs.search.torrent_search import TorrentSearchTab
@@ -24,12 +25,16 @@ class SearchTab(QWidget):
             QTabWidget::pane {{ border: none; margin: 0px; padding: 0px; background: transparent; }}
         """)
 
+        # Every source at once
+        self.all_tab = AllSearchTab(self.main_app)
+
         # Direct Results Page
         self.direct_tab = DirectSearchTab(self.main_app)
         
         # Torrent Results Page
         self.torrent_tab = TorrentSearchTab(self.main_app)
 
+        self.search_tabs.addTab(self.all_tab, "All")
         self.search_tabs.addTab(self.direct_tab, "Direct")
         self.search_tabs.addTab(self.torrent_tab, "Torrent")
         self.roms_tab = RomsSearchTab(self.main_app)
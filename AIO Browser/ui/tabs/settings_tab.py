@@ -17,6 +17,7 @@ from PyQt6.QtWidgets import (
     QMessageBox,
     QPushButton,
     QSizePolicy,
+    QSpinBox,
     QVBoxLayout,
     QWidget,
 )
@@ -286,7 +287,7 @@ class SettingsTab(QWidget):
             InfoBanner(
                 title="Quick info",
                 body_lines=[
-                    "Change themes, default download folder, and emulator identity settings here.",
+                    "Change themes, default download folder, download limits, and emulator identity settings here.",
                 ],
                 icon="⚙️",
                 object_name="SettingsInfoBanner",
@@ -418,6 +419,154 @@ class SettingsTab(QWidget):
         path_box_layout.addWidget(browse_btn)
 
         down_layout.addWidget(self.path_box)
+
+        queue_fields = QHBoxLayout()
+        queue_fields.setSpacing(20)
+
+        # Max simultaneous downloads
+        active_v = QVBoxLayout()
+        active_l = QLabel("Simultaneous Downloads")
+        active_l.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 13px;")
+        self.max_active_input = QSpinBox()
+        self.max_active_input.setRange(1, 10)
+        self.max_active_input.setValue(
+            int(self.settings_manager.get("max_active_downloads", 3))
+        )
+        self.max_active_input.valueChanged.connect(
+            lambda v: self.settings_manager.update_setting("max_active_downloads", v)
+        )
+        active_v.addWidget(active_l)
+        active_v.addWidget(self.max_active_input)
+        queue_fields.addLayout(active_v, 1)
+
+        # Per-host cap
+        host_v = QVBoxLayout()
+        host_l = QLabel("Downloads Per Server")
+        host_l.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 13px;")
+        self.per_host_input = QSpinBox()
+        self.per_host_input.setRange(1, 10)
+        self.per_host_input.setValue(
+            int(self.settings_manager.get("max_downloads_per_host", 2))
+        )
+        self.per_host_input.valueChanged.connect(
+            lambda v: self.settings_manager.update_setting("max_downloads_per_host", v)
+        )
+        host_v.addWidget(host_l)
+        host_v.addWidget(self.per_host_input)
+        queue_fields.addLayout(host_v, 1)
+
+        # Global bandwidth cap
+        speed_v = QVBoxLayout()
+        speed_l = QLabel("Speed Limit")
+        speed_l.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 13px;")
+        self.speed_limit_input = QSpinBox()
+        self.speed_limit_input.setRange(0, 10_000_000)
+        self.speed_limit_input.setSingleStep(256)
+        self.speed_limit_input.setSuffix(" KB/s")
+        self.speed_limit_input.setSpecialValueText("Unlimited")
+        self.speed_limit_input.setValue(
+            int(self.settings_manager.get("max_download_speed", 0))
+        )
+        self.speed_limit_input.valueChanged.connect(
+            lambda v: self.settings_manager.update_setting("max_download_speed", v)
+        )
+        speed_v.addWidget(speed_l)
+        speed_v.addWidget(self.speed_limit_input)
+        queue_fields.addLayout(speed_v, 1)
+
+        # Inline checksum while downloading
+        hash_v = QVBoxLayout()
+        hash_l = QLabel("Verify Downloads")
+        hash_l.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 13px;")
+        self.checksum_input = QComboBox()
+        for label, value in (("Off", ""), ("SHA-256", "sha256"), ("MD5", "md5"), ("CRC32", "crc32")):
+            self.checksum_input.addItem(label, value)
+        index = self.checksum_input.findData(self.settings_manager.get("download_checksum", ""))
+        self.checksum_input.setCurrentIndex(max(0, index))
+        self.checksum_input.currentIndexChanged.connect(
+            lambda i: self.settings_manager.update_setting(
+                "download_checksum", self.checksum_input.itemData(i)
+            )
+        )
+        hash_v.addWidget(hash_l)
+        hash_v.addWidget(self.checksum_input)
+        queue_fields.addLayout(hash_v, 1)
+
+        # Thread per download vs. one asyncio loop for all of them
+        engine_v = QVBoxLayout()
+        engine_l = QLabel("Download Engine")
+        engine_l.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 13px;")
+        self.engine_input = QComboBox()
+        self.engine_input.addItem("Threads", "threads")
+        self.engine_input.addItem("Asyncio", "asyncio")
+        self.engine_input.setToolTip(
+            "Asyncio runs every download on one event loop, which scales better "
+            "for large playlists. Requires the aiohttp package."
+        )
+        index = self.engine_input.findData(self.settings_manager.get("download_engine", "threads"))
+        self.engine_input.setCurrentIndex(max(0, index))
+        self.engine_input.currentIndexChanged.connect(
+            lambda i: self.settings_manager.update_setting(
+                "download_engine", self.engine_input.itemData(i)
+            )
+        )
+        engine_v.addWidget(engine_l)
+        engine_v.addWidget(self.engine_input)
+        queue_fields.addLayout(engine_v, 1)
+
+        down_layout.addLayout(queue_fields)
+
+        self.extract_checkbox = QCheckBox("Extract .zip downloads while they download")
+        self.extract_checkbox.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.extract_checkbox.setToolTip(
+            "Unpacks archives into a folder next to the .zip as the data arrives, "
+            "so the game is ready right after the last byte."
+        )
+        self.extract_checkbox.setChecked(
+            bool(self.settings_manager.get("extract_zip_while_downloading", False))
+        )
+        self.extract_checkbox.toggled.connect(
+            lambda checked: self.settings_manager.update_setting("extract_zip_while_downloading", checked)
+        )
+        down_layout.addWidget(self.extract_checkbox)
+
+        self.extract_archives_checkbox = QCheckBox("Extract .zip/.7z/.rar archives after downloading")
+        self.extract_archives_checkbox.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.extract_archives_checkbox.setToolTip(
+            "Unpacks finished archives in the background, several at once. "
+            ".7z needs the py7zr package, .rar the rarfile package and UnRAR."
+        )
+        self.extract_archives_checkbox.setChecked(
+            bool(self.settings_manager.get("extract_archives", False))
+        )
+        self.extract_archives_checkbox.toggled.connect(
+            lambda checked: self.settings_manager.update_setting("extract_archives", checked)
+        )
+        down_layout.addWidget(self.extract_archives_checkbox)
+
+        self.delete_archive_checkbox = QCheckBox("Delete archives once extracted")
+        self.delete_archive_checkbox.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.delete_archive_checkbox.setChecked(
+            bool(self.settings_manager.get("delete_archive_after_extract", False))
+        )
+        self.delete_archive_checkbox.toggled.connect(
+            lambda checked: self.settings_manager.update_setting("delete_archive_after_extract", checked)
+        )
+        down_layout.addWidget(self.delete_archive_checkbox)
+
+        self.prefetch_checkbox = QCheckBox("Resolve direct download links on hover")
+        self.prefetch_checkbox.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.prefetch_checkbox.setToolTip(
+            "Fetches the download link of a direct result while the pointer rests "
+            "on it, so the download starts right away when clicked."
+        )
+        self.prefetch_checkbox.setChecked(
+            bool(self.settings_manager.get("prefetch_direct_links", False))
+        )
+        self.prefetch_checkbox.toggled.connect(
+            lambda checked: self.settings_manager.update_setting("prefetch_direct_links", checked)
+        )
+        down_layout.addWidget(self.prefetch_checkbox)
         layout.addWidget(down_container)
 
         # Separator
@@ -561,6 +710,11 @@ class SettingsTab(QWidget):
                         elif text in [
                             "Choose a theme for the application",
                             "Default Download Directory",
+                            "Simultaneous Downloads",
+                            "Downloads Per Server",
+                            "Speed Limit",
+                            "Verify Downloads",
+                            "Download Engine",
                             "Nickname",
                             "Language",
                         ]:
@@ -3,7 +3,6 @@ import re
 import threading
 from urllib.parse import quote
 
-import requests
 from PyQt6.QtCore import (
     Q_ARG,
     QEvent,
@@ -31,6 +30,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 
+from core.http_session import shared_session
 from ui.core.components import InfoBanner, LoadingWidget
 from ui.core.styles import COLORS, get_colors
 
@@ -244,7 +244,7 @@ class VideoStreamTab(QWidget):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36",
             "Accept": "application/json,text/plain,*/*",
         }
-        resp = requests.get(url, headers=headers, timeout=8)
+        resp = shared_session().get(url, headers=headers, timeout=8)
         if resp.status_code != 200:
             self.log(f"IMDb suggest failed: {resp.status_code}")
             return []
@@ -431,7 +431,7 @@ class VideoStreamTab(QWidget):
 
     def fetch_show_info(self, imdb_id):
         try:
-            resp = requests.get(
+            resp = shared_session().get(
                 f"https://api.tvmaze.com/lookup/shows?imdb={imdb_id}", timeout=5
             )
             if resp.status_code != 200:
@@ -569,7 +569,7 @@ class StreamResultCard(QFrame):
                 self.parent.log(f"No thumbnail for {self.item.get('imdb_id')}")
             return
         try:
-            response = requests.get(url, timeout=5)
+            response = shared_session().get(url, timeout=5)
             image = QImage.fromData(response.content)
             if image.isNull():
                 return
@@ -660,7 +660,7 @@ class StreamWatchDialog(QDialog):
         try:
             if hasattr(self.main_app, "log"):
                 self.main_app.log(f"Loading episodes for {imdb_id}")
-            lookup = requests.get(
+            lookup = shared_session().get(
                 f"https://api.tvmaze.com/lookup/shows?imdb={imdb_id}", timeout=5
             )
             if lookup.status_code != 200:
@@ -671,7 +671,7 @@ class StreamWatchDialog(QDialog):
                 self.type_label.setText("Show not found on TVMaze.")
                 return
             tvmaze_id = lookup.json()["id"]
-            eps_resp = requests.get(
+            eps_resp = shared_session().get(
                 f"https://api.tvmaze.com/shows/{tvmaze_id}/episodes", timeout=5
             )
             episodes = eps_resp.json()
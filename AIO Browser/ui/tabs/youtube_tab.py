@@ -14,7 +14,7 @@ from ui.core.styles import get_colors
 from ui.tabs.youtube import VideoTab, AudioTab
 
 try:
-    from core.youtube_downloader import YoutubeDownloader, get_video_info
+    from core.youtube_downloader import get_video_info
 
     YOUTUBE_SUPPORTED = True
 except ImportError:
@@ -25,10 +25,10 @@ class YoutubeTab(QWidget):
     def __init__(self, main_app):
         super().__init__(main_app)
         self.main_app = main_app
-        self.downloader = (
-            YoutubeDownloader(self.update_progress) if YOUTUBE_SUPPORTED else None
-        )
+        self.current_job_id = None
         self.initUI()
+        # The local overlay follows the Downloads page's frames
+        self.main_app.downloads_tab.progress_updated.connect(self._on_progress_event)
 
     def initUI(self):
         colors = get_colors()
@@ -119,9 +119,13 @@ class YoutubeTab(QWidget):
         self.status_label.setText(text)
         self.progress_bar.setValue(int(progress * 100))
 
+    def _on_progress_event(self, download_id, event):
+        if download_id == self.current_job_id:
+            self._do_update_progress(event.text, event.fraction)
+
     def cancel_download(self):
-        if self.downloader:
-            self.downloader.cancel()
+        if self.current_job_id:
+            self.main_app.download_manager.cancel(self.current_job_id)
         self.status_label.setText("Stopping...")
         self.cancel_btn.setEnabled(False)
 
@@ -228,34 +232,15 @@ class YoutubeTab(QWidget):
             info = get_video_info(url)
             title = info["title"] if info else "YouTube Video"
 
-            # Create a download item in the main downloads page (main thread)
-            download_id = f"yt-{uuid.uuid4().hex[:8]}"
-            QTimer.singleShot(0, lambda: self.main_app.downloads_tab.add_download(download_id, title))
-
-            # Progress callback that updates both the local overlay and the global downloads page
-            def progress_callback(text, progress):
-                # Update overlay
-                self.update_progress(text, progress)
-                # Forward to downloads page via main app signal
-                try:
-                    self.main_app.download_status_updated.emit(download_id, text, progress)
-                except Exception:
-                    pass
-
-            # 2. Start the actual download via downloader core
-            result = self.downloader.download(
-                url, save_path, mode=mode, quality=quality
-            )
-
-            # Ensure final status is forwarded to downloads UI
-            QTimer.singleShot(0, lambda: self.main_app.download_finished.emit(download_id, result, save_path))
-
-            # 3. Handle result back on UI thread
+            # 2. Hand the download to the download manager (UI thread)
             QMetaObject.invokeMethod(
                 self,
-                "finalize_download",
+                "_submit_download",
                 Qt.ConnectionType.QueuedConnection,
-                Q_ARG(str, result),
+                Q_ARG(str, url),
+                Q_ARG(str, save_path),
+                Q_ARG(str, mode),
+                Q_ARG(str, quality),
                 Q_ARG(str, title),
             )
         except Exception as e:
@@ -267,8 +252,40 @@ class YoutubeTab(QWidget):
                 Q_ARG(str, "Unknown"),
             )
 
+    @pyqtSlot(str, str, str, str, str)
+    def _submit_download(self, url, save_path, mode, quality, title):
+        # Create a download item in the main downloads page
+        download_id = f"yt-{uuid.uuid4().hex[:8]}"
+        item = self.main_app.downloads_tab.add_download(download_id, title)
+        callbacks = self.main_app.download_job_callbacks(download_id, save_path)
+
+        def on_finished(job):
+            # Ensure final status is forwarded to downloads UI
+            callbacks["on_finished"](job)
+            # Handle result back on UI thread
+            QMetaObject.invokeMethod(
+                self,
+                "finalize_download",
+                Qt.ConnectionType.QueuedConnection,
+                Q_ARG(str, job.result or "ERROR"),
+                Q_ARG(str, title),
+            )
+
+        self.current_job_id = download_id
+        self.status_label.setText("Queued...")
+        self.main_app.download_manager.submit(
+            "youtube",
+            title,
+            {"url": url, "save_path": save_path, "mode": mode, "quality": quality},
+            job_id=download_id,
+            controller=item.controller,
+            progress_callback=callbacks["progress_callback"],
+            on_finished=on_finished,
+        )
+
     @pyqtSlot(str, str)
     def finalize_download(self, result, title):
+        self.current_job_id = None
         self.video_tab.set_enabled(True)
         self.audio_tab.set_enabled(True)
         self.tab_widget.setEnabled(True)